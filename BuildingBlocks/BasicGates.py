@@ -191,6 +191,12 @@ class NAND(Comb):
         """
         return self.__notGate.getScopeDump()
 
+    def getScopeDumps(self):
+        """
+        @return list : the scope dumps of this block.
+        """
+        return self.__notGate.getScopeDumps()
+
 
 class NOR(Comb):
     """
@@ -232,6 +238,12 @@ class NOR(Comb):
         """
         return self.__notGate.getScopeDump()
 
+    def getScopeDumps(self):
+        """
+        @return list : the scope dumps of this block.
+        """
+        return self.__notGate.getScopeDumps()
+
 
 class XNOR(Comb):
     """
@@ -273,6 +285,12 @@ class XNOR(Comb):
         """
         return self.__notGate.getScopeDump()
 
+    def getScopeDumps(self):
+        """
+        @return list : the scope dumps of this block.
+        """
+        return self.__notGate.getScopeDumps()
+
 
 class MUX(Comb):
     """
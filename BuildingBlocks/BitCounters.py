@@ -96,6 +96,12 @@ class Enabled1BitCounterWithTC(Comb):
         dic.update(self._scopeDump.getValues())
         return dic
 
+    def getScopeDumps(self):
+        """
+        @return list : the scope dumps of the clock and of this block.
+        """
+        return self.__clk.getScopeDumps() + [self._scopeDump]
+
 
 class Enabled2BitCounterWithTC(Comb):
     """
@@ -154,6 +160,12 @@ class Enabled2BitCounterWithTC(Comb):
         dic.update(self._scopeDump.getValues())
         return dic
 
+    def getScopeDumps(self):
+        """
+        @return list : the scope dumps of the clock and of this block.
+        """
+        return self.__clk.getScopeDumps() + [self._scopeDump]
+
 
 class Enabled3BitCounterWithTC(Comb):
     """
@@ -212,6 +224,12 @@ class Enabled3BitCounterWithTC(Comb):
         dic.update(self._scopeDump.getValues())
         return dic
 
+    def getScopeDumps(self):
+        """
+        @return list : the scope dumps of the clock and of this block.
+        """
+        return self.__clk.getScopeDumps() + [self._scopeDump]
+
 
 class Enabled4BitCounterWithTC(Comb):
     """
@@ -270,6 +288,12 @@ class Enabled4BitCounterWithTC(Comb):
         dic.update(self._scopeDump.getValues())
         return dic
 
+    def getScopeDumps(self):
+        """
+        @return list : the scope dumps of the clock and of this block.
+        """
+        return self.__clk.getScopeDumps() + [self._scopeDump]
+
 
 if __name__ == "__main__":
 
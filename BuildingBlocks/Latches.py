@@ -127,6 +127,12 @@ class DLatch(Comb):
         dic.update(self._scopeDump.getValues())
         return dic
 
+    def getScopeDumps(self):
+        """
+        @return list : the scope dumps of the clock and of this block.
+        """
+        return self.__clk.getScopeDumps() + [self._scopeDump]
+
 
 if __name__ == "__main__":
 
@@ -0,0 +1,139 @@
+"""
+Helpers shared by the module testers: the small circuit most of them simulate and the
+access to the blocks of a pydig object, which keeps them in a private list.
+It is not a tester itself (pytest only collects the test_*.py files).
+"""
+
+import sys
+import os
+
+# Add parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from usableBlocks import Input
+
+# the input files, by absolute path so that a tester can change its working directory
+TESTS = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'Tests'))
+INPUT = os.path.join(TESTS, "run_input5.csv")
+INPUT1 = os.path.join(TESTS, "run_input1.csv")
+
+
+def count(ps, i):
+    return (ps + i) % 4
+
+
+def parity(x):
+    return bin(x).count("1") & 1
+
+
+def n(a):
+    return (~a & 0b1)
+
+
+def nsl_pwm(ps, i):
+    a = (ps >> 1) & 1
+    b = (ps >> 0) & 1
+
+    d = (n(a) & b & n(i)) | (a & n(b) & n(i))
+    e = (n(b) & n(i))
+
+    return d << 1 | e
+
+
+def build_counter(name, inputFile=INPUT, nsl=count, func=parity, delay=0.2, mealy=False, timePeriod=1, onTime=0.5,
+                  stateSize=None, **options):
+    """
+    Builds the circuit shared by the testers:
+
+        src -> counter (2 bit moore, clocked by clk) -> parity (combinational) [-> mealy] -> out
+
+    @param name : the name of the pydig object.
+    @param inputFile : the input file of src.
+    @param nsl : the next state logic of the counter, stateSize its state size if it is given.
+    @param func : the function of the parity block, delay its delay.
+    @param mealy : if True, a 2 bit mealy machine clocked by clk is put between parity and out.
+    @param timePeriod : the period of clk, onTime its on time.
+    @param options : passed on to the pydig object (kernel, deltaCycles, headless, ...).
+    @return pydig : the simulator, its blocks are given by blocks(sim).
+    """
+
+    from pydig import pydig
+
+    sim = pydig(name, **options)
+    clk = sim.clock(timePeriod=timePeriod, onTime=onTime, blockID="clk")
+    src = sim.source(inputFile, blockID="src")
+    sizes = {} if stateSize is None else {"stateSize": stateSize}
+    counter = sim.moore(maxOutSize=2, blockID="counter", nsl=nsl, ol=lambda ps: ps, clock=clk, **sizes)
+    last = sim.combinational(maxOutSize=1, blockID="parity", func=func, delay=delay)
+    src.output() > counter.input()
+    counter.output() > last.input()
+
+    if mealy:
+        machine = sim.mealy(maxOutSize=2, blockID="mealy", nsl=lambda ps, i: (ps ^ i) & 3, ol=lambda ps, i: (ps + i) & 3, clock=clk)
+        last.output() > machine.input()
+        last = machine
+
+    out = sim.output(plot=False, blockID="out")
+    last.output() > out.input()
+
+    return sim
+
+
+def build_pwm(name, tabulate=False, stateSize=None):
+    """
+    Builds the PWM example from main.py.
+    @param tabulate : passed on to the counter and the comparators, stateSize to the counter.
+    @return pydig : the simulator, its blocks are given by blocks(sim).
+    """
+
+    from pydig import pydig
+
+    sim = pydig(name)
+
+    src = sim.source(os.path.join(TESTS, "PWM.csv"), blockID="PWM Input")
+    clk = sim.clock(blockID="clk", timePeriod=1, onTime=0.5)
+    counter = sim.moore(maxOutSize=2, blockID="Mod 4 Counter", nsl=nsl_pwm, ol=lambda ps: ps, tabulate=tabulate, stateSize=stateSize)
+
+    syncReset = sim.combinational(maxOutSize=1, blockID="Sync Reset Comparator", func=lambda x: int((x & 3) == (x >> 2)), tabulate=tabulate)
+    compare = sim.combinational(maxOutSize=1, blockID="Output Comparator", func=lambda x: int((x & 3) > (x >> 2)), tabulate=tabulate)
+    out = sim.output(plot=False, blockID="PWM Output")
+
+    src.output(0, 2) > compare.input()
+    counter.output() > compare.input()
+    src.output(2, 4) > syncReset.input()
+    counter.output() > syncReset.input()
+    syncReset.output() > counter.input()
+    compare.output() > out.input()
+    clk.output() > counter.clock()
+
+    return sim
+
+
+def components(sim):
+    """
+    @return list : the blocks of a pydig object, in the order they were created.
+    """
+    return sim._pydig__components
+
+
+def blocks(sim):
+    """
+    @return dict : the blocks of a pydig object, by block ID.
+    """
+    return {x.getBlockID(): x for x in components(sim)}
+
+
+def dumps(sim):
+    """
+    @return list : the scope dump of every block of a pydig object.
+    """
+    return [c.getScopeDump() for c in components(sim)]
+
+
+def add_input(sim, inputList, blockID):
+    """
+    Creates an Input block from a list and registers it in the simulator.
+    """
+    block = Input(inputList=inputList, env=sim.getEnv(), blockID=blockID, plot=False)
+    components(sim).append(block)
+    return block
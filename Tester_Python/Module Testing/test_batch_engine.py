@@ -0,0 +1,151 @@
+"""
+Tester for pydig.runBatch(until, stimuli), the batch engine.
+It verifies that every lane gives the same waveforms as a run of the cycle engine
+with its own stimulus file (with NumPy compatible and tabulated functions, and with
+tabulated functions that only have a memo and are not NumPy compatible), that
+functions which cannot be evaluated on arrays are rejected, and that stimuli wider
+than their Input block are rejected.
+"""
+
+import sys
+import os
+
+# Add parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from pydig import pydig
+from helpers import components
+
+
+FILES = ["../../Tests/run_input2.csv", "../../Tests/run_input3.csv", "../../Tests/run_input4.csv",
+         "../../Tests/combi_input1.csv", "../../Tests/combi_input3.csv"]
+
+
+# ---------- small helpers ----------
+
+def build(name, filePath, func=lambda x: 1 if x & 1 else 0, tabulate=True):
+    sim = pydig(name)
+    clk = sim.clock(timePeriod=1, onTime=0.5, blockID="clk")
+    src = sim.source(filePath, blockID="src")
+    counter = sim.moore(maxOutSize=3, blockID="counter", nsl=lambda ps, i: (ps + i) % 8, ol=lambda ps: ps, clock=clk)
+    parity = sim.combinational(maxOutSize=1, blockID="parity", func=func, tabulate=tabulate)
+    mealy = sim.mealy(maxOutSize=3, blockID="mealy", nsl=lambda ps, i: (ps ^ i) & 3, ol=lambda ps, i: (ps + i) & 7, clock=clk)
+    out = sim.output(plot=False, blockID="out")
+
+    src.output() > counter.input()
+    counter.output() > parity.input()
+    parity.output() > mealy.input()
+    src.output(0, 2) > mealy.input()
+    mealy.output() > out.input()
+
+    return sim, src
+
+
+def buildMemo(name, filePath):
+    # no stateSize: the lookup tables of the machine only have a memo
+    sim = pydig(name)
+    clk = sim.clock(timePeriod=1, onTime=0.5, blockID="clk")
+    src = sim.source(filePath, blockID="src")
+    counter = sim.moore(maxOutSize=3, blockID="counter", nsl=lambda ps, i: 0 if i > 0 and ps == 3 else (ps + i) % 8,
+                        ol=lambda ps: ps if ps < 4 else 7, clock=clk, tabulate=True)
+    out = sim.output(plot=False, blockID="out")
+
+    src.output() > counter.input()
+    counter.output() > out.input()
+
+    return sim, src
+
+
+def lanesMatch(waveforms, build):
+    """
+    @return bool : True if every lane has the waveforms of a run of the cycle engine with its own file.
+    """
+    ok = len(waveforms) == len(FILES)
+    for lane, filePath in enumerate(FILES):
+        single, _ = build(f"batch_single{lane}", filePath)
+        single.run(until=8, engine="cycle")
+
+        recorded = {}
+        for block in components(single):
+            recorded.update(block.getScopeDump())
+
+        for label, samples in waveforms[lane].items():
+            # the present states are only recorded by the cycle engine once they change
+            initial = 0 if label.startswith("PS of") else None
+            ok = ok and samples == changes(recorded.get(label, []), initial)
+    return ok
+
+
+def changes(samples, initial=None):
+    """
+    @return list : the value changes of a signal, keeping the last sample of every time.
+    """
+    last = {} if initial is None else {0: initial}
+    for time, value in samples:
+        last[time] = value
+
+    result = []
+    for time in sorted(last):
+        if not result or result[-1][1] != last[time]:
+            result.append((time, last[time]))
+    return result
+
+
+# ---------- tests ----------
+
+def test_lanes_match_cycle_engine():
+    print("Running test_lanes_match_cycle_engine...")
+
+    sim, src = build("batch_lanes", FILES[0])
+    waveforms = sim.runBatch(until=8, stimuli={src: FILES})
+
+    if lanesMatch(waveforms, build):
+        print("PASS: test_lanes_match_cycle_engine")
+    else:
+        print("FAIL: test_lanes_match_cycle_engine")
+        raise AssertionError("a lane of the batch differs from its own run")
+
+
+def test_memo_tables():
+    print("Running test_memo_tables...")
+
+    sim, src = buildMemo("batch_memo", FILES[0])
+    waveforms = sim.runBatch(until=8, stimuli={src: FILES})
+    values = set(value for lane in waveforms for value in (x[1] for x in lane["output of counter"]))
+
+    if lanesMatch(waveforms, buildMemo) and 7 in values:
+        print("PASS: test_memo_tables")
+    else:
+        print("FAIL: test_memo_tables", values)
+        raise AssertionError("a tabulated function with a memo was not evaluated lane by lane")
+
+
+def test_function_not_numpy_compatible():
+    print("Running test_function_not_numpy_compatible...")
+
+    sim, src = build("batch_invalid_func", FILES[0], tabulate=False)
+    try:
+        sim.runBatch(until=4, stimuli={src: FILES})
+        print("FAIL: a function using if on its argument was evaluated on arrays")
+        raise AssertionError("expected exit for a function that is not NumPy compatible")
+    except SystemExit:
+        print("PASS: test_function_not_numpy_compatible")
+
+
+def test_stimulus_too_wide():
+    print("Running test_stimulus_too_wide...")
+
+    sim, src = build("batch_too_wide", "../../Tests/run_input1.csv")
+    try:
+        sim.runBatch(until=4, stimuli={src: ["../../Tests/run_input1.csv", "../../Tests/source_input3.csv"]})
+        print("FAIL: a stimulus wider than its Input block was accepted")
+        raise AssertionError("expected exit for a stimulus that is too wide")
+    except SystemExit:
+        print("PASS: test_stimulus_too_wide")
+
+
+if __name__ == "__main__":
+    test_lanes_match_cycle_engine()
+    test_memo_tables()
+    test_function_not_numpy_compatible()
+    test_stimulus_too_wide()
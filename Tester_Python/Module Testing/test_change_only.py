@@ -0,0 +1,117 @@
+"""
+Tester for change only fan out propagation (pydig(changeOnly=True) and block.setChangeOnly()).
+It verifies that unchanged outputs no longer run their fan out, that the skipped
+evaluations are counted and that the simulated values do not change.
+"""
+
+import sys
+import os
+
+# Add parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from pydig import pydig
+from helpers import blocks
+
+
+# ---------- small helpers ----------
+
+def build_chain(changeOnly):
+    """
+    A counter whose top bit drives a chain of buffers, so most of the
+    counter updates do not change what the chain sees.
+    """
+    sim = pydig(f"change_only_{changeOnly}", changeOnly=changeOnly)
+    calls = []
+
+    clk = sim.clock(timePeriod=1, onTime=0.5, blockID="clk")
+    src = sim.source("../../Tests/run_input1.csv", blockID="src")
+    counter = sim.moore(maxOutSize=3, blockID="counter", nsl=lambda ps, i: (ps + 1) % 8, ol=lambda ps: ps, clock=clk)
+    src.output() > counter.input()
+
+    top = sim.combinational(maxOutSize=1, blockID="top", func=lambda x: x >> 2, delay=0.1)
+    counter.output() > top.input()
+
+    def buffer(x):
+        calls.append(x)
+        return x
+
+    last = top
+    for i in range(3):
+        b = sim.combinational(maxOutSize=1, blockID=f"buf{i}", func=buffer, delay=0.1)
+        last.output() > b.input()
+        last = b
+
+    out = sim.output(plot=False, blockID="out")
+    last.output() > out.input()
+
+    return sim, calls, out
+
+
+def changes(block):
+    """
+    @return dict : the value changes of every signal of the block (repeated samples removed).
+    """
+    result = {}
+    for key, pairs in block.getScopeDump().items():
+        values = []
+        for time, val in pairs:
+            if values and values[-1][0] == time:
+                values[-1] = (time, val)
+            else:
+                values.append((time, val))
+        result[key] = [x for i, x in enumerate(values) if i == 0 or x[1] != values[i - 1][1]]
+    return result
+
+
+# ---------- tests ----------
+
+def test_change_only_same_values():
+    print("Running test_change_only_same_values...")
+
+    sim, plainCalls, plainOut = build_chain(False)
+    sim.run(until=20)
+    sim, calls, out = build_chain(True)
+    sim.run(until=20)
+
+    if changes(out) == changes(plainOut) and len(calls) < len(plainCalls):
+        print("PASS: test_change_only_same_values", len(plainCalls), "->", len(calls))
+    else:
+        print("FAIL: test_change_only_same_values", len(plainCalls), len(calls))
+        raise AssertionError("change only propagation changed the simulation")
+
+
+def test_change_only_counter():
+    print("Running test_change_only_counter...")
+
+    sim, _, _ = build_chain(True)
+    sim.run(until=20)
+    plain, _, _ = build_chain(False)
+    plain.run(until=20)
+
+    if sim.getSkippedCount() > 0 and plain.getSkippedCount() == 0:
+        print("PASS: test_change_only_counter", sim.getSkippedCount())
+    else:
+        print("FAIL: test_change_only_counter", sim.getSkippedCount(), plain.getSkippedCount())
+        raise AssertionError("skipped evaluations were not counted")
+
+
+def test_change_only_per_block():
+    print("Running test_change_only_per_block...")
+
+    sim, calls, _ = build_chain(False)
+    top = blocks(sim)["top"]
+    top.setChangeOnly(True)
+    sim.run(until=20)
+
+    if top.isChangeOnly() and top.getSkippedCount() > 0 and sim.getSkippedCount() == top.getSkippedCount():
+        print("PASS: test_change_only_per_block")
+    else:
+        print("FAIL: test_change_only_per_block", top.getSkippedCount(), sim.getSkippedCount())
+        raise AssertionError("per block change only setting was not applied")
+
+
+if __name__ == "__main__":
+    test_change_only_same_values()
+    test_change_only_counter()
+    test_change_only_per_block()
@@ -0,0 +1,183 @@
+"""
+Tester for pydig.checkpoint(path) and pydig.restore(path).
+It verifies that a simulation saved in the middle and restored into a new pydig
+object gives the same waveforms as running it in one go (also with delta cycles),
+that without the samples only the part after the checkpoint is recorded, that a checkpoint
+saved while a commit of registers is pending restores into a new build whose block IDs differ,
+and that checkpoints of another circuit or on the simpy kernel are rejected.
+"""
+
+import sys
+import os
+import tempfile
+
+# Add parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+# the circuits of BuildingBlocks import their modules by name
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'BuildingBlocks')))
+
+from pydig import pydig
+from BitCounters import Enabled4BitCounterWithTC
+from helpers import components, dumps
+
+
+# ---------- small helpers ----------
+
+def build(name, kernel="native", deltaCycles=False):
+    sim = pydig(name, kernel=kernel, deltaCycles=deltaCycles)
+    clk = sim.clock(timePeriod=1, onTime=0.5, blockID="clk")
+    src = sim.source("../../Tests/run_input5.csv", blockID="src")
+    counter = sim.moore(maxOutSize=2, blockID="counter", nsl=lambda ps, i: (ps + i) % 4, ol=lambda ps: ps, clock=clk, register_delay=0.1)
+    parity = sim.combinational(maxOutSize=1, blockID="parity", func=lambda x: bin(x).count("1") & 1, delay=0.2)
+    mealy = sim.mealy(maxOutSize=2, blockID="mealy", nsl=lambda ps, i: (ps ^ i) & 3, ol=lambda ps, i: (ps + i) & 3, clock=clk)
+    inverse = sim.combinational(maxOutSize=1, blockID="inverse", func=lambda x: 1 - x)
+    out = sim.output(plot=False, blockID="out")
+
+    src.output() > counter.input()
+    counter.output() > parity.input()
+    parity.output() > inverse.input()
+    inverse.output() > mealy.input()
+    mealy.output() > out.input()
+
+    return sim
+
+
+# ---------- tests ----------
+
+def test_split_run_matches_full_run():
+    print("Running test_split_run_matches_full_run...")
+
+    ok = True
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "run.ckpt")
+        for deltaCycles in (False, True):
+            full = build("checkpoint_full", deltaCycles=deltaCycles)
+            full.simulate(until=12)
+
+            first = build("checkpoint_first", deltaCycles=deltaCycles)
+            first.simulate(until=5)
+            first.checkpoint(path)
+
+            second = build("checkpoint_second", deltaCycles=deltaCycles)
+            second.restore(path)
+            second.simulate(until=12)
+
+            # continuing the saved object gives the same result too
+            first.simulate(until=12)
+
+            ok = ok and dumps(second) == dumps(full) and dumps(first) == dumps(full)
+
+    if ok:
+        print("PASS: test_split_run_matches_full_run")
+    else:
+        print("FAIL: test_split_run_matches_full_run")
+        raise AssertionError("the restored simulation differs from the full run")
+
+
+def test_without_samples():
+    print("Running test_without_samples...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "run.ckpt")
+        full = build("checkpoint_full")
+        full.simulate(until=12)
+
+        first = build("checkpoint_first")
+        first.simulate(until=5)
+        first.checkpoint(path, samples=False)
+
+        second = build("checkpoint_second")
+        second.restore(path)
+        second.simulate(until=12)
+
+    ok = True
+    for expected, found in zip(dumps(full), dumps(second)):
+        for label, samples in found.items():
+            # the events of time 5 had not run yet when the checkpoint was saved
+            ok = ok and samples == expected[label][-len(samples):] and len(samples) < len(expected[label])
+            ok = ok and all(t >= 5 for t, _ in samples)
+
+    if ok:
+        print("PASS: test_without_samples")
+    else:
+        print("FAIL: test_without_samples")
+        raise AssertionError("the samples before the checkpoint were restored")
+
+
+def test_pending_commit_other_ids():
+    print("Running test_pending_commit_other_ids...")
+
+    def buildCounter(name):
+        # every build numbers the blocks of the counter anew, so their IDs differ between builds
+        sim = pydig(name, kernel="native", headless=True)
+        enable = sim.source("../../Tests/BitCounter.csv", blockID="enable")
+        clk = sim.clock(timePeriod=1, onTime=0.005, blockID="clk")
+        counter = Enabled4BitCounterWithTC(sim, enable, clk, plot=False)
+        out = sim.output(plot=False, blockID="out")
+        counter.output() > out.input()
+        return sim, out
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "run.ckpt")
+        full, fullOut = buildCounter("checkpoint_counter_full")
+        full.simulate(until=8)
+
+        # the clock rises at 2.995, so the registers commit at 3.005
+        first, _ = buildCounter("checkpoint_counter_first")
+        first.simulate(until=3)
+        pending = [x.getClockDomain().getPending() for x in components(first) if getattr(x, "getClockDomain", lambda: None)() is not None]
+        first.checkpoint(path)
+
+        second, secondOut = buildCounter("checkpoint_counter_second")
+        second.restore(path)
+        second.simulate(until=8)
+
+    ids = [x.getBlockID() for x in components(first)] != [x.getBlockID() for x in components(second)]
+    if any(pending) and ids and secondOut.getScopeDump() == fullOut.getScopeDump():
+        print("PASS: test_pending_commit_other_ids")
+    else:
+        print("FAIL: test_pending_commit_other_ids")
+        raise AssertionError("a pending commit was not restored into a new build")
+
+
+def test_other_circuit():
+    print("Running test_other_circuit...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "run.ckpt")
+        first = build("checkpoint_first")
+        first.simulate(until=5)
+        first.checkpoint(path)
+
+        other = pydig("checkpoint_other", kernel="native")
+        src = other.source("../../Tests/run_input5.csv", blockID="src")
+        out = other.output(plot=False, blockID="out")
+        src.output() > out.input()
+
+        try:
+            other.restore(path)
+            print("FAIL: a checkpoint of another circuit was restored")
+            raise AssertionError("expected exit for a checkpoint of another circuit")
+        except SystemExit:
+            print("PASS: test_other_circuit")
+
+
+def test_simpy_kernel():
+    print("Running test_simpy_kernel...")
+
+    sim = build("checkpoint_simpy", kernel="simpy")
+    sim.simulate(until=5)
+    try:
+        sim.checkpoint(os.path.join(tempfile.gettempdir(), "simpy.ckpt"))
+        print("FAIL: a simulation on the simpy kernel was saved")
+        raise AssertionError("expected exit for the simpy kernel")
+    except SystemExit:
+        print("PASS: test_simpy_kernel")
+
+
+if __name__ == "__main__":
+    test_split_run_matches_full_run()
+    test_without_samples()
+    test_pending_commit_other_ids()
+    test_other_circuit()
+    test_simpy_kernel()
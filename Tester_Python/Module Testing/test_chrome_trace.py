@@ -0,0 +1,126 @@
+"""
+Tester for pydig.dumpChromeTrace(path), the trace event file of Chrome.
+It verifies that the file is valid JSON with a slice for the runs, fan outs and functions
+of the blocks (nested in the fan out that ran them), an instant event for every clock edge
+and a queue depth counter, that it is written in chunks while the simulation runs, that a
+continued run is appended to it and that tracing does not change the waveforms.
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+# Add parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from helpers import build_counter, parity, blocks, components, dumps
+
+
+# ---------- small helpers ----------
+
+def build(name, kernel="native", func=parity):
+    return build_counter(name, func=func, kernel=kernel, headless=True)
+
+
+def load(path):
+    with open(path) as file:
+        return json.load(file)
+
+
+# ---------- tests ----------
+
+def test_trace_events():
+    print("Running test_trace_events...")
+
+    ok = True
+    with tempfile.TemporaryDirectory() as directory:
+        for kernel in ("native", "simpy"):
+            path = os.path.join(directory, f"{kernel}.json")
+            sim = build(f"chrome_{kernel}", kernel)
+            sim.dumpChromeTrace(path, counterInterval=0)
+            sim.simulate(until=10)
+            events = load(path)
+
+            slices = [x for x in events if x["ph"] == "X"]
+            kinds = set(x["cat"] for x in slices)
+            edges = [x for x in events if x["ph"] == "i"]
+            clock = blocks(sim)["clk"].getScopeDump()["Clock clk"]
+
+            ok = ok and kinds == {"run", "fanOut", "nsl", "ol", "func"} and all(x["dur"] >= 0 for x in slices)
+            ok = ok and all(0 <= x["args"]["t"] < 10 and x["name"].endswith(x["args"]["block"]) for x in slices)
+            ok = ok and len(edges) == len(clock) - 1 and all(x["args"]["block"] == "clk" for x in edges)
+            ok = ok and any(x["ph"] == "C" and x["args"]["depth"] > 0 for x in events)
+
+            # after the first run of every block at time 0, the parity block is run inside the fan out of the counter
+            fanOuts = [x for x in slices if x["name"] == "fanOut counter"]
+            runs = [x for x in slices if x["name"] == "run parity" and x["args"]["t"] > 0]
+            ok = ok and runs and all(any(f["ts"] <= r["ts"] and r["ts"] + r["dur"] <= f["ts"] + f["dur"] for f in fanOuts) for r in runs)
+
+    if ok:
+        print("PASS: test_trace_events")
+    else:
+        print("FAIL: test_trace_events")
+        raise AssertionError("the trace does not hold the expected events")
+
+
+def test_streamed_in_chunks():
+    print("Running test_streamed_in_chunks...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "stream.json")
+        sizes = []
+
+        def recorded(x):
+            sizes.append(os.path.getsize(path))
+            return parity(x)
+
+        sim = build("chrome_stream", func=recorded)
+        sim.dumpChromeTrace(path, chunkSize=20)
+        sim.simulate(until=20)
+        final = os.path.getsize(path)
+        count = len(load(path))
+
+    # the file grows while the simulation runs
+    if len(set(sizes)) > 3 and sizes[0] < sizes[-1] < final and count > 40:
+        print("PASS: test_streamed_in_chunks")
+    else:
+        print("FAIL: test_streamed_in_chunks", sizes[:10])
+        raise AssertionError("the trace was not written while the simulation ran")
+
+
+def test_continued_run():
+    print("Running test_continued_run...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "continued.json")
+        plain = build("chrome_plain")
+        plain.simulate(until=14)
+
+        traced = build("chrome_traced")
+        before = [set(vars(c)) for c in components(traced)]
+        traced.dumpChromeTrace(path)
+        traced.simulate(until=8)
+        first = len(load(path))
+        traced.simulate(until=14)
+        events = load(path)
+        with open(path, "rb") as file:
+            content = file.read()
+        after = [set(vars(c)) for c in components(traced)]
+
+    ok = len(events) > first and max(x["args"]["t"] for x in events if x["ph"] == "X") >= 8
+    ok = ok and dumps(plain) == dumps(traced) and before == after
+    # the file is written in binary, with the same bytes on every platform
+    ok = ok and content.endswith(b"\n]\n") and b"\r" not in content and content.count(b"]\n") == 1
+
+    if ok:
+        print("PASS: test_continued_run")
+    else:
+        print("FAIL: test_continued_run")
+        raise AssertionError("the continued run was not appended to the trace or the waveforms changed")
+
+
+if __name__ == "__main__":
+    test_trace_events()
+    test_streamed_in_chunks()
+    test_continued_run()
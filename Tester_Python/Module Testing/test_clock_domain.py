@@ -0,0 +1,100 @@
+"""
+Tester for the ClockDomain, which commits all the registers of a clock in batches.
+It verifies that every active edge needs one commit event per register delay,
+that each register is loaded after its own delay and that registers whose next
+state went back to the present state are not loaded.
+"""
+
+import sys
+import os
+
+# Add parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from pydig import pydig
+
+
+# ---------- small helpers ----------
+
+def build_counters(count, delays=(0.01,)):
+    sim = pydig(f"clock_domain_{count}", kernel="native")
+    clk = sim.clock(timePeriod=1, onTime=0.5, blockID="clk")
+    src = sim.source("../../Tests/run_input1.csv", blockID="src")
+
+    counters = []
+    for i in range(count):
+        counter = sim.moore(maxOutSize=2, blockID=f"counter{i}", nsl=lambda ps, x: (ps + 1) % 4, ol=lambda ps: ps,
+                            clock=clk, register_delay=delays[i % len(delays)])
+        src.output() > counter.input()
+        counters.append(counter)
+
+    return sim, clk, counters
+
+
+def ps_times(block):
+    dump = block.getScopeDump()
+    keys = [k for k in dump if k.startswith("PS of")]
+    return [round(t, 2) for k in keys for t, _ in dump[k]]
+
+
+# ---------- tests ----------
+
+def test_one_batch_per_edge():
+    print("Running test_one_batch_per_edge...")
+
+    sim, clk, counters = build_counters(40)
+    sim.run(until=10)
+    domain = clk.getClockDomain()
+
+    # 10 rising edges (0.5 .. 9.5), every counter changes on each of them
+    if domain.getBatchCount() == 10 and domain.getCommitCount() == 400 and len(domain.getRegisters()) == 40:
+        print("PASS: test_one_batch_per_edge")
+    else:
+        print("FAIL: test_one_batch_per_edge", domain.getBatchCount(), domain.getCommitCount())
+        raise AssertionError("registers were not committed in one batch")
+
+
+def test_batches_per_delay():
+    print("Running test_batches_per_delay...")
+
+    sim, clk, counters = build_counters(4, delays=(0.01, 0.3))
+    sim.run(until=4)
+    domain = clk.getClockDomain()
+
+    fast = ps_times(counters[0])
+    slow = ps_times(counters[1])
+
+    if fast == [0.51, 1.51, 2.51, 3.51] and slow == [0.8, 1.8, 2.8, 3.8] and domain.getBatchCount() == 8:
+        print("PASS: test_batches_per_delay")
+    else:
+        print("FAIL: test_batches_per_delay", fast, slow, domain.getBatchCount())
+        raise AssertionError("register delays were not respected")
+
+
+def test_unchanged_registers_skipped():
+    """
+    The next state changes just after the edge and goes back to the present
+    state before the register delay is over, so the register is not loaded.
+    """
+    print("Running test_unchanged_registers_skipped...")
+
+    sim = pydig("clock_domain_skip", kernel="native")
+    clk = sim.clock(timePeriod=1, onTime=0.5, blockID="clk")
+    src = sim.source("../../Tests/run_input1.csv", blockID="src")
+    hold = sim.moore(maxOutSize=1, blockID="hold", nsl=lambda ps, x: x & 1, ol=lambda ps: ps,
+                     clock=clk, register_delay=0.6)
+    src.output() > hold.input()
+    sim.run(until=3)
+
+    domain = clk.getClockDomain()
+    if domain.getCommitCount() == 0 and ps_times(hold) == []:
+        print("PASS: test_unchanged_registers_skipped")
+    else:
+        print("FAIL: test_unchanged_registers_skipped", domain.getCommitCount(), ps_times(hold))
+        raise AssertionError("a register without a new state was loaded")
+
+
+if __name__ == "__main__":
+    test_one_batch_per_edge()
+    test_batches_per_delay()
+    test_unchanged_registers_skipped()
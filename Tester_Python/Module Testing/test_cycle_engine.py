@@ -0,0 +1,192 @@
+"""
+Tester for pydig.run(until, engine="cycle").
+It verifies that the cycle engine produces the same per-clock register and
+output values as the event engine, that the steady state fast forward keeps the
+waveforms (also for states with the same hash), and that it rejects circuits it
+cannot levelize.
+"""
+
+import sys
+import os
+
+# Add parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from pydig import pydig
+from helpers import blocks, build_pwm
+
+
+# ---------- small helpers ----------
+
+def build(name):
+    """
+    @return tuple : the PWM example, its counter and its output.
+    """
+    sim = build_pwm(name)
+    pwm = blocks(sim)
+    return sim, pwm["Mod 4 Counter"], pwm["PWM Output"]
+
+
+def value_at(pairs, t):
+    """
+    @return int : the last recorded value at or before time t.
+    """
+    val = 0
+    for time, v in pairs:
+        if time > t:
+            break
+        val = v
+    return val
+
+
+def per_clock(block, label, until):
+    """
+    Samples a signal just before every rising edge of a clock with period 1.
+    """
+    dump = block.getScopeDump()
+    key = [k for k in dump if k.startswith(label)][0]
+    return [value_at(dump[key], k + 0.45) for k in range(until - 1)]
+
+
+# ---------- tests ----------
+
+def test_cycle_matches_event_pwm():
+    print("Running test_cycle_matches_event_pwm...")
+
+    results = {}
+    for engine in ("event", "cycle"):
+        sim, counter, out = build(f"cycle_pwm_{engine}")
+        sim.run(until=20, engine=engine)
+        results[engine] = (per_clock(counter, "PS of", 20), per_clock(out, "Final Output", 20))
+
+    if results["event"] == results["cycle"]:
+        print("PASS: test_cycle_matches_event_pwm")
+    else:
+        print("FAIL: test_cycle_matches_event_pwm")
+        print("Event:", results["event"])
+        print("Cycle:", results["cycle"])
+        raise AssertionError("cycle engine differs from event engine")
+
+
+def test_cycle_counter_chain():
+    print("Running test_cycle_counter_chain...")
+
+    sim = pydig("cycle_chain")
+    clk = sim.clock(timePeriod=1, onTime=0.5, blockID="clk_chain")
+    src = sim.source("../../Tests/run_input1.csv", blockID="src_chain")
+
+    first = sim.moore(maxOutSize=2, blockID="first", nsl=lambda ps, i: (ps + 1) % 4, ol=lambda ps: ps, clock=clk)
+    second = sim.moore(maxOutSize=2, blockID="second", nsl=lambda ps, i: i, ol=lambda ps: ps, clock=clk)
+    src.output() > first.input()
+    first.output() > second.input()
+
+    sim.run(until=10, engine="cycle")
+
+    first_vals = per_clock(first, "PS of", 10)
+    second_vals = per_clock(second, "PS of", 10)
+
+    # second is a registered copy of first, so it lags by exactly one clock
+    if first_vals[:5] == [0, 1, 2, 3, 0] and second_vals[1:] == first_vals[:-1]:
+        print("PASS: test_cycle_counter_chain")
+    else:
+        print("FAIL: test_cycle_counter_chain", first_vals, second_vals)
+        raise AssertionError("registered chain mismatch")
+
+
+def test_cycle_combinational_loop():
+    """
+    A zero-delay combinational loop cannot be levelized -> SystemExit.
+    """
+    print("Running test_cycle_combinational_loop...")
+
+    sim = pydig("cycle_loop")
+    a = sim.combinational(maxOutSize=1, blockID="loop_a", func=lambda x: x ^ 1)
+    b = sim.combinational(maxOutSize=1, blockID="loop_b", func=lambda x: x)
+    a.output() > b.input()
+    b.output() > a.input()
+
+    try:
+        sim.run(until=5, engine="cycle")
+        print("FAIL: combinational loop was accepted")
+        raise AssertionError("combinational loop was accepted")
+    except SystemExit:
+        print("PASS: test_cycle_combinational_loop")
+
+
+def test_cycle_steady_state():
+    """
+    The PWM input is applied at 0.05, after which the circuit repeats every 2 time units.
+    """
+    print("Running test_cycle_steady_state...")
+
+    results = {}
+    for steadyState in (False, True):
+        sim, counter, out = build(f"cycle_steady_{steadyState}")
+        sim.run(until=200, engine="cycle", steadyState=steadyState)
+        results[steadyState] = (counter.getScopeDump(), out.getScopeDump(), sim.getSteadyState())
+
+    report = results[True][2]
+    if results[False][:2] == results[True][:2] and results[False][2] is None and report["period"] == 2 and report["repeats"] > 90:
+        print("PASS: test_cycle_steady_state", report)
+    else:
+        print("FAIL: test_cycle_steady_state", report)
+        raise AssertionError("steady state fast forward changed the waveforms")
+
+
+def test_steady_state_hash_collision():
+    """
+    The states -1 and -2 have the same hash, so a machine that swaps them on every clock
+    has two states that only a comparison of the states themselves tells apart.
+    """
+    print("Running test_steady_state_hash_collision...")
+
+    results = {}
+    for steadyState in (False, True):
+        sim = pydig(f"cycle_collision_{steadyState}")
+        clk = sim.clock(timePeriod=1, onTime=0.5, blockID="clk", plot=False)
+        src = sim.source("../../Tests/run_input5.csv", blockID="src", plot=False)
+        swap = sim.moore(maxOutSize=1, blockID="swap", startingState=-1, nsl=lambda ps, i: -3 - ps, ol=lambda ps: 0, clock=clk, plot=False)
+        src.output(0, 1) > swap.input()
+        sim.simulate(until=40, engine="cycle", steadyState=steadyState)
+        results[steadyState] = (swap.getScopeDump(), sim.getSteadyState())
+
+    report = results[True][1]
+    if results[False][0] == results[True][0] and report["period"] == 2:
+        print("PASS: test_steady_state_hash_collision", report)
+    else:
+        print("FAIL: test_steady_state_hash_collision", report)
+        raise AssertionError("two states with the same hash were taken for a cycle")
+
+
+def test_steady_state_needs_cycle_engine():
+    print("Running test_steady_state_needs_cycle_engine...")
+
+    sim, _, _ = build("cycle_steady_event")
+    try:
+        sim.run(until=5, steadyState=True)
+        print("FAIL: steady state was accepted by the event engine")
+        raise AssertionError("steady state was accepted by the event engine")
+    except SystemExit:
+        print("PASS: test_steady_state_needs_cycle_engine")
+
+
+def test_invalid_engine():
+    print("Running test_invalid_engine...")
+
+    sim, _, _ = build("cycle_invalid")
+    try:
+        sim.run(until=5, engine="warp")
+        print("FAIL: invalid engine was accepted")
+        raise AssertionError("invalid engine was accepted")
+    except SystemExit:
+        print("PASS: test_invalid_engine")
+
+
+if __name__ == "__main__":
+    test_cycle_matches_event_pwm()
+    test_cycle_counter_chain()
+    test_cycle_combinational_loop()
+    test_cycle_steady_state()
+    test_steady_state_hash_collision()
+    test_steady_state_needs_cycle_engine()
+    test_invalid_engine()
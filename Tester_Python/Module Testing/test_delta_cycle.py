@@ -0,0 +1,108 @@
+"""
+Tester for pydig(deltaCycles=True).
+It verifies that zero delay combinational blocks are evaluated once per time,
+that a zero delay loop which does not settle is reported, and that the values
+of a circuit without glitches are unchanged.
+"""
+
+import sys
+import os
+
+# Add parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from pydig import pydig
+
+
+# ---------- small helpers ----------
+
+def build_fanin(deltaCycles):
+    """
+    Three zero delay buffers of the same input all drive one zero delay gate,
+    so the gate sees three input changes at the same time.
+    """
+    sim = pydig(f"delta_fanin_{deltaCycles}", deltaCycles=deltaCycles)
+    calls = []
+
+    src = sim.source("../../Tests/run_input1.csv", blockID="src")
+    bufs = [sim.combinational(maxOutSize=1, blockID=f"buf{i}", func=lambda x: x & 1) for i in range(3)]
+
+    def gate(x):
+        calls.append(x)
+        return int(x in (0, 7))
+
+    node = sim.combinational(maxOutSize=1, blockID="node", func=gate)
+    out = sim.output(plot=False, blockID="out")
+
+    for b in bufs:
+        src.output() > b.input()
+        b.output() > node.input()
+    node.output() > out.input()
+
+    return sim, calls, out
+
+
+def final_values(block):
+    dump = block.getScopeDump()
+    return {k: v[-1][1] for k, v in dump.items()}
+
+
+# ---------- tests ----------
+
+def test_delta_single_evaluation():
+    print("Running test_delta_single_evaluation...")
+
+    sim, calls, out = build_fanin(True)
+    sim.run(until=10)
+
+    # the gate must never see a partially updated input (only all zeros or all ones)
+    if calls and all(x in (0, 7) for x in calls):
+        print("PASS: test_delta_single_evaluation", len(calls))
+    else:
+        print("FAIL: test_delta_single_evaluation", calls)
+        raise AssertionError("zero delay gate saw a glitch")
+
+
+def test_delta_fewer_evaluations():
+    print("Running test_delta_fewer_evaluations...")
+
+    sim, plain, plainOut = build_fanin(False)
+    sim.run(until=10)
+    sim, delta, deltaOut = build_fanin(True)
+    sim.run(until=10)
+
+    if len(delta) < len(plain) and final_values(deltaOut) == final_values(plainOut):
+        print("PASS: test_delta_fewer_evaluations", len(plain), "->", len(delta))
+    else:
+        print("FAIL: test_delta_fewer_evaluations", len(plain), len(delta))
+        raise AssertionError("delta cycles did not reduce the evaluations")
+
+
+def test_delta_loop_reported():
+    """
+    A zero delay inverter loop never settles -> SystemExit.
+    """
+    print("Running test_delta_loop_reported...")
+
+    sim = pydig("delta_loop", deltaCycles=True, maxDeltaCycles=50)
+    src = sim.source("../../Tests/run_input1.csv", blockID="src_loop")
+    a = sim.combinational(maxOutSize=1, blockID="loop_a", func=lambda x: (x >> 1) ^ 1)
+    b = sim.combinational(maxOutSize=1, blockID="loop_b", func=lambda x: x)
+    src.output() > a.input()
+    b.output() > a.input()
+    a.output() > b.input()
+    out = sim.output(plot=False, blockID="out_loop")
+    b.output() > out.input()
+
+    try:
+        sim.run(until=5)
+        print("FAIL: unsettled loop was accepted")
+        raise AssertionError("unsettled loop was accepted")
+    except SystemExit:
+        print("PASS: test_delta_loop_reported")
+
+
+if __name__ == "__main__":
+    test_delta_single_evaluation()
+    test_delta_fewer_evaluations()
+    test_delta_loop_reported()
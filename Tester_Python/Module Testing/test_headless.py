@@ -0,0 +1,86 @@
+"""
+Tester for the lazy imports of pydig and pydig(headless=True).
+Every check runs in a new Python process, so that the libraries imported by the
+other tests do not count. It verifies that importing pydig loads none of matplotlib,
+pandas, openpyxl, simpy and NumPy, that a run without plotted blocks and a headless
+run with plotted blocks do not load matplotlib, and that a plotted run still does.
+"""
+
+import sys
+import os
+import subprocess
+
+# Add parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+HEAVY = ("matplotlib", "pandas", "openpyxl", "simpy", "numpy")
+
+
+# ---------- small helpers ----------
+
+def loaded(body):
+    """
+    @return list : the heavy libraries loaded after running body in a new process.
+    """
+    code = f"import sys\nimport pydig\n{body}\nprint(','.join(x for x in {HEAVY!r} if x in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=dict(os.environ, MPLBACKEND="Agg"),
+                            capture_output=True, text=True, check=True)
+    last = result.stdout.strip().splitlines()[-1] if result.stdout.strip() else ""
+    return [x for x in last.split(",") if x]
+
+
+def circuit(kernel, headless, plot):
+    return f"""
+sim = pydig.pydig("headless", kernel={kernel!r}, headless={headless})
+src = sim.source("Tests/run_input5.csv", blockID="src")
+clk = sim.clock(timePeriod=1, onTime=0.5, blockID="clk")
+counter = sim.moore(maxOutSize=2, blockID="counter", nsl=lambda ps, i: (ps + i) % 4, ol=lambda ps: ps, clock=clk)
+out = sim.output(plot={plot}, blockID="out")
+src.output() > counter.input()
+counter.output() > out.input()
+sim.run(until=5)
+"""
+
+
+# ---------- tests ----------
+
+def test_import_is_light():
+    print("Running test_import_is_light...")
+
+    found = loaded("")
+    if found == []:
+        print("PASS: test_import_is_light")
+    else:
+        print("FAIL: test_import_is_light", found)
+        raise AssertionError("importing pydig loaded heavy libraries")
+
+
+def test_run_without_plots():
+    print("Running test_run_without_plots...")
+
+    unplotted = loaded(circuit("native", False, False))
+    headless = loaded(circuit("native", True, True))
+
+    if "matplotlib" not in unplotted and "simpy" not in unplotted and "matplotlib" not in headless:
+        print("PASS: test_run_without_plots")
+    else:
+        print("FAIL: test_run_without_plots", unplotted, headless)
+        raise AssertionError("a run that plots nothing loaded matplotlib")
+
+
+def test_plotted_run():
+    print("Running test_plotted_run...")
+
+    found = loaded(circuit("simpy", False, True))
+    if "matplotlib" in found and "simpy" in found:
+        print("PASS: test_plotted_run")
+    else:
+        print("FAIL: test_plotted_run", found)
+        raise AssertionError("a plotted run on the simpy kernel did not load matplotlib and simpy")
+
+
+if __name__ == "__main__":
+    test_import_is_light()
+    test_run_without_plots()
+    test_plotted_run()
@@ -0,0 +1,118 @@
+"""
+Tester for pydig.keepSnapshots(interval) and pydig.resimulate(stimuli).
+It verifies that re-simulating with an edited stimulus gives the same waveforms as a
+full run with that stimulus while only simulating from the last snapshot before the
+edit, that an unchanged stimulus is not simulated again, and that re-simulating
+without snapshots or on the simpy kernel is rejected.
+"""
+
+import sys
+import os
+
+# Add parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from helpers import build_counter, blocks, dumps
+
+
+# ---------- small helpers ----------
+
+def build(name, kernel="native", deltaCycles=False):
+    sim = build_counter(name, mealy=True, kernel=kernel, deltaCycles=deltaCycles)
+    return sim, blocks(sim)["src"]
+
+
+def edits(inputList):
+    """
+    @return list : schedules that differ from inputList by a value, by a time, by a missing or by an extra change.
+    """
+    last = len(inputList) - 1
+    time, value = inputList[last]
+    return [
+        inputList[:last] + [(time, 1 - value)],
+        inputList[:last] + [(time + 0.5, value)],
+        inputList[:1] + [(inputList[1][0], 1 - inputList[1][1])] + inputList[2:],
+        inputList[:last],
+        inputList + [(time + 2, 1 - value)],
+    ]
+
+
+# ---------- tests ----------
+
+def test_resimulate_matches_full_run():
+    print("Running test_resimulate_matches_full_run...")
+
+    ok = True
+    for deltaCycles in (False, True):
+        sim, src = build("incremental", deltaCycles=deltaCycles)
+        sim.keepSnapshots(1)
+        sim.simulate(until=12)
+
+        # every edit is applied to the result of the previous one
+        for inputList in edits(src.getInputList()):
+            start = sim.resimulate({src: inputList})
+
+            full, fullSrc = build("incremental_full", deltaCycles=deltaCycles)
+            fullSrc.setInputList(inputList)
+            full.simulate(until=12)
+
+            ok = ok and dumps(sim) == dumps(full) and start is not None
+
+        # the last change of the stimulus is late, the run is not simulated again from 0
+        last = src.getInputList()
+        start = sim.resimulate({src: last[:-1] + [(last[-1][0], 1 - last[-1][1])]})
+        ok = ok and 0 < start <= last[-1][0]
+
+    if ok:
+        print("PASS: test_resimulate_matches_full_run")
+    else:
+        print("FAIL: test_resimulate_matches_full_run")
+        raise AssertionError("the re-simulation differs from a full run with the edited stimulus")
+
+
+def test_unchanged_stimulus():
+    print("Running test_unchanged_stimulus...")
+
+    sim, src = build("incremental_unchanged")
+    sim.keepSnapshots(2)
+    sim.simulate(until=8)
+    before = dumps(sim)
+    start = sim.resimulate({src: "../../Tests/run_input5.csv"})
+
+    if start is None and dumps(sim) == before:
+        print("PASS: test_unchanged_stimulus")
+    else:
+        print("FAIL: test_unchanged_stimulus", start)
+        raise AssertionError("an unchanged stimulus was simulated again")
+
+
+def test_without_snapshots():
+    print("Running test_without_snapshots...")
+
+    sim, src = build("incremental_no_snapshots")
+    sim.simulate(until=8)
+    try:
+        sim.resimulate({src: src.getInputList()[:-1]})
+        print("FAIL: a run without snapshots was simulated again")
+        raise AssertionError("expected exit without keepSnapshots")
+    except SystemExit:
+        print("PASS: test_without_snapshots")
+
+
+def test_simpy_kernel():
+    print("Running test_simpy_kernel...")
+
+    sim, _ = build("incremental_simpy", kernel="simpy")
+    try:
+        sim.keepSnapshots(1)
+        print("FAIL: snapshots were kept on the simpy kernel")
+        raise AssertionError("expected exit for the simpy kernel")
+    except SystemExit:
+        print("PASS: test_simpy_kernel")
+
+
+if __name__ == "__main__":
+    test_resimulate_matches_full_run()
+    test_unchanged_stimulus()
+    test_without_snapshots()
+    test_simpy_kernel()
@@ -0,0 +1,96 @@
+"""
+Tester for pydig(kernel="native").
+It verifies that the NativeKernel gives exactly the same simulation as simpy,
+including blocks that are still written as simpy style generators.
+"""
+
+import sys
+import os
+
+# Add parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from pydig import pydig
+from blocks import HasOnlyOutputConnections
+from helpers import build_counter, blocks, components, dumps
+
+
+# ---------- small helpers ----------
+
+class Pulse(HasOnlyOutputConnections):
+    """
+    A custom source written with a generator, like blocks written for simpy.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(maxOutSize=1, **kwargs)
+
+    def __str__(self):
+        return f"Pulse ID {self.getBlockID()}"
+
+    def _go(self):
+        while True:
+            yield self._env.timeout(1.5)
+            self._output[0] = 1 - self._output[0]
+            self._scopeDump.add(f"Pulse {self.getBlockID()}", self._env.now, self._output[0])
+            self.processFanOut()
+
+
+def build(kernel):
+    sim = build_counter(f"kernel_{kernel}", kernel=kernel)
+
+    # the pulse is the second input of the parity block
+    pulse = Pulse(env=sim.getEnv(), blockID="pulse", plot=False)
+    components(sim).append(pulse)
+    pulse.output() > blocks(sim)["parity"].input()
+
+    return sim
+
+
+# ---------- tests ----------
+
+def test_native_matches_simpy():
+    print("Running test_native_matches_simpy...")
+
+    results = {}
+    for kernel in ("simpy", "native"):
+        sim = build(kernel)
+        sim.run(until=15)
+        results[kernel] = dumps(sim)
+
+    if results["simpy"] == results["native"]:
+        print("PASS: test_native_matches_simpy")
+    else:
+        print("FAIL: test_native_matches_simpy")
+        raise AssertionError("native kernel differs from simpy")
+
+
+def test_native_event_count():
+    print("Running test_native_event_count...")
+
+    sim = build("native")
+    sim.run(until=15)
+    env = sim.getEnv()
+
+    if env.getEventCount() > 0 and env.now == 15:
+        print("PASS: test_native_event_count", env.getEventCount())
+    else:
+        print("FAIL: test_native_event_count", env.getEventCount(), env.now)
+        raise AssertionError("native kernel did not run")
+
+
+def test_invalid_kernel():
+    print("Running test_invalid_kernel...")
+
+    try:
+        pydig("kernel_invalid", kernel="turbo")
+        print("FAIL: invalid kernel was accepted")
+        raise AssertionError("invalid kernel was accepted")
+    except SystemExit:
+        print("PASS: test_invalid_kernel")
+
+
+if __name__ == "__main__":
+    test_native_matches_simpy()
+    test_native_event_count()
+    test_invalid_kernel()
@@ -138,11 +138,13 @@ def test_moore_cascade():
         for i in range(1, len(out1))
     ) if len(out1) > 1 else False
 
-    # Check: moore2 output is essentially moore1 delayed
+    # Check: moore2 output is moore1 delayed by one clock. The output logic of a
+    # moore machine only runs when its present state changes, so moore2 records
+    # every value of moore1 once, one clock edge after moore1.
     min_len = len(out2)
-    ok_delay = min_len > 0 and all(
-        out2[i] == out1[(i-1)//2]
-        for i in range(1, min_len)
+    ok_delay = min_len > 0 and len(out1) == min_len + 1 and all(
+        out2[i] == out1[i]
+        for i in range(min_len)
     )
 
     if ok_counter and ok_delay:
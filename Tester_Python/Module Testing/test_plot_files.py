@@ -0,0 +1,116 @@
+"""
+Tester for the decimation of the plots (scope.decimate) and pydig.savePlots(directory).
+It verifies that a decimated waveform keeps at most four samples per pixel column with
+the same lowest and highest value in every column, that short waveforms are kept whole,
+that run() saves one PNG or SVG file per figure (in this process or in a pool of
+processes, headless or not) and that invalid formats and samples are rejected.
+"""
+
+import sys
+import os
+import tempfile
+
+# Add parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from pydig import pydig
+from scope import Plotter, decimate
+
+
+# ---------- small helpers ----------
+
+def build(directory, fileFormat="png", workers=None, headless=False):
+    sim = pydig("plot_files", kernel="native", headless=headless)
+    sim.savePlots(directory, fileFormat, width=400, workers=workers)
+    clk = sim.clock(timePeriod=1, onTime=0.5, blockID="clk", plot=True)
+    src = sim.source("../../Tests/run_input5.csv", blockID="src")
+    counter = sim.moore(maxOutSize=3, blockID="counter", nsl=lambda ps, i: (ps + i) % 8, ol=lambda ps: ps, clock=clk, plot=True)
+    out = sim.output(plot=True, blockID="out")
+
+    src.output() > counter.input()
+    counter.output() > out.input()
+
+    return sim
+
+
+def columns(times, values, end, width):
+    """
+    @return dict : the (lowest, highest) value of every pixel column.
+    """
+    found = {}
+    for t, v in zip(times, values):
+        column = min(int(t * width / end), width - 1)
+        low, high = found.get(column, (v, v))
+        found[column] = (min(low, v), max(high, v))
+    return found
+
+
+# ---------- tests ----------
+
+def test_decimate_envelope():
+    print("Running test_decimate_envelope...")
+
+    times = [x * 0.25 for x in range(40000)]
+    values = [(x * 7919) % 13 for x in range(40000)]
+    keptTimes, keptValues = decimate(times, values, 10000, 300)
+    shortTimes, _ = decimate(times[:100], values[:100], 10000, 300)
+
+    ok = len(keptTimes) <= 4 * 300 and list(keptTimes) == sorted(keptTimes)
+    ok = ok and columns(times, values, 10000, 300) == columns(keptTimes, keptValues, 10000, 300)
+    ok = ok and keptTimes[0] == times[0] and keptTimes[-1] == times[-1] and len(shortTimes) == 100
+
+    if ok:
+        print("PASS: test_decimate_envelope")
+    else:
+        print("FAIL: test_decimate_envelope", len(keptTimes))
+        raise AssertionError("the decimated waveform does not keep the envelope of every column")
+
+
+def test_save_plots():
+    print("Running test_save_plots...")
+
+    ok = True
+    for fileFormat, workers, headless in (("png", 1, False), ("svg", 2, True)):
+        with tempfile.TemporaryDirectory() as directory:
+            sim = build(os.path.join(directory, "plots"), fileFormat, workers, headless)
+            sim.run(until=20)
+            files = sim.getPlotFiles()
+
+            names = sorted(os.path.basename(x) for x in files)
+            ok = ok and names == [f"Plot of {x} #1.{fileFormat}" for x in ("clk", "counter", "out")]
+            for path in files:
+                with open(path, "rb") as file:
+                    head = file.read(200)
+                ok = ok and (head.startswith(b"\x89PNG") if fileFormat == "png" else b"<svg" in head or b"<?xml" in head)
+
+    if ok:
+        print("PASS: test_save_plots")
+    else:
+        print("FAIL: test_save_plots", files)
+        raise AssertionError("run() did not save one file per figure")
+
+
+def test_invalid_arguments():
+    print("Running test_invalid_arguments...")
+
+    rejected = 0
+    for call in (lambda: Plotter("plots", "gif"),
+                 lambda: Plotter("plots", "png", width=10),
+                 lambda: Plotter("plots", "png", workers=0),
+                 lambda: Plotter().plot({"a": [(0, 1), (1, 2.5)]}, "bad")):
+        try:
+            call()
+        except SystemExit:
+            rejected += 1
+
+    if rejected == 4:
+        print("PASS: test_invalid_arguments")
+    else:
+        print("FAIL: test_invalid_arguments", rejected)
+        raise AssertionError("an invalid format, width, worker count or sample was accepted")
+
+
+if __name__ == "__main__":
+    test_decimate_envelope()
+    test_save_plots()
+    test_invalid_arguments()
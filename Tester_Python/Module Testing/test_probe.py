@@ -0,0 +1,81 @@
+"""
+Tester for pydig.probe(block, which).
+It verifies that without probes every signal is recorded, that once a probe is
+used only the probed signals are recorded (and dumped), and that invalid
+signal kinds are rejected.
+"""
+
+import sys
+import os
+
+# Add parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from scope import ScopeMerger
+from helpers import INPUT1, build_counter, blocks
+
+
+# ---------- small helpers ----------
+
+def build(name):
+    sim = build_counter(name, inputFile=INPUT1, func=lambda x: x & 1, delay=0.1)
+    found = blocks(sim)
+    return sim, found["clk"], found["counter"], found["parity"], found["out"]
+
+
+# ---------- tests ----------
+
+def test_no_probe_records_everything():
+    print("Running test_no_probe_records_everything...")
+
+    sim, clk, counter, parity, out = build("probe_none")
+    sim.run(until=6)
+
+    keys = set(counter.getScopeDump())
+    expected = {"Clock clk", "Input to counter", "NS of counter", "PS of counter", "output of counter"}
+    if keys == expected and parity.getScopeDump() and out.getScopeDump():
+        print("PASS: test_no_probe_records_everything")
+    else:
+        print("FAIL: test_no_probe_records_everything", keys)
+        raise AssertionError("signals were not recorded without probes")
+
+
+def test_probe_selected_signals():
+    print("Running test_probe_selected_signals...")
+
+    sim, clk, counter, parity, out = build("probe_some")
+    sim.probe(counter, ("ps", "output"))
+    sim.probe(out)
+    sim.run(until=6)
+
+    # the clock is not probed, so the machine only shows its own probed signals
+    ok = set(counter.getScopeDump()) == {"PS of counter", "output of counter"}
+    ok = ok and parity.getScopeDump() == {} and clk.getScopeDump() == {}
+    ok = ok and len(out.getScopeDump()["Final Output from out"]) > 1
+
+    merger = ScopeMerger([x.getScopeDumps() for x in (clk, counter, parity, out)])
+    ok = ok and set(merger.getLabels()) == {"PS of counter", "output of counter", "Final Output from out"}
+
+    if ok:
+        print("PASS: test_probe_selected_signals")
+    else:
+        print("FAIL: test_probe_selected_signals", counter.getScopeDump().keys(), parity.getScopeDump().keys())
+        raise AssertionError("unprobed signals were recorded")
+
+
+def test_probe_invalid_kind():
+    print("Running test_probe_invalid_kind...")
+
+    sim, clk, counter, parity, out = build("probe_invalid")
+    try:
+        sim.probe(parity, "ps")
+        print("FAIL: invalid signal kind was accepted")
+        raise AssertionError("invalid signal kind was accepted")
+    except SystemExit:
+        print("PASS: test_probe_invalid_kind")
+
+
+if __name__ == "__main__":
+    test_no_probe_records_everything()
+    test_probe_selected_signals()
+    test_probe_invalid_kind()
@@ -0,0 +1,130 @@
+"""
+Tester for pydig.run(until, profile=True) and pydig.getProfile().
+It verifies that the counters of every block add up (runs, calls of nsl/ol/func, events
+scheduled and samples stored), that profiling does not change the waveforms and leaves
+the blocks as they were, that the cycle engine is profiled too, and that run() prints
+the report and writes it to output/<name>_profile.json.
+"""
+
+import sys
+import os
+import json
+import tempfile
+import contextlib
+import io
+
+# Add parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from helpers import build_counter, components, dumps
+
+
+# ---------- small helpers ----------
+
+def build(name, kernel="native", deltaCycles=False):
+    return build_counter(name, kernel=kernel, deltaCycles=deltaCycles, headless=True)
+
+
+def byID(profile):
+    return {x["blockID"]: x for x in profile["blocks"]}
+
+
+# ---------- tests ----------
+
+def test_counters_add_up():
+    print("Running test_counters_add_up...")
+
+    ok = True
+    for kernel in ("native", "simpy"):
+        sim = build(f"profile_{kernel}", kernel)
+        initial = [sum(c._scopeDump.getSampleCounts().values()) for c in components(sim)]
+        sim.simulate(until=12, profile=True)
+        profile = sim.getProfile()
+        blocks = byID(profile)
+        stored = sum(sum(c._scopeDump.getSampleCounts().values()) for c in components(sim)) - sum(initial)
+
+        ok = ok and blocks["parity"]["calls"] == blocks["parity"]["runs"] == blocks["parity"]["events"] > 0
+        ok = ok and blocks["counter"]["calls"] > 0 and blocks["clk"]["events"] >= 24 and blocks["out"]["calls"] == 0
+        ok = ok and profile["samples"] == stored and profile["events"] == sum(x["events"] for x in profile["blocks"])
+        ok = ok and profile["peakQueueDepth"] > 0 and all(0 <= t < 12 for t, _ in profile["queueDepth"])
+        ok = ok and profile["blocks"][0]["callTime"] >= profile["blocks"][-1]["callTime"]
+        if kernel == "native":
+            env = sim.getEnv()
+            ok = ok and profile["events"] <= env.getEventCount() + env.getQueueLength()
+
+    if ok:
+        print("PASS: test_counters_add_up")
+    else:
+        print("FAIL: test_counters_add_up", profile)
+        raise AssertionError("the counters of the profile do not add up")
+
+
+def test_profile_changes_nothing():
+    print("Running test_profile_changes_nothing...")
+
+    ok = True
+    for deltaCycles in (False, True):
+        plain = build("profile_plain", deltaCycles=deltaCycles)
+        plain.simulate(until=10)
+        profiled = build("profile_profiled", deltaCycles=deltaCycles)
+        before = [set(vars(c)) for c in components(profiled)]
+        profiled.simulate(until=10, profile=True)
+        after = [set(vars(c)) for c in components(profiled)]
+
+        ok = ok and dumps(plain) == dumps(profiled) and before == after and plain.getProfile() is None
+        # a continued run is profiled on its own
+        profiled.simulate(until=14, profile=True)
+        ok = ok and all(t >= 10 for t, _ in profiled.getProfile()["queueDepth"])
+
+    if ok:
+        print("PASS: test_profile_changes_nothing")
+    else:
+        print("FAIL: test_profile_changes_nothing")
+        raise AssertionError("profiling changed the waveforms or the blocks")
+
+
+def test_cycle_engine():
+    print("Running test_cycle_engine...")
+
+    sim = build("profile_cycle")
+    sim.simulate(until=10, engine="cycle", profile=True)
+    blocks = byID(sim.getProfile())
+
+    if blocks["counter"]["calls"] > 0 and blocks["parity"]["calls"] > 0 and sim.getProfile()["events"] == 0:
+        print("PASS: test_cycle_engine")
+    else:
+        print("FAIL: test_cycle_engine", blocks)
+        raise AssertionError("the cycle engine was not profiled")
+
+
+def test_run_writes_report():
+    print("Running test_run_writes_report...")
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            sim = build("profile_run")
+            printed = io.StringIO()
+            with contextlib.redirect_stdout(printed):
+                sim.run(until=10, profile=True)
+            with open(os.path.join("output", "profile_run_profile.json")) as file:
+                written = json.load(file)
+        finally:
+            os.chdir(cwd)
+
+    ok = written["blocks"] == sim.getProfile()["blocks"] and "Profile of profile_run" in printed.getvalue()
+    ok = ok and "counter" in printed.getvalue()
+
+    if ok:
+        print("PASS: test_run_writes_report")
+    else:
+        print("FAIL: test_run_writes_report", printed.getvalue())
+        raise AssertionError("run did not print and write the profile")
+
+
+if __name__ == "__main__":
+    test_counters_add_up()
+    test_profile_changes_nothing()
+    test_cycle_engine()
+    test_run_writes_report()
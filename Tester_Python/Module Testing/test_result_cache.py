@@ -0,0 +1,193 @@
+"""
+Tester for pydig.cacheResults(directory, maxSize), the result cache.
+It verifies that the same run is loaded from the cache with the same waveforms,
+that changing a function, a stimulus or until misses the cache (also the arguments of
+a functools.partial or the state of a callable object), that a run using a value that
+cannot be hashed is not cached, that the least recently used runs are evicted when the
+cache is full and that the hits and misses are counted, also by processes sharing the cache.
+"""
+
+import sys
+import os
+import tempfile
+import functools
+import threading
+import multiprocessing
+
+# Add parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from resultCache import ResultCache
+from helpers import build_counter, blocks, dumps
+
+
+# ---------- small helpers ----------
+
+def build(directory, step=1, inputList=None, maxSize=2**20, nsl=None):
+    sim = build_counter("result_cache", nsl=nsl or (lambda ps, i: (ps + i * step) % 4), kernel="native")
+    sim.cacheResults(directory, maxSize)
+    if inputList is not None:
+        blocks(sim)["src"].setInputList(inputList)
+    return sim
+
+
+def stepped(step, ps, i):
+    return (ps + i * step) % 4
+
+
+class Stepper:
+    def __init__(self, step):
+        self.step = step
+
+    def __call__(self, ps, i):
+        return stepped(self.step, ps, i)
+
+    def nsl(self, ps, i):
+        return stepped(self.step, ps, i)
+
+
+def countMisses(directory, count):
+    cache = ResultCache(directory, 2**20)
+    for _ in range(count):
+        cache.get("missing")
+
+
+# ---------- tests ----------
+
+def test_hit_gives_same_waveforms():
+    print("Running test_hit_gives_same_waveforms...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        first = build(directory)
+        first.simulate(until=10)
+        second = build(directory)
+        second.simulate(until=10)
+        stats = second.getCacheStats()
+
+        ok = first.getCacheStats()["hit"] is False and stats["hit"] is True
+        ok = ok and dumps(first) == dumps(second) and dumps(first)[-1]
+        ok = ok and stats["hits"] == 1 and stats["misses"] == 1 and stats["entries"] == 1
+
+    if ok:
+        print("PASS: test_hit_gives_same_waveforms")
+    else:
+        print("FAIL: test_hit_gives_same_waveforms", stats)
+        raise AssertionError("the cached run differs from the simulated one")
+
+
+def test_changes_miss():
+    print("Running test_changes_miss...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        build(directory).simulate(until=10)
+
+        changed = [build(directory, step=3), build(directory, inputList=[(0.0, 0), (2.5, 1)]), build(directory)]
+        changed[0].simulate(until=10)
+        changed[1].simulate(until=10)
+        changed[2].simulate(until=12)
+
+        stats = changed[-1].getCacheStats()
+        ok = all(x.getCacheStats()["hit"] is False for x in changed) and stats["misses"] == 4 and stats["entries"] == 4
+
+    if ok:
+        print("PASS: test_changes_miss")
+    else:
+        print("FAIL: test_changes_miss", stats)
+        raise AssertionError("a changed run was loaded from the cache")
+
+
+def test_callables_are_keyed():
+    print("Running test_callables_are_keyed...")
+
+    ok = True
+    with tempfile.TemporaryDirectory() as directory:
+        for make in (lambda k: functools.partial(stepped, k), Stepper, lambda k: Stepper(k).nsl):
+            first = build(directory, nsl=make(1))
+            first.simulate(until=8)
+            second = build(directory, nsl=make(2))
+            second.simulate(until=8)
+            again = build(directory, nsl=make(1))
+            again.simulate(until=8)
+            ok = ok and second.getCacheStats()["hit"] is False and dumps(first) != dumps(second)
+            ok = ok and again.getCacheStats()["hit"] is True and dumps(first) == dumps(again)
+
+        # a lock cannot be hashed, so the run is simulated and not stored
+        lock = threading.Lock()
+        unhashable = build(directory, nsl=lambda ps, i, lock=lock: (ps + i) % 4)
+        unhashable.simulate(until=8)
+        stats = unhashable.getCacheStats()
+        ok = ok and stats["cacheable"] is False and stats["hit"] is False and stats["entries"] == 6
+
+    if ok:
+        print("PASS: test_callables_are_keyed")
+    else:
+        print("FAIL: test_callables_are_keyed", stats)
+        raise AssertionError("the arguments or the state of a callable were not part of the key")
+
+
+def test_lru_eviction():
+    print("Running test_lru_eviction...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        build(directory).simulate(until=10)
+        size = build(directory).getCacheStats()["size"]
+
+        # room for two runs: the first one is used again, so the second one is evicted by the third
+        sims = [build(directory, maxSize=2 * size + size // 2) for _ in range(5)]
+        sims[0].simulate(until=11)
+        sims[1].simulate(until=10)
+        sims[2].simulate(until=12)
+        sims[3].simulate(until=10)
+        sims[4].simulate(until=11)
+        stats = sims[4].getCacheStats()
+
+        ok = sims[3].getCacheStats()["hit"] is True and sims[4].getCacheStats()["hit"] is False
+        ok = ok and stats["entries"] == 2 and stats["evictions"] == 2 and stats["size"] <= 2 * size + size // 2
+
+    if ok:
+        print("PASS: test_lru_eviction")
+    else:
+        print("FAIL: test_lru_eviction", stats)
+        raise AssertionError("the least recently used run was not evicted")
+
+
+def test_parallel_counts_add_up():
+    print("Running test_parallel_counts_add_up...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        processes = [multiprocessing.Process(target=countMisses, args=(directory, 100)) for _ in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        stats = ResultCache(directory, 2**20).getStats()
+
+    if stats["misses"] == 400 and all(x.exitcode == 0 for x in processes):
+        print("PASS: test_parallel_counts_add_up")
+    else:
+        print("FAIL: test_parallel_counts_add_up", stats)
+        raise AssertionError("the counts of processes sharing the cache were lost")
+
+
+def test_cached_run_cannot_continue():
+    print("Running test_cached_run_cannot_continue...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        build(directory).simulate(until=10)
+        sim = build(directory)
+        sim.simulate(until=10)
+        try:
+            sim.simulate(until=12)
+            print("FAIL: a run loaded from the cache was continued")
+            raise AssertionError("expected exit when continuing a cached run")
+        except SystemExit:
+            print("PASS: test_cached_run_cannot_continue")
+
+
+if __name__ == "__main__":
+    test_hit_gives_same_waveforms()
+    test_changes_miss()
+    test_callables_are_keyed()
+    test_lru_eviction()
+    test_parallel_counts_add_up()
+    test_cached_run_cannot_continue()
@@ -0,0 +1,107 @@
+"""
+Tester for the sensitivity aware scheduling of moore and mealy machines.
+It verifies that each function only runs when what it depends on changed
+(NSL on PS and input, moore OL on PS, mealy OL on PS and input) and that
+pydig(cancelStale=True) drops superseded evaluations.
+"""
+
+import sys
+import os
+
+# Add parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from pydig import pydig
+from helpers import add_input
+
+
+# ---------- small helpers ----------
+
+def toggles(step, until):
+    """
+    @return list : an input that toggles between 0 and 1 every step time units.
+    """
+    return [(round(i * step, 2), i % 2) for i in range(int(until / step))]
+
+
+def build(machine, cancelStale=False, step=0.25, nsl_delay=0.01, ol_delay=0.01):
+    sim = pydig(f"sensitivity_{machine}_{cancelStale}", cancelStale=cancelStale)
+    calls = {"nsl": 0, "ol": 0}
+
+    def nsl(ps, i):
+        calls["nsl"] += 1
+        return (ps + i) % 4
+
+    def ol(*args):
+        calls["ol"] += 1
+        return args[0]
+
+    clk = sim.clock(timePeriod=1, onTime=0.5, blockID="clk")
+    src = add_input(sim, toggles(step, 10), "src")
+    create = sim.moore if machine == "moore" else sim.mealy
+    block = create(maxOutSize=2, blockID=machine, nsl=nsl, ol=ol, clock=clk, nsl_delay=nsl_delay, ol_delay=ol_delay)
+    src.output() > block.input()
+    out = sim.output(plot=False, blockID="out")
+    block.output() > out.input()
+
+    return sim, block, calls
+
+
+def count(block, label):
+    dump = block.getScopeDump()
+    return sum(len(v) for k, v in dump.items() if k.startswith(label))
+
+
+# ---------- tests ----------
+
+def test_moore_ol_only_on_state_change():
+    print("Running test_moore_ol_only_on_state_change...")
+
+    sim, block, calls = build("moore")
+    sim.run(until=10)
+    states = count(block, "PS of")
+
+    # once at the start and once per committed state
+    if calls["ol"] == states + 1 and calls["nsl"] > calls["ol"]:
+        print("PASS: test_moore_ol_only_on_state_change", calls)
+    else:
+        print("FAIL: test_moore_ol_only_on_state_change", calls, states)
+        raise AssertionError("moore output logic ran for input changes")
+
+
+def test_mealy_ol_on_input_change():
+    print("Running test_mealy_ol_on_input_change...")
+
+    sim, block, calls = build("mealy")
+    sim.run(until=10)
+
+    if calls["ol"] == calls["nsl"]:
+        print("PASS: test_mealy_ol_on_input_change", calls)
+    else:
+        print("FAIL: test_mealy_ol_on_input_change", calls)
+        raise AssertionError("mealy output logic must follow its inputs")
+
+
+def test_cancel_stale():
+    """
+    The input changes faster than the NSL delay, so most NSL results are stale.
+    """
+    print("Running test_cancel_stale...")
+
+    results = {}
+    for cancelStale in (False, True):
+        sim, block, _ = build("moore", cancelStale, step=0.1, nsl_delay=0.3)
+        sim.run(until=10)
+        results[cancelStale] = count(block, "NS of")
+
+    if results[True] < results[False]:
+        print("PASS: test_cancel_stale", results)
+    else:
+        print("FAIL: test_cancel_stale", results)
+        raise AssertionError("stale evaluations were not cancelled")
+
+
+if __name__ == "__main__":
+    test_moore_ol_only_on_state_change()
+    test_mealy_ol_on_input_change()
+    test_cancel_stale()
@@ -0,0 +1,133 @@
+"""
+Tester for the streaming csv dump (ScopeMerger and dumpRows).
+It verifies that the rows merged from the scope dumps are exactly the rows that
+Plotter.fillEmptyTimeSlots builds from the merged getScopeDump() of the blocks,
+including repeated times, times recorded both as int and float and signals
+shared between blocks, and that dumpRows writes the same file as dumpVars.
+"""
+
+import sys
+import os
+
+# Add parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from pydig import pydig
+from scope import Plotter, ScopeDump, ScopeMerger
+from utilities import dumpVars, dumpRows
+
+
+# ---------- small helpers ----------
+
+def filled_rows(groups):
+    """
+    The rows of the old dump: merges getScopeDump() of every block and fills the empty time slots.
+    """
+    data = {}
+    timeValues = set()
+    for dumps in groups:
+        vals = {}
+        for dump in dumps:
+            vals.update(dump.getValues())
+        data.update(vals)
+        timeValues.update(set(y[0] for x in vals for y in vals[x]))
+
+    timeValues.update([0, max(timeValues, default=0) + 1])
+    filled = Plotter.fillEmptyTimeSlots(list(sorted(timeValues)), data)
+    keys = list(filled)
+    return keys, [[filled[keys[0]][i][0]] + [filled[k][i][1] for k in keys] for i in range(len(timeValues))]
+
+
+def same_rows(a, b):
+    """
+    Compares rows value by value and type by type, so that 1 and 1.0 are different.
+    """
+    return len(a) == len(b) and all(
+        len(x) == len(y) and all(type(p) is type(q) and p == q for p, q in zip(x, y)) for x, y in zip(a, b))
+
+
+# ---------- tests ----------
+
+def test_merge_matches_fill():
+    print("Running test_merge_matches_fill...")
+
+    sim = pydig("stream_dump")
+    clk = sim.clock(timePeriod=1, onTime=0.5, blockID="clk")
+    src = sim.source("../../Tests/run_input1.csv", blockID="src")
+    counter = sim.moore(maxOutSize=2, blockID="counter", nsl=lambda ps, i: (ps + i) % 4, ol=lambda ps: ps, clock=clk)
+    parity = sim.combinational(maxOutSize=1, blockID="parity", func=lambda x: x & 1, delay=0.1)
+    out = sim.output(plot=False, blockID="out")
+
+    src.output() > counter.input()
+    counter.output() > parity.input()
+    parity.output() > out.input()
+    sim.run(until=6)
+
+    groups = [x.getScopeDumps() for x in (clk, src, counter, parity, out)]
+    keys, expected = filled_rows(groups)
+    merger = ScopeMerger(groups)
+
+    if merger.getLabels() == keys and same_rows(list(merger.rows()), expected):
+        print("PASS: test_merge_matches_fill")
+    else:
+        print("FAIL: test_merge_matches_fill", merger.getLabels(), keys)
+        raise AssertionError("the merged rows differ from the filled rows")
+
+
+def test_merge_edge_cases():
+    print("Running test_merge_edge_cases...")
+
+    shared = ScopeDump()
+    shared.add("shared", 0.5, 1)
+    shared.add("shared", 2, 0)
+
+    first = ScopeDump()
+    first.add("a", 1, 1)
+    first.add("a", 1, 2)    # same time, the last value is kept
+    first.add("a", 3.0, 3)
+
+    second = ScopeDump()
+    second.add("b", 1.0, 5)  # the time 1 was first recorded as an int
+    second.add("b", 3, 6)    # and 3 as a float
+    second.add("a", 4, 7)    # replaces the values of "a"
+
+    groups = [[shared, first], [second], [shared]]
+    keys, expected = filled_rows(groups)
+    rows = list(ScopeMerger(groups).rows())
+
+    if ScopeMerger(groups).getLabels() == keys and same_rows(rows, expected):
+        print("PASS: test_merge_edge_cases")
+    else:
+        print("FAIL: test_merge_edge_cases", rows, expected)
+        raise AssertionError("the merged rows differ from the filled rows")
+
+
+def test_dump_rows_same_file():
+    print("Running test_dump_rows_same_file...")
+
+    dump = ScopeDump()
+    dump.add("x", 0.25, 1)
+    dump.add("x", 2, 3)
+    dump.add("y", 1, 1)
+
+    keys, expected = filled_rows([[dump]])
+    dumpVars(Plotter.fillEmptyTimeSlots([row[0] for row in expected], dump.getValues()), "stream_old")
+    merger = ScopeMerger([[dump]])
+    dumpRows(merger.getLabels(), merger.rows(), "stream_new")
+
+    with open("output\\stream_old.csv") as old, open("output\\stream_new.csv") as new:
+        same = old.read() == new.read()
+    os.remove("output\\stream_old.csv")
+    os.remove("output\\stream_new.csv")
+
+    if same:
+        print("PASS: test_dump_rows_same_file")
+    else:
+        print("FAIL: test_dump_rows_same_file")
+        raise AssertionError("dumpRows wrote a different file")
+
+
+if __name__ == "__main__":
+    test_merge_matches_fill()
+    test_merge_edge_cases()
+    test_dump_rows_same_file()
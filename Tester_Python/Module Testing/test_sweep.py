@@ -0,0 +1,83 @@
+"""
+Tester for pydig.sweep(buildFn, params, until, workers) and pydig.getWaveforms().
+It verifies that the points simulated in a pool of processes give the same waveforms
+as simulating them one by one, that every point is given back once, that only the
+requested signals are sent back, and that a build function that cannot be sent to
+the workers is rejected.
+"""
+
+import sys
+import os
+
+# Add parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from pydig import pydig
+from helpers import INPUT1, build_counter
+
+
+POINTS = [{"timePeriod": period, "onTime": period / 2, "delay": delay} for period in (0.4, 1, 1.5) for delay in (0, 0.05)]
+
+
+# ---------- small helpers ----------
+
+def build(timePeriod, onTime, delay):
+    return build_counter(f"sweep {timePeriod} {delay}", inputFile=INPUT1, func=lambda x: x & 1,
+                         delay=delay, timePeriod=timePeriod, onTime=onTime)
+
+
+def plain(waveforms):
+    return {label: [list(x) for x in columns] for label, columns in waveforms.items()}
+
+
+# ---------- tests ----------
+
+def test_sweep_matches_single_runs():
+    print("Running test_sweep_matches_single_runs...")
+
+    results = dict(pydig.sweep(build, POINTS, until=6, workers=2))
+
+    ok = sorted(results) == list(range(len(POINTS)))
+    for i, point in enumerate(POINTS):
+        single = build(**point)
+        single.simulate(until=6)
+        ok = ok and plain(results[i]) == plain(single.getWaveforms())
+
+    if ok:
+        print("PASS: test_sweep_matches_single_runs")
+    else:
+        print("FAIL: test_sweep_matches_single_runs", sorted(results))
+        raise AssertionError("the sweep does not give the waveforms of the single runs")
+
+
+def test_sweep_selected_signals():
+    print("Running test_sweep_selected_signals...")
+
+    signals = ["PS of counter", "Final Output from out"]
+    results = list(pydig.sweep(build, POINTS[:2], until=6, workers=1, engine="cycle", signals=signals))
+
+    ok = [i for i, _ in results] == [0, 1]
+    ok = ok and all(list(waveforms) == signals for _, waveforms in results)
+
+    if ok:
+        print("PASS: test_sweep_selected_signals")
+    else:
+        print("FAIL: test_sweep_selected_signals", results)
+        raise AssertionError("the sweep did not send back only the requested signals")
+
+
+def test_sweep_not_picklable():
+    print("Running test_sweep_not_picklable...")
+
+    try:
+        pydig.sweep(lambda **point: build(**point), POINTS, until=6, workers=2)
+        print("FAIL: a build function that cannot be pickled was accepted")
+        raise AssertionError("expected exit for a lambda build function")
+    except SystemExit:
+        print("PASS: test_sweep_not_picklable")
+
+
+if __name__ == "__main__":
+    test_sweep_matches_single_runs()
+    test_sweep_selected_signals()
+    test_sweep_not_picklable()
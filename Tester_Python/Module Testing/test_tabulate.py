@@ -0,0 +1,78 @@
+"""
+Tester for tabulate=True (lookup table compiled nsl, ol and func).
+It verifies that tabulated blocks give the same simulation as plain ones, that
+small domains use full tables and wide or unknown ones a memo, and that the
+hit and miss statistics are reported.
+"""
+
+import sys
+import os
+
+# Add parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from pydig import pydig
+from lookupTable import LookupTable
+from helpers import build_pwm, dumps
+
+
+# ---------- tests ----------
+
+def test_tabulate_same_simulation():
+    print("Running test_tabulate_same_simulation...")
+
+    plain = build_pwm("tabulate_plain", False, stateSize=2)
+    plain.run(until=20)
+    table = build_pwm("tabulate_table", True, stateSize=2)
+    table.run(until=20)
+
+    stats = table.getTableStats()
+    ok_stats = stats["Mod 4 Counter"]["nsl"]["table"] and stats["Output Comparator"]["func"]["hits"] > 0
+
+    if dumps(plain) == dumps(table) and ok_stats and plain.getTableStats() == {}:
+        print("PASS: test_tabulate_same_simulation")
+    else:
+        print("FAIL: test_tabulate_same_simulation", stats)
+        raise AssertionError("tabulated simulation differs")
+
+
+def test_tabulate_without_state_size():
+    print("Running test_tabulate_without_state_size...")
+
+    sim = build_pwm("tabulate_memo", True)
+    sim.run(until=20)
+    stats = sim.getTableStats()["Mod 4 Counter"]
+
+    if not stats["nsl"]["table"] and stats["nsl"]["hits"] > 0 and stats["nsl"]["misses"] <= 8:
+        print("PASS: test_tabulate_without_state_size", stats)
+    else:
+        print("FAIL: test_tabulate_without_state_size", stats)
+        raise AssertionError("memo was not used")
+
+
+def test_lookup_table():
+    print("Running test_lookup_table...")
+
+    square = LookupTable(lambda x: x * x, [3])
+    pair = LookupTable(lambda a, b: a * 10 + b, [2, 2])
+    wide = LookupTable(lambda x: x + 1, [40], memoSize=2)
+    flags = LookupTable(lambda x: x > 3, [3])
+
+    ok = square.isTable() and [square(x) for x in range(8)] == [x * x for x in range(8)]
+    ok = ok and square(9) == 81 and square.getStats() == {"table": True, "hits": 8, "misses": 1}
+    ok = ok and pair(3, 2) == 32 and pair(1, 0) == 10
+    ok = ok and not wide.isTable() and [wide(1), wide(1), wide(2), wide(3), wide(1)] == [2, 2, 3, 4, 2]
+    ok = ok and wide.getStats() == {"table": False, "hits": 1, "misses": 4}
+    ok = ok and flags(5) is True and flags(1) is False
+
+    if ok:
+        print("PASS: test_lookup_table")
+    else:
+        print("FAIL: test_lookup_table", square.getStats(), wide.getStats())
+        raise AssertionError("lookup table gave wrong values")
+
+
+if __name__ == "__main__":
+    test_tabulate_same_simulation()
+    test_tabulate_without_state_size()
+    test_lookup_table()
@@ -0,0 +1,89 @@
+"""
+Tester for the integer timebase, pydig(timescale=...).
+It verifies that the simulation runs on whole ticks, that the times given back are
+exact time units without rounding errors, that times which should be equal are
+merged into a single row, and that delays that are not whole ticks are rejected.
+"""
+
+import sys
+import os
+
+# Add parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from pydig import pydig
+from helpers import INPUT1, blocks, build_counter
+from scope import ScopeMerger
+
+
+# ---------- small helpers ----------
+
+def build(name, **kwargs):
+    sim = build_counter(name, inputFile=INPUT1, func=lambda x: x & 1, delay=0.03, timePeriod=0.2, onTime=0.1, **kwargs)
+    circuit = blocks(sim)
+    return (sim,) + tuple(circuit[x] for x in ("clk", "src", "counter", "parity", "out"))
+
+
+# ---------- tests ----------
+
+def test_times_are_exact():
+    print("Running test_times_are_exact...")
+
+    sim, clk, src, counter, parity, out = build("timebase_exact", timescale="10ps", timeUnit="1ns")
+    sim.run(until=6)
+
+    clockTimes = [t for t, v in clk.getScopeDump()["Clock clk"]]
+    parityTimes = [t for t, v in parity.getScopeDump()["parity output"]]
+
+    ok = sim.getTicksPerUnit() == 100 and type(sim.getEnv().now) is int
+    ok = ok and clockTimes == [k / 10 if k % 10 else k // 10 for k in range(60)]
+    ok = ok and all(round(t * 100) / 100 == t for t in parityTimes)
+
+    if ok:
+        print("PASS: test_times_are_exact")
+    else:
+        print("FAIL: test_times_are_exact", clockTimes[-3:], parityTimes[-3:])
+        raise AssertionError("the times of the integer timebase are not exact")
+
+
+def test_same_values_as_float_time():
+    print("Running test_same_values_as_float_time...")
+
+    floatSim, *floatBlocks = build("timebase_float")
+    floatSim.run(until=6)
+    tickSim, *tickBlocks = build("timebase_ticks", timescale="10ps")
+    tickSim.run(until=6)
+
+    ok = True
+    for a, b in zip(floatBlocks, tickBlocks):
+        for label, samples in a.getScopeDump().items():
+            rounded = [(round(t, 6), v) for t, v in samples if round(t, 6) < 6]
+            ok = ok and rounded == [(round(t, 6), v) for t, v in b.getScopeDump()[label]]
+
+    # the float clock drifts, so some of its times no longer line up with the other blocks
+    floatRows = len(list(ScopeMerger([x.getScopeDumps() for x in floatBlocks]).getTimes()))
+    tickRows = len(list(ScopeMerger([x.getScopeDumps() for x in tickBlocks], 100).getTimes()))
+
+    if ok and tickRows <= floatRows:
+        print("PASS: test_same_values_as_float_time")
+    else:
+        print("FAIL: test_same_values_as_float_time", floatRows, tickRows)
+        raise AssertionError("the integer timebase changed the simulation")
+
+
+def test_delay_not_whole_ticks():
+    print("Running test_delay_not_whole_ticks...")
+
+    sim = pydig("timebase_invalid", timescale="1ns", timeUnit="1ns")
+    try:
+        sim.combinational(maxOutSize=1, blockID="c", delay=0.5)
+        print("FAIL: a delay that is not a whole number of ticks was accepted")
+        raise AssertionError("expected exit for a delay of half a tick")
+    except SystemExit:
+        print("PASS: test_delay_not_whole_ticks")
+
+
+if __name__ == "__main__":
+    test_times_are_exact()
+    test_same_values_as_float_time()
+    test_delay_not_whole_ticks()
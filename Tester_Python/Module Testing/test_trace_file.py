@@ -0,0 +1,102 @@
+"""
+Tester for pydig.dumpTrace(path) and traceFile.TraceReader.
+It verifies that the trace gives back exactly the recorded samples (int and float
+times, including times with rounding errors), that valueAt and changes only
+decode what they need across chunk boundaries, and that other files are rejected.
+"""
+
+import sys
+import os
+
+# Add parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from helpers import INPUT1, blocks, build_counter
+from scope import ScopeDump
+from traceFile import TraceWriter, TraceReader
+
+
+# ---------- small helpers ----------
+
+def build(name):
+    sim = build_counter(name, inputFile=INPUT1, func=lambda x: x & 1, delay=0.1)
+    return sim, blocks(sim)["counter"]
+
+
+def typed(samples):
+    return [(type(t), t, v) for t, v in samples]
+
+
+# ---------- tests ----------
+
+def test_trace_matches_samples():
+    print("Running test_trace_matches_samples...")
+
+    sim, counter = build("trace_samples")
+    sim.dumpTrace("trace_samples.bin", chunkSize=3)
+    sim.run(until=6)
+
+    reader = TraceReader("trace_samples.bin")
+    ok = True
+    for label, samples in counter.getScopeDump().items():
+        ok = ok and typed(reader.changes(label, 0, 6)) == typed(samples)
+        ok = ok and reader.getSampleCount(label) == len(samples)
+        for time, value in samples:
+            ok = ok and reader.valueAt(label, time) == [v for t, v in samples if t <= time][-1]
+    reader.close()
+    os.remove("trace_samples.bin")
+
+    if ok:
+        print("PASS: test_trace_matches_samples")
+    else:
+        print("FAIL: test_trace_matches_samples")
+        raise AssertionError("the trace does not give back the recorded samples")
+
+
+def test_trace_times_and_ranges():
+    print("Running test_trace_times_and_ranges...")
+
+    dump = ScopeDump()
+    samples = [(0, 1), (0.1 + 0.2, 2), (0.30000000000000004, 3), (1, -5), (1.5, 2 ** 70), (2.0, 0),
+               (1e-9 / 3, 0), (3, 7)]
+    samples.sort(key=lambda x: x[0])
+    for time, value in samples:
+        dump.add("x", time, value)
+
+    writer = TraceWriter("trace_times.bin", chunkSize=2)
+    writer.addSignal("x", *dump.getColumns("x"))
+    writer.close()
+
+    reader = TraceReader("trace_times.bin")
+    ok = typed(reader.changes("x", -1, 10)) == typed(samples)
+    ok = ok and reader.changes("x", 0.3, 1.5) == [x for x in samples if 0.3 <= x[0] <= 1.5]
+    ok = ok and reader.valueAt("x", -1) == 0 and reader.valueAt("x", 1.7) == 2 ** 70 and reader.valueAt("x", 9) == 7
+    reader.close()
+    os.remove("trace_times.bin")
+
+    if ok:
+        print("PASS: test_trace_times_and_ranges")
+    else:
+        print("FAIL: test_trace_times_and_ranges")
+        raise AssertionError("the trace changed times or values")
+
+
+def test_trace_invalid_file():
+    print("Running test_trace_invalid_file...")
+
+    with open("trace_invalid.bin", "wb") as file:
+        file.write(b"Time,value\n0,1\n")
+    try:
+        TraceReader("trace_invalid.bin")
+        print("FAIL: a file that is not a trace was accepted")
+        raise AssertionError("expected exit for an invalid trace")
+    except SystemExit:
+        print("PASS: test_trace_invalid_file")
+    finally:
+        os.remove("trace_invalid.bin")
+
+
+if __name__ == "__main__":
+    test_trace_matches_samples()
+    test_trace_times_and_ranges()
+    test_trace_invalid_file()
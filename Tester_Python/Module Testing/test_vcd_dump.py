@@ -0,0 +1,126 @@
+"""
+Tester for pydig.dumpVCD(path, timescale, timeUnit).
+It verifies that the VCD file declares every signal with its width, that the
+value changes written match the samples recorded by the blocks, that the samples
+are not kept by default, and that invalid timescales are rejected.
+"""
+
+import sys
+import os
+
+# Add parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from helpers import INPUT1, blocks, build_counter
+
+
+# ---------- small helpers ----------
+
+def build(name):
+    sim = build_counter(name, inputFile=INPUT1, func=lambda x: x & 1, delay=0.1, stateSize=2)
+    return sim, blocks(sim)["counter"]
+
+
+def parse(path):
+    """
+    @return tuple : the widths and the value changes [(tick, value)] of every (scope, name).
+    """
+    widths = {}
+    changes = {}
+    names = {}
+    scope = []
+    tick = 0
+    with open(path) as file:
+        for line in file:
+            words = line.split()
+            if not words:
+                continue
+            if words[0] == "$scope":
+                scope.append(words[2])
+            elif words[0] == "$upscope":
+                scope.pop()
+            elif words[0] == "$var":
+                names[words[3]] = (scope[-1], words[4])
+                widths[names[words[3]]] = int(words[2])
+                changes[names[words[3]]] = []
+            elif line[0] == "#":
+                tick = int(line[1:])
+            elif line[0] == "b":
+                changes[names[words[1]]].append((tick, int(words[0][1:], 2)))
+            elif line[0] in "01":
+                changes[names[line[1:].strip()]].append((tick, int(line[0])))
+    return widths, changes
+
+
+def expected_changes(samples, ticks):
+    """
+    @return list : the changes of a signal, keeping the last sample of every tick.
+    """
+    last = {0: 0}
+    for time, value in samples:
+        last[round(time * ticks)] = value
+
+    changes = []
+    for tick in sorted(last):
+        if not changes or changes[-1][1] != last[tick]:
+            changes.append((tick, last[tick]))
+    return changes
+
+
+# ---------- tests ----------
+
+def test_vcd_matches_samples():
+    print("Running test_vcd_matches_samples...")
+
+    sim, counter = build("vcd_samples")
+    sim.dumpVCD("vcd_samples.vcd", timescale="10ps", timeUnit="1ns", keepSamples=True)
+    sim.run(until=6)
+
+    widths, changes = parse("vcd_samples.vcd")
+    os.remove("vcd_samples.vcd")
+
+    ok = widths[("counter", "ps")] == 2 and widths[("counter", "output")] == 2
+    ok = ok and widths[("clk", "output")] == 1 and widths[("out", "output")] == 1
+    for kind, label in counter.getSignals().items():
+        ok = ok and changes[("counter", kind)] == expected_changes(counter.getScopeDump()[label], 100)
+
+    if ok:
+        print("PASS: test_vcd_matches_samples")
+    else:
+        print("FAIL: test_vcd_matches_samples", widths, changes[("counter", "ps")])
+        raise AssertionError("the VCD file does not match the recorded samples")
+
+
+def test_vcd_does_not_keep_samples():
+    print("Running test_vcd_does_not_keep_samples...")
+
+    sim, counter = build("vcd_stream")
+    sim.dumpVCD("vcd_stream.vcd")
+    sim.run(until=6)
+
+    _, changes = parse("vcd_stream.vcd")
+    os.remove("vcd_stream.vcd")
+
+    if counter.getScopeDump() == {} and len(changes[("counter", "ps")]) > 1:
+        print("PASS: test_vcd_does_not_keep_samples")
+    else:
+        print("FAIL: test_vcd_does_not_keep_samples", counter.getScopeDump().keys())
+        raise AssertionError("the samples were kept in memory")
+
+
+def test_vcd_invalid_timescale():
+    print("Running test_vcd_invalid_timescale...")
+
+    sim, counter = build("vcd_invalid")
+    try:
+        sim.dumpVCD("vcd_invalid.vcd", timescale="3ns")
+        print("FAIL: an invalid timescale was accepted")
+        raise AssertionError("expected exit for an invalid timescale")
+    except SystemExit:
+        print("PASS: test_vcd_invalid_timescale")
+
+
+if __name__ == "__main__":
+    test_vcd_matches_samples()
+    test_vcd_does_not_keep_samples()
+    test_vcd_invalid_timescale()
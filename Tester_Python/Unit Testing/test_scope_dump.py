@@ -0,0 +1,85 @@
+"""
+ScopeDump Tester
+
+The ScopeDump stores the samples of every signal in columns.
+This verifies that:
+1. getValues() gives back exactly the (time, value) tuples that were added
+2. int and float times are kept apart
+3. values that do not fit in 64 bits (or bools) are kept as they were given
+4. add() still checks its arguments while record() does not
+"""
+
+import sys
+import os
+
+# Add parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from scope import ScopeDump
+
+
+def test_scope_dump_round_trip():
+    dump = ScopeDump()
+    samples = [(0, 1), (0.5, 0), (1, 3), (1.25, 2)]
+    for time, value in samples:
+        dump.add("a", time, value)
+    dump.record("b", 2, 7)
+
+    values = dump.getValues()
+    kinds = [type(t) for t, _ in values["a"]]
+
+    if values == {"a": samples, "b": [(2, 7)]} and kinds == [int, float, int, float] and dump.getSampleCount() == 5:
+        print("PASS: ScopeDump round trip")
+    else:
+        print("FAIL: ScopeDump round trip", values)
+        raise AssertionError("ScopeDump changed the samples")
+
+
+def test_scope_dump_wide_values():
+    dump = ScopeDump()
+    big = 1 << 80
+    dump.record("wide", 0, 1)
+    dump.record("wide", 1, big)
+    dump.record("wide", 2, -big)
+    dump.record("flag", 0, True)
+
+    values = dump.getValues()
+
+    if values["wide"] == [(0, 1), (1, big), (2, -big)] and values["flag"][0][1] is True:
+        print("PASS: ScopeDump wide values")
+    else:
+        print("FAIL: ScopeDump wide values", values)
+        raise AssertionError("ScopeDump lost wide values")
+
+
+def test_scope_dump_columns():
+    dump = ScopeDump()
+    for i in range(100):
+        dump.record("x", i * 0.5, i)
+
+    times, intTimes, values = dump.getColumns("x")
+
+    if dump.getLabels() == ["x"] and list(times) == [i * 0.5 for i in range(100)] and list(values) == list(range(100)) and not any(intTimes):
+        print("PASS: ScopeDump columns")
+    else:
+        print("FAIL: ScopeDump columns")
+        raise AssertionError("ScopeDump columns are wrong")
+
+
+def test_scope_dump_invalid():
+    """
+    add() must reject a value that is not an int.
+    """
+    try:
+        ScopeDump().add("x", 0, "high")
+        print("FAIL: invalid value was accepted")
+        raise AssertionError("invalid value was accepted")
+    except SystemExit:
+        print("PASS: ScopeDump invalid value caught")
+
+
+if __name__ == "__main__":
+    test_scope_dump_round_trip()
+    test_scope_dump_wide_values()
+    test_scope_dump_columns()
+    test_scope_dump_invalid()
@@ -0,0 +1,410 @@
+"""
+This file contains the batch simulation engine.
+It is used by pydig.runBatch(until, stimuli) to simulate one circuit against many
+stimulus schedules (lanes) in a single pass.
+
+The blocks are compiled as in the cycle engine (the combinational logic is levelized,
+the machines are grouped by clock and the delays are not modelled), but the output of
+every block and the state of every machine is a NumPy array with one element per lane.
+The clocks are shared by all the lanes while every lane has its own input changes.
+Every time a clock toggles or an input of some lane changes, the registers that see
+their active edge are committed and all the logic is evaluated element wise, for all
+the lanes at once.
+
+The functions of the blocks (func, nsl and ol) are called with arrays, so they must be
+NumPy compatible: arithmetic, comparisons and bitwise operators work, while if, int()
+or max() on an argument do not. The first calls of every function are checked against
+the function called on each lane on its own. Blocks created with tabulate=True index
+their lookup table with the arrays instead, so any pure function works for them. When
+the table could not be built (no stateSize, more than 16 bits of arguments or a function
+that fails on part of its domain), the function is called lane by lane through the memo
+of the lookup table, once for every distinct argument of the lanes.
+
+@author Abhirath, Aryan, Gathik
+@date 17/10/2026
+@version 1.0
+"""
+
+import heapq
+from array import array
+import numpy as np
+from utilities import printErrorAndExit
+from lookupTable import LookupTable
+from cycleEngine import levelize
+from usableBlocks import MooreMachine, MealyMachine, Combinational, Clock, Input, Output
+
+# the number of calls of every function that are checked lane by lane
+CHECKED_CALLS = 8
+# the lanes are int64 arrays, so wider inputs cannot be packed
+MAX_WIDTH = 63
+
+
+class LaneFunction:
+    """
+    Evaluates the function of a block on arrays with one element per lane.
+    """
+
+    def __init__(self, func, name: str, lanes: int):
+        """
+        @param func : the function of the block (or its lookup table).
+        @param name : the name of the function, for the error messages.
+        @param lanes : the number of lanes.
+        """
+
+        self.__name = name
+        self.__lanes = lanes
+        self.__table = None
+        self.__memo = None
+        self.__checks = CHECKED_CALLS
+
+        if isinstance(func, LookupTable):
+            if isinstance(func.getTable(), array):
+                self.__table = np.asarray(func.getTable(), dtype=np.int64)
+                self.__widths = func.getWidths()
+            else:
+                # a memo (or a table of other values than int): the function only takes plain ints
+                self.__memo = func
+            func = func.getFunc()
+        self.__func = func
+
+    def __call__(self, *args):
+        """
+        @param args : one int64 array per argument of the function.
+        @return array : the result of the function for every lane.
+        """
+
+        if self.__memo is not None:
+            return self.__byLane(args)
+        if self.__table is None:
+            return self.__evaluate(args)
+
+        if len(args) == 1:
+            index = args[0]
+            inside = (index >= 0) & (index < len(self.__table))
+        else:
+            width = self.__widths[1]
+            index = (args[0] << width) | args[1]
+            inside = (args[0] >= 0) & (args[0] < (1 << self.__widths[0])) & (args[1] >= 0) & (args[1] < (1 << width))
+
+        if inside.all():
+            return self.__table[index]
+
+        # outside the declared widths the function is called lane by lane, as the lookup table does
+        result = self.__table[np.where(inside, index, 0)]
+        for lane in np.flatnonzero(~inside).tolist():
+            result[lane] = self.__func(*[int(x[lane]) for x in args])
+        return result
+
+    def __byLane(self, args):
+        """
+        @return array : the lookup table called with the ints of every distinct argument of the lanes.
+        """
+
+        unique, inverse = np.unique(np.stack(args, axis=1), axis=0, return_inverse=True)
+        try:
+            values = np.array([self.__memo(*x) for x in unique.tolist()], dtype=np.int64)
+        except (TypeError, ValueError, OverflowError) as error:
+            printErrorAndExit(f"The {self.__name} must give back an integer of 64 bits at most ({error}).")
+        return values[inverse.reshape(-1)]
+
+    def __evaluate(self, args):
+        """
+        @return array : the function called with the arrays.
+        """
+
+        try:
+            result = np.asarray(self.__func(*args))
+        except (TypeError, ValueError) as error:
+            printErrorAndExit(f"The {self.__name} cannot be evaluated on NumPy arrays ({error}), "
+                              f"make it NumPy compatible or create the block with tabulate=True.")
+
+        if result.shape == ():
+            result = np.full(self.__lanes, result)
+        if result.shape != (self.__lanes,) or result.dtype.kind not in "biu":
+            printErrorAndExit(f"The {self.__name} must give back one integer per lane on NumPy arrays, "
+                              f"make it NumPy compatible or create the block with tabulate=True.")
+        result = result.astype(np.int64)
+
+        if self.__checks > 0:
+            self.__checks -= 1
+            expected = [self.__func(*[int(x[lane]) for x in args]) for lane in range(self.__lanes)]
+            if result.tolist() != expected:
+                printErrorAndExit(f"The {self.__name} does not give the same results on NumPy arrays as on each lane, "
+                                  f"make it NumPy compatible or create the block with tabulate=True.")
+        return result
+
+
+class BatchEngine:
+    """
+    Simulates the blocks of a pydig object for many stimulus schedules at once.
+    """
+
+    def __init__(self, components: list, stimuli: dict, lanes: int):
+        """
+        Compiles the block graph.
+        @param components : the blocks of the pydig object (they must all be connected).
+        @param stimuli : the input changes [(time, value)] of every lane, by id of the Input block.
+                         The inputs that are not in it apply their own input changes in every lane.
+        @param lanes : the number of lanes.
+        """
+
+        self.__lanes = lanes
+        self.__clocks = []
+        self.__inputs = []
+        self.__machines = []
+        self.__outputs = []
+        logic = []
+
+        for block in components:
+            if isinstance(block, Clock):
+                self.__clocks.append(block)
+            elif isinstance(block, Input):
+                self.__inputs.append(block)
+            elif isinstance(block, MooreMachine):
+                self.__machines.append(block)
+            elif isinstance(block, MealyMachine):
+                self.__machines.append(block)
+                logic.append(block)
+            elif isinstance(block, Combinational):
+                logic.append(block)
+            elif isinstance(block, Output):
+                self.__outputs.append(block)
+            else:
+                printErrorAndExit(f"{block} cannot be simulated by the batch engine.")
+
+        for machine in self.__machines:
+            if not isinstance(machine.getClock(), Clock):
+                printErrorAndExit(f"{machine} must be clocked by a Clock block to use the batch engine.")
+
+        self.__logic = levelize(logic, "batch engine")
+        self.__compile()
+        self.__compileStimuli(stimuli)
+
+        self.__time = 0
+        self.__started = False
+        self.__events = []
+        self.__sequence = 0
+
+    def __compile(self):
+        """
+        Gives every output an index in the values, and compiles the inputs and the functions of the blocks.
+        """
+
+        drivers = self.__clocks + self.__inputs + self.__machines + [x for x in self.__logic if isinstance(x, Combinational)]
+        self.__index = {id(x): i for i, x in enumerate(drivers)}
+        self.__values = [np.full(self.__lanes, x._output[0], dtype=np.int64) for x in drivers]
+
+        self.__slots = {}
+        for reader in self.__logic + self.__machines + self.__outputs:
+            if reader.getInputWidth() > MAX_WIDTH:
+                printErrorAndExit(f"The inputs of {reader} are wider than {MAX_WIDTH} bits, the batch engine cannot pack them.")
+            self.__slots[id(reader)] = [(self.__index[id(driver)], left, mask, shift)
+                                        for driver, left, mask, shift in reader.getInputSlots()]
+
+        self.__functions = {}
+        for machine in self.__machines:
+            self.__functions[id(machine)] = (LaneFunction(machine.getNSL(), f"next state logic of {machine}", self.__lanes),
+                                             LaneFunction(machine.getOL(), f"output logic of {machine}", self.__lanes))
+        for block in self.__logic:
+            if isinstance(block, Combinational):
+                self.__functions[id(block)] = LaneFunction(block.getFunc(), f"function of {block}", self.__lanes)
+
+        self.__machineIndex = {id(x): i for i, x in enumerate(self.__machines)}
+        self.__edges = {id(x): [] for x in self.__clocks}
+        for i, machine in enumerate(self.__machines):
+            self.__edges[id(machine.getClock())].append(i)
+
+    def __compileStimuli(self, stimuli):
+        """
+        Groups the input changes of all the lanes by time.
+        """
+
+        self.__changes = []
+        for source in self.__inputs:
+            schedules = stimuli.get(id(source), [source.getInputList()] * self.__lanes)
+            limit = (1 << source.getMaxOutSize()) - 1
+
+            byTime = {}
+            for lane, inputList in enumerate(schedules):
+                for time, value in inputList:
+                    if not 0 <= value <= limit:
+                        printErrorAndExit(f"The value {value} in lane {lane} does not fit in the "
+                                          f"{source.getMaxOutSize()} bits of {source}.")
+                    byTime.setdefault(time, {})[lane] = value
+
+            self.__changes.append([(time, np.array(list(byTime[time]), dtype=np.intp),
+                                    np.array(list(byTime[time].values()), dtype=np.int64)) for time in sorted(byTime)])
+
+    def __push(self, time, kind, index):
+        """
+        Adds a clock toggle or the input changes of some lanes to the event queue.
+        """
+
+        heapq.heappush(self.__events, (time, self.__sequence, kind, index))
+        self.__sequence += 1
+
+    def __pack(self, block):
+        """
+        @return array : the input of block in every lane.
+        """
+
+        values = self.__values
+        packed = np.zeros(self.__lanes, dtype=np.int64)
+        for index, left, mask, shift in self.__slots[id(block)]:
+            packed |= ((values[index] >> left) & mask) << shift
+        return packed
+
+    def __start(self):
+        """
+        Evaluates every block at time 0 and schedules the first clock toggles and input changes.
+        """
+
+        self.__started = True
+        self.__ps = [np.full(self.__lanes, x.getPS(), dtype=np.int64) for x in self.__machines]
+        self.__ns = list(self.__ps)
+        self.__machineInputs = [None] * len(self.__machines)
+
+        for i, machine in enumerate(self.__machines):
+            if isinstance(machine, MooreMachine):
+                self.__values[self.__index[id(machine)]] = self.__functions[id(machine)][1](self.__ps[i])
+
+        for i, clock in enumerate(self.__clocks):
+            self.__push(self.__nextToggle(clock, 0, clock._output[0]), 0, i)
+
+        for i, changes in enumerate(self.__changes):
+            for k in range(len(changes)):
+                self.__push(changes[k][0], 1, (i, k))
+
+        # a Mealy machine is both in the machines and in the logic
+        blocks = self.__clocks + self.__inputs + self.__machines + [x for x in self.__logic if isinstance(x, Combinational)] + self.__outputs
+        self.__signals = [(label, [], []) for block in blocks for label in block.getSignals().values()]
+        self.__settle()
+
+    @staticmethod
+    def __nextToggle(clock, now, level):
+        """
+        @return float : the time at which the clock toggles next.
+        """
+
+        if level:
+            return now + clock.getOnTime()
+        return now + (clock.getTimePeriod() - clock.getOnTime())
+
+    def __toggle(self, index):
+        """
+        Toggles a clock.
+        @return list : the machines that see their active edge.
+        """
+
+        clock = self.__clocks[index]
+        k = self.__index[id(clock)]
+        level = 1 - int(self.__values[k][0])
+        self.__values[k] = np.full(self.__lanes, level, dtype=np.int64)
+        self.__push(self.__nextToggle(clock, self.__time, level), 0, index)
+
+        return [i for i in self.__edges[id(clock)] if bool(level) == self.__machines[i].isPosEdge()]
+
+    def __settle(self):
+        """
+        Evaluates the logic, the next state logic and the outputs of every lane, and records the signals.
+        """
+
+        values = self.__values
+        for block in self.__logic:
+            if isinstance(block, MealyMachine):
+                i = self.__machineIndex[id(block)]
+                values[self.__index[id(block)]] = self.__functions[id(block)][1](self.__ps[i], self.__pack(block))
+            else:
+                values[self.__index[id(block)]] = self.__functions[id(block)](self.__pack(block))
+
+        for i, machine in enumerate(self.__machines):
+            self.__machineInputs[i] = self.__pack(machine)
+            self.__ns[i] = self.__functions[id(machine)][0](self.__ps[i], self.__machineInputs[i])
+
+        current = {}
+        for block in self.__clocks + self.__inputs + [x for x in self.__logic if isinstance(x, Combinational)]:
+            current[block.getSignals()["output"]] = values[self.__index[id(block)]]
+        for i, machine in enumerate(self.__machines):
+            signals = machine.getSignals()
+            current[signals["input"]] = self.__machineInputs[i]
+            current[signals["ns"]] = self.__ns[i]
+            current[signals["ps"]] = self.__ps[i]
+            current[signals["output"]] = values[self.__index[id(machine)]]
+        for output in self.__outputs:
+            current[output.getSignals()["output"]] = self.__pack(output)
+
+        for label, times, rows in self.__signals:
+            self.__record(times, rows, current[label])
+
+    def __record(self, times, rows, value):
+        """
+        Adds the values of a signal at the current time if they changed in any lane.
+        A later evaluation at the same time replaces the earlier one.
+        """
+
+        if times and times[-1] == self.__time:
+            times.pop()
+            rows.pop()
+        if rows and np.array_equal(rows[-1], value):
+            return
+        times.append(self.__time)
+        rows.append(value)
+
+    def run(self, until):
+        """
+        Runs the simulation up to (but not including) until.
+        @param until : the time up to which the simulation runs.
+        @return : None
+        """
+
+        if not self.__started:
+            self.__start()
+
+        events = self.__events
+        while events and events[0][0] < until:
+            self.__time = events[0][0]
+            edges = []
+
+            while events and events[0][0] == self.__time:
+                _, _, kind, index = heapq.heappop(events)
+                if kind == 0:
+                    edges.extend(self.__toggle(index))
+                else:
+                    source, k = index
+                    _, lanes, changes = self.__changes[source][k]
+                    position = self.__index[id(self.__inputs[source])]
+                    value = self.__values[position].copy()
+                    value[lanes] = changes
+                    self.__values[position] = value
+
+            # all registers of an edge are committed together with the next state computed before it
+            for i in edges:
+                machine = self.__machines[i]
+                self.__ps[i] = self.__ns[i]
+                if isinstance(machine, MooreMachine):
+                    self.__values[self.__index[id(machine)]] = self.__functions[id(machine)][1](self.__ps[i])
+
+            self.__settle()
+
+        self.__time = until
+
+    def getLanes(self):
+        """
+        @return int : the number of lanes.
+        """
+        return self.__lanes
+
+    def getWaveforms(self):
+        """
+        @return list : for every lane, the value changes [(time, value)] of every signal, by label.
+        """
+
+        waveforms = [{} for _ in range(self.__lanes)]
+        for label, times, rows in self.__signals:
+            table = np.stack(rows)
+            changed = np.ones(table.shape, dtype=bool)
+            changed[1:] = table[1:] != table[:-1]
+            for lane in range(self.__lanes):
+                found = np.flatnonzero(changed[:, lane]).tolist()
+                waveforms[lane][label] = list(zip([times[k] for k in found], table[found, lane].tolist()))
+        return waveforms
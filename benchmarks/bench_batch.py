@@ -0,0 +1,98 @@
+"""
+Compares running the PWM of main.py against N stimulus files one at a time with
+the cycle engine (one pydig object per file) with running all of them as the
+lanes of one pydig.runBatch call. The files are random PWM schedules. They are
+parsed before the timing starts, which takes the same time for both.
+
+    python benchmarks/bench_batch.py --lanes 10 100 1000 --until 200
+
+@author Abhirath, Aryan, Gathik
+@date 17/10/2026
+@version 1.0
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from circuits import parallelPWM
+from pwlSource import InputGenerator
+
+
+def writeStimuli(directory, lanes, until):
+    """
+    @return list : the paths of lanes random PWM input files.
+    """
+
+    paths = []
+    for lane in range(lanes):
+        path = os.path.join(directory, f"stimulus{lane}.csv")
+        with open(path, "w") as file:
+            file.write("time, Period,onTime\n-,2,2\n")
+            for t in range(0, until, 10):
+                file.write(f"{t + 0.05},{random.randrange(4)},{random.randrange(4)}\n")
+        paths.append(path)
+    return paths
+
+
+def sequential(paths, until):
+    """
+    @return tuple : the seconds taken and the PWM output changes of every file.
+    """
+
+    elapsed = 0
+    outputs = []
+    for path in paths:
+        pysim = parallelPWM(1, filePath=path, tabulate=True)
+        start = time.perf_counter()
+        pysim.run(until=until, engine="cycle")
+        elapsed += time.perf_counter() - start
+        out = [x for x in pysim._pydig__components if x.getBlockID() == "PWM Output 0"][0]
+        outputs.append(out.getScopeDump()["Final Output from PWM Output 0"])
+    return elapsed, outputs
+
+
+def batch(paths, until):
+    """
+    @return tuple : the seconds taken and the PWM output changes of every lane.
+    """
+
+    pysim = parallelPWM(1, filePath=paths[0], tabulate=True)
+    source = [x for x in pysim._pydig__components if x.getBlockID() == "PWM Input"][0]
+    stimuli = [InputGenerator(path).getInput()["Inputs"] for path in paths]
+    start = time.perf_counter()
+    waveforms = pysim.runBatch(until, {source: stimuli})
+    return time.perf_counter() - start, [x["Final Output from PWM Output 0"] for x in waveforms]
+
+
+def changes(samples):
+    """
+    @return list : the samples without the repeated values.
+    """
+
+    last = {}
+    for t, v in samples:
+        last[t] = v
+    result = []
+    for t in sorted(last):
+        if not result or result[-1][1] != last[t]:
+            result.append((t, last[t]))
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lanes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--until", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'lanes':>6} {'sequential (s)':>15} {'batch (s)':>10} {'speedup':>8} {'same':>5}")
+    with tempfile.TemporaryDirectory() as directory:
+        for lanes in args.lanes:
+            paths = writeStimuli(directory, lanes, args.until)
+            sequentialTime, expected = sequential(paths, args.until)
+            batchTime, found = batch(paths, args.until)
+            same = all(changes(a) == b for a, b in zip(expected, found))
+            print(f"{lanes:>6} {sequentialTime:>15.3f} {batchTime:>10.3f} {sequentialTime / batchTime:>8.1f} {str(same):>5}")
@@ -0,0 +1,83 @@
+"""
+Compares the peak memory and the time used to write the csv dump by filling the
+whole time x signals table (Plotter.fillEmptyTimeSlots + dumpVars) and by merging
+the scope dumps one row at a time (ScopeMerger + dumpRows).
+
+    python benchmarks/bench_dump.py --samples 100000 1000000 --signals 50
+
+@author Abhirath, Aryan, Gathik
+@date 17/10/2026
+@version 1.0
+"""
+
+import argparse
+import os
+import time
+import tracemalloc
+
+import circuits  # noqa: F401 (adds the project to sys.path)
+from scope import Plotter, ScopeDump, ScopeMerger
+from utilities import dumpVars, dumpRows
+
+
+def build(samples, signals):
+    """
+    @return ScopeDump : samples spread over the signals at different times, like a simulation records them.
+    """
+
+    dump = ScopeDump()
+    names = [f"signal {i}" for i in range(signals)]
+    for i in range(samples):
+        dump.record(names[i % signals], i * 0.01 + (i % 7) * 0.001, i & 255)
+    return dump
+
+
+def filled(dump):
+    """
+    The dump as it was written before: the sorted time set and the filled table.
+    """
+
+    data = dump.getValues()
+    timeValues = set(y[0] for x in data for y in data[x])
+    timeValues.update([0, max(timeValues, default=0) + 1])
+    dumpVars(Plotter.fillEmptyTimeSlots(list(sorted(timeValues)), data), "bench_filled")
+
+
+def streamed(dump):
+    """
+    The dump as it is written now.
+    """
+
+    merger = ScopeMerger([[dump]])
+    dumpRows(merger.getLabels(), merger.rows(), "bench_streamed")
+
+
+def measure(write, dump):
+    """
+    @return tuple : the peak memory in MB and the wall time.
+    """
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    write(dump)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2 ** 20, elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--signals", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'samples':>9} {'dump':>9} {'peak (MB)':>10} {'time (s)':>9}")
+    for samples in args.samples:
+        dump = build(samples, args.signals)
+        for name, write in (("filled", filled), ("streamed", streamed)):
+            peak, elapsed = measure(write, dump)
+            print(f"{samples:>9} {name:>9} {peak:>10.1f} {elapsed:>9.3f}")
+
+    for name in ("bench_filled", "bench_streamed"):
+        os.remove(f"output\\{name}.csv")
@@ -0,0 +1,45 @@
+"""
+Compares the event engine with the cycle engine on N parallel PWMs.
+Prints the clock cycles simulated per second of wall time for every size.
+
+    python benchmarks/bench_engines.py --sizes 1 10 100 1000 --until 10
+
+@author Abhirath, Aryan, Gathik
+@date 17/10/2026
+@version 1.0
+"""
+
+import argparse
+import time
+
+from circuits import parallelPWM
+
+
+def bench(size, until, engine):
+    """
+    @return float : the clock cycles per second of wall time.
+    """
+
+    pysim = parallelPWM(size)
+    start = time.perf_counter()
+    pysim.run(until=until, engine=engine)
+    elapsed = time.perf_counter() - start
+
+    # the PWM clock has a period of 1 time unit
+    return until / elapsed, elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--until", type=int, default=10)
+    parser.add_argument("--event-max", type=int, default=10, help="largest size run with the event engine")
+    args = parser.parse_args()
+
+    print(f"{'PWMs':>6} {'engine':>7} {'seconds':>9} {'cycles/s':>12}")
+    for size in args.sizes:
+        for engine in ("event", "cycle"):
+            if engine == "event" and size > args.event_max:
+                continue
+            rate, elapsed = bench(size, args.until, engine)
+            print(f"{size:>6} {engine:>7} {elapsed:>9.3f} {rate:>12.1f}")
@@ -0,0 +1,108 @@
+"""
+Measures the cold start of pydig: every scenario runs in a new Python process and
+the best wall time of a few runs is printed, with the heavy libraries that were
+loaded (matplotlib, pandas, openpyxl, simpy, numpy).
+
+    import   : import pydig only
+    headless : import pydig, read an input file and run a small circuit with
+               pydig(kernel="native", headless=True)
+    plotted  : the same circuit with the simpy kernel and a plotted output, drawn
+               with the Agg backend (nothing is shown)
+
+    python benchmarks/bench_import.py --repeat 5 --importtime
+
+@author Abhirath, Aryan, Gathik
+@date 17/10/2026
+@version 1.0
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+parent = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+HEAVY = ("matplotlib", "pandas", "openpyxl", "simpy", "numpy")
+
+CIRCUIT = """
+sim = pydig.pydig("bench_import", kernel={kernel!r}, headless={headless})
+src = sim.source({path!r}, blockID="src")
+clk = sim.clock(timePeriod=1, onTime=0.5, blockID="clk")
+counter = sim.moore(maxOutSize=2, blockID="counter", nsl=lambda ps, i: (ps + i) % 4, ol=lambda ps: ps, clock=clk)
+out = sim.output(plot={plot}, blockID="out")
+src.output() > counter.input()
+counter.output() > out.input()
+sim.run(until=20)
+"""
+
+SCENARIOS = {
+    "import": "",
+    "headless": CIRCUIT.format(kernel="native", headless=True, plot=False, path=os.path.join(parent, "Tests", "run_input5.csv")),
+    "plotted": CIRCUIT.format(kernel="simpy", headless=False, plot=True, path=os.path.join(parent, "Tests", "run_input5.csv")),
+}
+
+
+def script(body):
+    """
+    @return str : the code run in the new process, it prints the heavy libraries that were loaded.
+    """
+    return f"import sys\nimport pydig\n{body}\nprint(','.join(x for x in {HEAVY!r} if x in sys.modules))"
+
+
+def bench(body, repeat):
+    """
+    @return tuple : the best wall time in seconds and the heavy libraries that were loaded.
+    """
+
+    best = None
+    environment = dict(os.environ, MPLBACKEND="Agg")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-c", script(body)], cwd=parent, env=environment,
+                                capture_output=True, text=True, check=True)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result.stdout.strip().splitlines()[-1] if result.stdout.strip() else ""
+
+
+def importTimes(count):
+    """
+    @return list : the count modules that take the longest to import with pydig (cumulative microseconds, name).
+    """
+
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import pydig"], cwd=parent,
+                            capture_output=True, text=True, check=True)
+    times = []
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            times.append((int(parts[1]), parts[2].strip()))
+    return sorted(times, reverse=True)[:count]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="the best of this many runs is reported")
+    parser.add_argument("--importtime", action="store_true", help="also print the modules that take the longest to import")
+    args = parser.parse_args()
+
+    # the interpreter alone, to tell its start up from the one of pydig
+    interpreter = None
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        elapsed = time.perf_counter() - start
+        interpreter = elapsed if interpreter is None else min(interpreter, elapsed)
+
+    print(f"{'scenario':>9} {'seconds':>8}  libraries loaded")
+    print(f"{'python':>9} {interpreter:>8.3f}")
+    for name, body in SCENARIOS.items():
+        elapsed, loaded = bench(body, args.repeat)
+        print(f"{name:>9} {elapsed:>8.3f}  {loaded or '-'}")
+
+    if args.importtime:
+        print()
+        for micro, module in importTimes(10):
+            print(f"{micro / 1e6:>8.3f} s  {module}")
@@ -0,0 +1,88 @@
+"""
+Compares simulating N parallel PWMs again from time 0 after one row of their input
+file was edited with pydig.resimulate, which goes back to the last snapshot before
+the edited row. The row is edited at several fractions of the run. The cost of
+keeping the snapshots during the first run is printed too.
+
+    python benchmarks/bench_incremental.py --size 20 --until 400 --interval 10
+
+@author Abhirath, Aryan, Gathik
+@date 17/10/2026
+@version 1.0
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from circuits import parallelPWM
+from pwlSource import InputGenerator
+
+
+def writeStimulus(path, until):
+    """
+    Writes a random PWM schedule with a change every 5 time units.
+    """
+
+    with open(path, "w") as file:
+        file.write("time, Period,onTime\n-,2,2\n")
+        for t in range(0, until, 5):
+            file.write(f"{t + 0.05},{random.randrange(4)},{random.randrange(4)}\n")
+
+
+def firstRun(size, path, until, interval):
+    """
+    @return tuple : the seconds taken and the simulator.
+    """
+
+    pysim = parallelPWM(size, filePath=path, kernel="native")
+    if interval is not None:
+        pysim.keepSnapshots(interval)
+    start = time.perf_counter()
+    pysim.simulate(until=until)
+    return time.perf_counter() - start, pysim
+
+
+def waveforms(pysim):
+    return {label: [list(x) for x in columns] for label, columns in pysim.getWaveforms().items()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=20)
+    parser.add_argument("--until", type=int, default=400)
+    parser.add_argument("--interval", type=float, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "stimulus.csv")
+        writeStimulus(path, args.until)
+        schedule = InputGenerator(path).getInput()["Inputs"]
+
+        plainTime, _ = firstRun(args.size, path, args.until, None)
+        snapshotTime, _ = firstRun(args.size, path, args.until, args.interval)
+        print(f"first run: {plainTime:.3f} s, with snapshots every {args.interval}: {snapshotTime:.3f} s")
+
+        print(f"{'edit at':>8} {'from 0 (s)':>11} {'resimulate (s)':>15} {'restart':>8} {'speedup':>8} {'same':>5}")
+        for fraction in (0.1, 0.5, 0.9):
+            edited = list(schedule)
+            index = int(len(edited) * fraction)
+            edited[index] = (edited[index][0], (edited[index][1] + 1) % 16)
+
+            _, pysim = firstRun(args.size, path, args.until, args.interval)
+            source = [x for x in pysim._pydig__components if x.getBlockID() == "PWM Input"][0]
+            start = time.perf_counter()
+            restart = pysim.resimulate({source: edited})
+            incrementalTime = time.perf_counter() - start
+
+            reference = parallelPWM(args.size, filePath=path, kernel="native")
+            source = [x for x in reference._pydig__components if x.getBlockID() == "PWM Input"][0]
+            source.setInputList(edited)
+            start = time.perf_counter()
+            reference.simulate(until=args.until)
+            fullTime = time.perf_counter() - start
+
+            same = waveforms(pysim) == waveforms(reference)
+            print(f"{edited[index][0]:>8} {fullTime:>11.3f} {incrementalTime:>15.3f} {restart:>8} {fullTime / incrementalTime:>7.1f}x {str(same):>5}")
@@ -0,0 +1,52 @@
+"""
+Compares the simpy kernel with the NativeKernel on N parallel PWMs.
+Prints the events run per second of wall time for every size.
+
+Both kernels run exactly the same events, so the event count of the native
+run is used for the simpy run as well.
+
+    python benchmarks/bench_kernel.py --sizes 1 10 50 --until 10 --repeat 3
+
+@author Abhirath, Aryan, Gathik
+@date 17/10/2026
+@version 1.0
+"""
+
+import argparse
+import time
+
+from circuits import parallelPWM
+
+
+def bench(size, until, kernel, repeat=1):
+    """
+    @return tuple : the best wall time in seconds and the last simulator that was run.
+    """
+
+    best = None
+    for _ in range(repeat):
+        pysim = parallelPWM(size, kernel=kernel)
+        start = time.perf_counter()
+        pysim.run(until=until)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, pysim
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--until", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3, help="the best of this many runs is reported")
+    args = parser.parse_args()
+
+    # warm up both kernels so that the first measurement is not penalised
+    bench(1, 1, "native")
+    bench(1, 1, "simpy")
+
+    print(f"{'PWMs':>6} {'events':>10} {'simpy ev/s':>12} {'native ev/s':>12} {'speedup':>8}")
+    for size in args.sizes:
+        nativeTime, pysim = bench(size, args.until, "native", args.repeat)
+        simpyTime, _ = bench(size, args.until, "simpy", args.repeat)
+        events = pysim.getEnv().getEventCount()
+        print(f"{size:>6} {events:>10} {events / simpyTime:>12.0f} {events / nativeTime:>12.0f} {simpyTime / nativeTime:>7.2f}x")
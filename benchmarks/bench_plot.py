@@ -0,0 +1,53 @@
+"""
+Measures saving the plots of N parallel PWMs (every counter and output, one figure per
+block) after a long run, with one worker and with a pool of processes. The number of
+samples the blocks recorded and the number left after decimating them to the width of
+the figures are printed too.
+
+    python benchmarks/bench_plot.py --size 8 --until 100000 --workers 4 --format png
+
+@author Abhirath, Aryan, Gathik
+@date 17/10/2026
+@version 1.0
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from circuits import parallelPWM
+from scope import Plotter, decimate
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=8)
+    parser.add_argument("--until", type=int, default=100000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--width", type=int, default=1600)
+    parser.add_argument("--format", default="png", choices=("png", "svg", "pdf"))
+    args = parser.parse_args()
+
+    pysim = parallelPWM(args.size, kernel="native")
+    start = time.perf_counter()
+    pysim.simulate(until=args.until)
+    print(f"simulation: {time.perf_counter() - start:.3f} s")
+
+    blocks = [x for x in pysim._pydig__components if x.getBlockID().startswith(("Mod 4 Counter", "PWM Output"))]
+    dumps = {f"Plot of {x.getBlockID()}": x.getScopeDump() for x in blocks}
+
+    recorded = sum(len(samples) for dump in dumps.values() for samples in dump.values())
+    drawn = sum(len(decimate([t for t, _ in samples], [v for _, v in samples], args.until, args.width)[0])
+                for dump in dumps.values() for samples in dump.values())
+    print(f"samples: {recorded} recorded, {drawn} drawn ({recorded / drawn:.1f}x fewer)")
+
+    print(f"{'workers':>8} {'figures':>8} {'seconds':>8}")
+    for workers in sorted({1, args.workers}):
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            plotter = Plotter(directory, args.format, args.width, workers)
+            for name, dump in dumps.items():
+                plotter.plot(dump, name, check=False)
+            files = plotter.show()
+            print(f"{workers:>8} {len(files):>8} {time.perf_counter() - start:>8.3f}")
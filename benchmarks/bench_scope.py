@@ -0,0 +1,77 @@
+"""
+Compares the memory and the time used by the columnar ScopeDump with the
+list of tuples that it replaced, for the same samples.
+
+    python benchmarks/bench_scope.py --samples 100000 1000000 --signals 10
+
+@author Abhirath, Aryan, Gathik
+@date 17/10/2026
+@version 1.0
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import circuits  # noqa: F401 (adds the project to sys.path)
+from scope import ScopeDump
+from utilities import checkType
+
+
+class TupleScopeDump():
+    """
+    The previous ScopeDump: one list of (time, value) tuples per signal.
+    """
+
+    def __init__(self):
+        self.__values = {}
+
+    def add(self, classification: str, time: float, value: int):
+        checkType([(classification, str), (time, (float, int)), (value, int)])
+
+        if (classification in self.__values):
+            self.__values[classification].append((time, value))
+        else:
+            self.__values[classification] = [(time, value)]
+
+
+def fill(dump, method, samples, signals):
+    """
+    Adds samples spread over the signals, like a simulation does.
+    @return float : the wall time in seconds.
+    """
+
+    names = [f"signal {i}" for i in range(signals)]
+    add = getattr(dump, method)
+    start = time.perf_counter()
+    for i in range(samples):
+        add(names[i % signals], i * 0.01, i & 255)
+    return time.perf_counter() - start
+
+
+def measure(factory, method, samples, signals):
+    """
+    @return tuple : the bytes per sample and the wall time.
+    """
+
+    tracemalloc.start()
+    dump = factory()
+    elapsed = fill(dump, method, samples, signals)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / samples, elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--signals", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'samples':>9} {'store':>16} {'bytes/sample':>13} {'time (s)':>9}")
+    for samples in args.samples:
+        for name, factory, method in (("tuples add", TupleScopeDump, "add"),
+                                      ("columnar add", ScopeDump, "add"),
+                                      ("columnar record", ScopeDump, "record")):
+            perSample, elapsed = measure(factory, method, samples, args.signals)
+            print(f"{samples:>9} {name:>16} {perSample:>13.1f} {elapsed:>9.3f}")
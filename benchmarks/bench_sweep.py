@@ -0,0 +1,53 @@
+"""
+Sweeps the clock period of N parallel PWMs over many points with pydig.sweep,
+once in this process (workers = 1) and once in a pool of processes, and prints
+the points simulated per second. The speedup is bounded by the number of CPUs.
+
+    python benchmarks/bench_sweep.py --points 64 --size 10 --until 50 --workers 4
+
+@author Abhirath, Aryan, Gathik
+@date 17/10/2026
+@version 1.0
+"""
+
+import argparse
+import os
+import time
+
+from circuits import parallelPWM
+from pydig import pydig
+
+
+def buildPoint(size, timePeriod):
+    """
+    @return pydig : size PWMs clocked with timePeriod (the build function of the sweep).
+    """
+    return parallelPWM(size, timePeriod=timePeriod, onTime=timePeriod / 2)
+
+
+def bench(points, until, workers):
+    """
+    @return tuple : the seconds taken and the number of samples sent back.
+    """
+
+    start = time.perf_counter()
+    samples = 0
+    for _, waveforms in pydig.sweep(buildPoint, points, until, workers=workers):
+        samples += sum(len(times) for times, _, _ in waveforms.values())
+    return time.perf_counter() - start, samples
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=64)
+    parser.add_argument("--size", type=int, default=10)
+    parser.add_argument("--until", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    points = [{"size": args.size, "timePeriod": 0.5 + k / args.points} for k in range(args.points)]
+
+    print(f"{'workers':>8} {'seconds':>9} {'points/s':>9} {'samples':>9}")
+    for workers in sorted({1, args.workers}):
+        elapsed, samples = bench(points, args.until, workers)
+        print(f"{workers:>8} {elapsed:>9.3f} {args.points / elapsed:>9.1f} {samples:>9}")
@@ -0,0 +1,88 @@
+"""
+Compares answering point queries from the csv dump (parsed again for every
+query, as a script reading the file does) with the binary trace read through
+TraceReader, on the same recorded samples.
+
+    python benchmarks/bench_trace.py --samples 1000000 --signals 20 --queries 100
+
+@author Abhirath, Aryan, Gathik
+@date 17/10/2026
+@version 1.0
+"""
+
+import argparse
+import csv
+import os
+import random
+import time
+
+import circuits  # noqa: F401 (adds the project to sys.path)
+from scope import ScopeDump, ScopeMerger
+from traceFile import TraceWriter, TraceReader
+from utilities import dumpRows
+
+
+def build(samples, signals):
+    """
+    @return ScopeDump : samples spread over the signals, like a simulation records them.
+    """
+
+    dump = ScopeDump()
+    names = [f"signal {i}" for i in range(signals)]
+    for i in range(samples):
+        dump.record(names[i % signals], i * 0.01, (i * 7) & 255)
+    return dump
+
+
+def csvQuery(name, signal, at):
+    """
+    @return int : the value of signal at the time at, from the csv file.
+    """
+
+    with open(f"output\\{name}.csv", newline="") as file:
+        rows = csv.reader(file)
+        column = next(rows).index(signal)
+        value = 0
+        for row in rows:
+            if float(row[0]) > at:
+                break
+            value = int(row[column])
+        return value
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", type=int, default=200000)
+    parser.add_argument("--signals", type=int, default=20)
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args()
+
+    dump = build(args.samples, args.signals)
+    merger = ScopeMerger([[dump]])
+    dumpRows(merger.getLabels(), merger.rows(), "bench_trace")
+    trace = TraceWriter("bench_trace.bin")
+    for label in merger.getLabels():
+        trace.addSignal(label, *merger.getColumns(label))
+    trace.close()
+
+    end = args.samples * 0.01
+    queries = [(f"signal {random.randrange(args.signals)}", random.uniform(0, end)) for _ in range(args.queries)]
+
+    start = time.perf_counter()
+    expected = [csvQuery("bench_trace", signal, at) for signal, at in queries]
+    csvTime = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reader = TraceReader("bench_trace.bin")
+    found = [reader.valueAt(signal, at) for signal, at in queries]
+    reader.close()
+    traceTime = time.perf_counter() - start
+
+    csvSize = os.path.getsize("output\\bench_trace.csv")
+    print(f"{'file':>6} {'size (MB)':>10} {'time (s)':>9}")
+    print(f"{'csv':>6} {csvSize / 2 ** 20:>10.2f} {csvTime:>9.3f}")
+    print(f"{'trace':>6} {os.path.getsize('bench_trace.bin') / 2 ** 20:>10.2f} {traceTime:>9.3f}")
+    print("same answers:", expected == found)
+
+    os.remove("output\\bench_trace.csv")
+    os.remove("bench_trace.bin")
@@ -0,0 +1,174 @@
+"""
+This file contains parameterized circuits that are used by the benchmarks.
+Every builder takes the number of copies to build and returns the pydig object.
+
+@author Abhirath, Aryan, Gathik
+@date 17/10/2026
+@version 1.0
+"""
+
+import os
+import sys
+
+# directory reach
+current = os.path.dirname(os.path.realpath(__file__))
+parent = os.path.dirname(current)
+sys.path.append(parent)
+# the circuits of BuildingBlocks import their modules by name
+sys.path.append(os.path.join(parent, "BuildingBlocks"))
+
+from pydig import pydig as pd
+
+PWM_PATH = os.path.join(parent, "Tests", "PWM.csv")
+COUNTER_PATH = os.path.join(parent, "Tests", "BitCounter.csv")
+
+
+def n(a):
+    """
+    @param a : a single bit
+    @return int : the inverted bit
+    """
+    return (~a & 0b1)
+
+
+def pwmNSL(ps, i):
+    """
+    Next state logic of the mod 4 counter used in the PWM of main.py.
+    """
+    a = (ps >> 1) & 1
+    b = (ps >> 0) & 1
+
+    d = (n(a) & b & n(i)) | (a & n(b) & n(i))
+    e = (n(b) & n(i))
+
+    return d << 1 | e
+
+
+def parallelPWM(size: int, filePath=PWM_PATH, tabulate=False, timePeriod=1, onTime=0.5, **kwargs):
+    """
+    Builds size copies of the PWM of main.py that share one input file and one clock.
+    @param size : the number of PWMs
+    @param filePath : the input file (the period and the on time of the PWM)
+    @param tabulate : passed on to the comparators
+    @param timePeriod : the period of the clock
+    @param onTime : the on time of the clock
+    @param kwargs : passed on to the pydig object
+    @return pydig : the simulator
+    """
+
+    pysim = pd(name=f"PWM x{size}", **kwargs)
+    source = pysim.source(filePath=filePath, plot=False, blockID="PWM Input")
+    clk = pysim.clock(plot=False, blockID="clk", timePeriod=timePeriod, onTime=onTime)
+
+    for i in range(size):
+        counter = pysim.moore(maxOutSize=2, plot=False, blockID=f"Mod 4 Counter {i}", nsl=pwmNSL, ol=lambda ps: ps)
+        syncReset = pysim.combinational(maxOutSize=1, plot=False, blockID=f"Sync Reset Comparator {i}", func=lambda x: int((x & 3) == (x >> 2)), delay=0, tabulate=tabulate)
+        compare = pysim.combinational(maxOutSize=1, plot=False, blockID=f"Output Comparator {i}", func=lambda x: int((x & 3) > (x >> 2)), delay=0, tabulate=tabulate)
+        out = pysim.output(plot=False, blockID=f"PWM Output {i}")
+
+        syncReset.output() > counter.input()
+        clk.output() > counter.clock()
+        source.output(0, 2) > compare.input()
+        counter.output() > compare.input()
+        source.output(2, 4) > syncReset.input()
+        counter.output() > syncReset.input()
+        compare.output() > out.input()
+
+    return pysim
+
+
+def counterChain(size: int, filePath=COUNTER_PATH, **kwargs):
+    """
+    Builds size Enabled4BitCounterWithTC of BuildingBlocks/BitCounters.py in a chain: the first one
+    is enabled by the input file and every other one by the terminal count of the one before it.
+    @param size : the number of counters
+    @param filePath : the input file (the enable line)
+    @param kwargs : passed on to the pydig object
+    @return pydig : the simulator
+    """
+
+    from BitCounters import Enabled4BitCounterWithTC
+
+    pysim = pd(name=f"Counter chain x{size}", **kwargs)
+    enable = pysim.source(filePath=filePath, plot=False, blockID="Enable")
+    clk = pysim.clock(plot=False, blockID="clk", timePeriod=1, onTime=0.5)
+
+    for i in range(size):
+        counter = Enabled4BitCounterWithTC(pysim, enable, clk, plot=False)
+        out = pysim.output(plot=False, blockID=f"Count {i}")
+        counter.output() > out.input()
+        enable = counter.getTerminalCount()
+
+    return pysim
+
+
+def registerPipeline(size: int, stages=4, **kwargs):
+    """
+    Builds a size bit counter that feeds stages PIPO registers of size bits in a row and a SISO
+    register of size bits (with its lowest bit), all from BuildingBlocks/DifferentRegisters.py.
+    @param size : the width of the registers in bits
+    @param stages : the number of PIPO registers
+    @param kwargs : passed on to the pydig object
+    @return pydig : the simulator
+    """
+
+    from DifferentRegisters import PIPO, SISO
+
+    pysim = pd(name=f"Registers x{size}", **kwargs)
+    clk = pysim.clock(plot=False, blockID="clk", timePeriod=1, onTime=0.5)
+    enable = pysim.source(filePath=COUNTER_PATH, plot=False, blockID="Enable")
+    mask = (1 << size) - 1
+    data = pysim.moore(maxOutSize=size, plot=False, blockID="Data", nsl=lambda ps, i: (ps * 5 + i) & mask, ol=lambda ps: ps, clock=clk)
+    enable.output() > data.input()
+
+    previous = data
+    for i in range(stages):
+        register = PIPO(pysim, size, clk, 0.01, 0, False, f"PIPO {i}")
+        previous.output() > register.input()
+        previous = register
+
+    shift = SISO(pysim, size, clk, 0.01, 0, False, "SISO")
+    data.output(0, 1) > shift.input()
+
+    for name, register in (("PIPO output", previous), ("SISO output", shift)):
+        out = pysim.output(plot=False, blockID=name)
+        register.output() > out.input()
+
+    return pysim
+
+
+def gateTree(size: int, **kwargs):
+    """
+    Builds a tree of XOR gates (BuildingBlocks/BasicGates.py) that reduces the size bits of a
+    counter to one bit, with size - 1 gates.
+    @param size : the number of leaves (bits of the counter)
+    @param kwargs : passed on to the pydig object
+    @return pydig : the simulator
+    """
+
+    from BasicGates import XOR
+
+    pysim = pd(name=f"Gate tree x{size}", **kwargs)
+    clk = pysim.clock(plot=False, blockID="clk", timePeriod=1, onTime=0.5)
+    enable = pysim.source(filePath=COUNTER_PATH, plot=False, blockID="Enable")
+    mask = (1 << size) - 1
+    data = pysim.moore(maxOutSize=size, plot=False, blockID="Data", nsl=lambda ps, i: (ps * 5 + i) & mask, ol=lambda ps: ps, clock=clk)
+    enable.output() > data.input()
+
+    level = [(data, i) for i in range(size)]
+    count = 0
+    while len(level) > 1:
+        following = []
+        for k in range(0, len(level) - 1, 2):
+            gate = XOR(pysim, 0.01, 0, False, f"XOR {count}")
+            count += 1
+            for block, bit in level[k:k + 2]:
+                block.output(bit, bit + 1) > gate.input()
+            following.append((gate, 0))
+        following.extend(level[len(level) - len(level) % 2:])
+        level = following
+
+    out = pysim.output(plot=False, blockID="Parity")
+    level[0][0].output(level[0][1], level[0][1] + 1) > out.input()
+
+    return pysim
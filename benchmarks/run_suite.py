@@ -0,0 +1,211 @@
+"""
+Runs the reference circuits of circuits.py at several sizes and reports for every run the
+events per second (native kernel), the simulated time units per second, the peak memory
+(RSS) of the process and the time taken to write the csv file:
+
+    pwm       : N parallel PWMs of main.py (N copies)
+    counters  : a chain of N Enabled4BitCounterWithTC (BitCounters.py)
+    registers : N bit PIPO registers in a row and a N bit SISO (DifferentRegisters.py)
+    gates     : a tree of XOR gates (BasicGates.py) over N bits
+
+Every run is made in a new process, so the peak memory of a run does not hide the next one.
+The results are written to a JSON file with the commit they were measured on, and --compare
+prints the change from an earlier file and exits with 1 if a run got slower than --threshold.
+
+    python benchmarks/run_suite.py --until 200 --output results.json
+    python benchmarks/run_suite.py --circuits pwm gates --sizes 16 64 --compare benchmarks/results/<commit>.json
+
+@author Abhirath, Aryan, Gathik
+@date 17/10/2026
+@version 1.0
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+parent = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+FORMAT = "pydig benchmark suite 1"
+
+# the builder in circuits.py and the default sizes of every circuit
+SUITE = {
+    "pwm": ("parallelPWM", (10, 40, 160)),
+    "counters": ("counterChain", (1, 4, 16)),
+    "registers": ("registerPipeline", (8, 64, 512)),
+    "gates": ("gateTree", (16, 64, 256)),
+}
+
+# the measures compared by --compare, and whether more is better
+MEASURES = {"eventsPerSecond": True, "timePerSecond": True, "peakRSS": False, "dumpSeconds": False}
+
+
+def peakRSS():
+    """
+    @return int : the peak memory of this process in bytes, None where the resource module is missing.
+    """
+
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def measure(circuit, size, until, kernel, engine):
+    """
+    Builds and simulates one circuit and writes its csv file, this runs in its own process.
+    @return dict : the measures of the run.
+    """
+
+    import circuits
+    from scope import ScopeMerger
+    from utilities import dumpRows
+
+    baseRSS = peakRSS()
+    start = time.perf_counter()
+    pysim = getattr(circuits, SUITE[circuit][0])(size, kernel=kernel, headless=True)
+    buildSeconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pysim.simulate(until=until, engine=engine)
+    seconds = time.perf_counter() - start
+
+    components = pysim._pydig__components
+    events = pysim.getEnv().getEventCount() if kernel == "native" and engine == "event" else None
+    samples = sum(sum(x._scopeDump.getSampleCounts().values()) for x in components)
+
+    # the csv file of run(), written in a temporary directory
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            start = time.perf_counter()
+            merger = ScopeMerger([x.getScopeDumps() for x in components], pysim.getTicksPerUnit())
+            dumpRows(merger.getLabels(), merger.rows(), "suite")
+            dumpSeconds = time.perf_counter() - start
+        finally:
+            os.chdir(cwd)
+
+    return {"circuit": circuit, "size": size, "blocks": len(components), "until": until,
+            "buildSeconds": buildSeconds, "seconds": seconds, "events": events,
+            "eventsPerSecond": events / seconds if events is not None else None,
+            "timePerSecond": until / seconds, "samples": samples, "dumpSeconds": dumpSeconds,
+            "baseRSS": baseRSS, "peakRSS": peakRSS()}
+
+
+def runOne(circuit, size, args):
+    """
+    Measures a circuit in a new process, the best of --repeat runs.
+    @return dict : the measures of the fastest run.
+    """
+
+    best = None
+    for _ in range(args.repeat):
+        command = [sys.executable, os.path.realpath(__file__), "--one", circuit, str(size),
+                   "--until", str(args.until), "--kernel", args.kernel, "--engine", args.engine]
+        output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        if best is None or result["seconds"] < best["seconds"]:
+            best = result
+    return best
+
+
+def commit():
+    """
+    @return str : the commit of the repository being measured, None outside of git.
+    """
+
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], cwd=parent, capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(old, new, threshold):
+    """
+    Prints the change of every measure of the runs found in both files.
+    @return bool : True if a run got worse than threshold (a fraction) on one of its measures.
+    """
+
+    before = {(x["circuit"], x["size"]): x for x in old["results"]}
+    worse = False
+    print(f"\ncompared with {old.get('commit') or 'an unknown commit'} ({old.get('date')})")
+    print(f"{'circuit':>10} {'size':>5} " + " ".join(f"{x:>16}" for x in MEASURES))
+    for result in new["results"]:
+        previous = before.get((result["circuit"], result["size"]))
+        if previous is None:
+            continue
+        cells = []
+        for measure, higherIsBetter in MEASURES.items():
+            if not previous.get(measure) or result.get(measure) is None:
+                cells.append(f"{'-':>16}")
+                continue
+            change = result[measure] / previous[measure] - 1
+            regressed = -change > threshold if higherIsBetter else change > threshold
+            worse = worse or regressed
+            cells.append(f"{change:>+15.1%}{'!' if regressed else ' '}")
+        print(f"{result['circuit']:>10} {result['size']:>5} " + " ".join(cells))
+    return worse
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--circuits", nargs="+", choices=list(SUITE), default=list(SUITE))
+    parser.add_argument("--sizes", nargs="+", type=int, help="the sizes of every circuit, instead of their own")
+    parser.add_argument("--until", type=int, default=200)
+    parser.add_argument("--kernel", choices=("native", "simpy"), default="native")
+    parser.add_argument("--engine", choices=("event", "cycle"), default="event")
+    parser.add_argument("--repeat", type=int, default=1, help="the best of this many runs is kept")
+    parser.add_argument("--output", help="the JSON file of the results, benchmarks/results/<commit>.json by default")
+    parser.add_argument("--compare", help="a JSON file of earlier results")
+    parser.add_argument("--threshold", type=float, default=0.1, help="the change counted as a regression (0.1 is 10%%)")
+    parser.add_argument("--one", nargs=2, metavar=("CIRCUIT", "SIZE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.dirname(os.path.realpath(__file__)))
+
+    if args.one is not None:
+        # a single run, in the process started by runOne
+        print(json.dumps(measure(args.one[0], int(args.one[1]), args.until, args.kernel, args.engine)))
+        sys.exit(0)
+
+    revision = commit()
+    results = []
+    print(f"{'circuit':>10} {'size':>5} {'blocks':>7} {'seconds':>8} {'events/s':>10} {'time/s':>9} {'peak MB':>8} {'dump s':>7}")
+    for circuit in args.circuits:
+        for size in args.sizes or SUITE[circuit][1]:
+            result = runOne(circuit, size, args)
+            results.append(result)
+            eventsPerSecond = f"{result['eventsPerSecond']:>10.0f}" if result["eventsPerSecond"] is not None else f"{'-':>10}"
+            peak = f"{result['peakRSS'] / 2**20:>8.1f}" if result["peakRSS"] is not None else f"{'-':>8}"
+            print(f"{circuit:>10} {size:>5} {result['blocks']:>7} {result['seconds']:>8.3f} {eventsPerSecond} "
+                  f"{result['timePerSecond']:>9.1f} {peak} {result['dumpSeconds']:>7.3f}")
+
+    report = {"format": FORMAT, "commit": revision, "date": datetime.datetime.now().isoformat(timespec="seconds"),
+              "python": platform.python_version(), "platform": platform.platform(), "until": args.until,
+              "kernel": args.kernel, "engine": args.engine, "repeat": args.repeat, "results": results}
+
+    output = args.output or os.path.join(parent, "benchmarks", "results", f"{(revision or 'results')[:10]}.json")
+    if os.path.dirname(output):
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as file:
+        json.dump(report, file, indent=1)
+    print(f"\nThe results were written to {output}.")
+
+    if args.compare is not None:
+        with open(args.compare) as file:
+            old = json.load(file)
+        if old.get("format") != FORMAT:
+            sys.exit(f"{args.compare} is not a result file of this suite.")
+        if compare(old, report, args.threshold):
+            sys.exit(1)
@@ -21,8 +21,9 @@ The objects that it defines are:
 
 from abc import ABC, abstractmethod
 from utilities import checkType, printErrorAndExit
-import simpy
 from scope import Plotter, ScopeDump
+from kernel import NativeKernel
+from clockDomain import ClockDomain
 
 
 class Block(ABC):
@@ -35,7 +36,7 @@ class Block(ABC):
     def __init__(self, **kwargs):
         """
         Use keyword arguments to pass the following parameters:
-        @param env : is the simpy environment.
+        @param env : is the simpy environment (or the NativeKernel).
         @param blockID : is the id of this input block, It serves as a name for this block.
         @param plot : is a boolean variable which represents whether or not we should plot this class.
         """
@@ -45,6 +46,17 @@ class Block(ABC):
         self.__plot = kwargs.get("plot", False)
         self.__blockID = kwargs.get("blockID", 0)
 
+        if isinstance(self._env, NativeKernel):
+            self._callAfter = self._env.call
+
+    def _callAfter(self, delay, callback, *args):
+        """
+        Calls callback(*args) after delay time units.
+        On simpy this only creates a timeout (no process or generator), on the
+        NativeKernel it is replaced by NativeKernel.call in __init__.
+        """
+        self._env.timeout(delay).callbacks.append(lambda event: callback(*args))
+
     def getBlockID(self):
         """
         Returns the block ID of the current block.
@@ -67,14 +79,70 @@ class Block(ABC):
         """
         return self._scopeDump.getValues()
 
-    def plot(self):
+    def getScopeDumps(self):
+        """
+        Returns the ScopeDump objects that getScopeDump merges, in the same order.
+        @return list : of ScopeDump.
+        """
+        return [self._scopeDump]
+
+    def getSignals(self):
+        """
+        @return dict : the name of every signal recorded by this block, by kind
+                       ("input", "ns", "ps" or "output"). Empty if the block does not name them.
+        """
+        return {}
+
+    def getSignalWidths(self):
+        """
+        @return dict : the number of bits of every signal named by getSignals, by kind.
+        """
+        return {}
+
+    def getState(self):
+        """
+        @return dict : the values that make up the state of this block during a simulation
+                       (see checkpoint.py). Every subclass adds its own values.
+        """
+        return {}
+
+    def setState(self, state: dict):
+        """
+        Loads a state given by getState.
+        @param state : the state of a block of the same type.
+        """
+        pass
+
+    def setProbe(self, which):
+        """
+        Chooses the signals of this block that are recorded.
+        @param which : the kinds of signals to record (see getSignals), or None to record everything.
+        """
+        if which is None:
+            self._scopeDump.setProbe(None)
+            return
+
+        signals = self.getSignals()
+        for kind in which:
+            if kind not in signals:
+                printErrorAndExit(f"{self} has no {kind} signal, use one of {list(signals)}.")
+        self._scopeDump.setProbe([signals[x] for x in which])
+
+    def isPlotted(self):
+        """
+        @return bool : True if this block is plotted after the simulation.
+        """
+        return self.__plot
+
+    def plot(self, plotter=None):
         """
         plots the values if plot=True was passed inthat are
         associated to the block that has called this method.
+        @param plotter : the Plotter to draw with, None for Block.plotter.
         @return : None
         """
         if self.__plot:
-            Block.plotter.plot(self.getScopeDump(),f"Plot of {self.getBlockID()}")
+            (plotter or Block.plotter).plot(self.getScopeDump(), f"Plot of {self.getBlockID()}", check=False)
 
     @abstractmethod
     def __str__(self):
@@ -114,8 +182,10 @@ class HasInputConnections(Block):
         @param blockID : is the id of this input block. If blockID is a duplicate
                          or is not given, then new unique ID is given.
         """
-        self.__input = []
-        self.__inputSizes = []
+        self.__drivers = []
+        self.__slots = []
+        self.__packed = 0
+        self.__packedWidth = 0
         self.__inputCount = 0
         self.__isConnected = False
         super().__init__(**kwargs)
@@ -139,44 +209,77 @@ class HasInputConnections(Block):
             self.resetClockFlag()
             return True
 
-        self.__input.append(other._output)
-        self.__inputSizes.append((other.getLeft(), other.getRight(), other.getWidth()))
+        # the slice of the driver is compiled once into a mask and a shift
+        left, width = other.getLeft(), other.getWidth()
+        self.__slots.append([other._output, left, (1 << width) - 1, self.__packedWidth, 0])
+        self.__packedWidth += width
+        self.__drivers.append(other)
         self.__inputCount += 1
         self.__isConnected = True
         other.addFanOut(self)
+        other._addReader(self, len(self.__slots) - 1)
         other.resetState()
+        self._updateSlot(len(self.__slots) - 1)
         return True
 
+    def getDrivers(self):
+        """
+        @return list : the blocks driving the inputs of this block, in connection order.
+        """
+        return list(self.__drivers)
+
+    def getInputWidth(self):
+        """
+        @return int: the total number of bits of the inputs connected to this block.
+        """
+        return self.__packedWidth
+
+    def getInputSlots(self):
+        """
+        @return list : (driver, left most bit, mask, shift) of every input, in connection order.
+                       The input value is the sum of ((driver output >> left) & mask) << shift.
+        """
+        return [(driver, slot[1], slot[2], slot[3]) for driver, slot in zip(self.__drivers, self.__slots)]
+
     def getInputCount(self):
         """
         @return int: the number of inputs connected to this block.
         """
         return self.__inputCount
 
-    def __strip(self, val, left, right):
+    def getState(self):
         """
-        Strips the value to get the required bits.
-        @param val : the value to be stripped.
-        @param left : the LSB required (inclusive).
-        @param right : the MSB not required (exclusive).
-        @return int : The final value only with the required bits
+        @return dict : the state of this block, with its packed input.
         """
+        state = super().getState()
+        state["packed"] = self.__packed
+        state["slots"] = [x[4] for x in self.__slots]
+        return state
 
-        temp = (val >> right) << right
-        val -= temp
-        val = val >> left
-        return val
+    def setState(self, state: dict):
+        """
+        Loads a state given by getState.
+        """
+        super().setState(state)
+        self.__packed = state["packed"]
+        for slot, value in zip(self.__slots, state["slots"]):
+            slot[4] = value
+
+    def _updateSlot(self, index):
+        """
+        Repacks one input after the output of its driver changed.
+        @param index : the index of the input (in connection order).
+        """
+        slot = self.__slots[index]
+        value = ((slot[0][0] >> slot[1]) & slot[2]) << slot[3]
+        self.__packed += value - slot[4]
+        slot[4] = value
 
     def getInputVal(self):
         """
         @return int : the final value of the input connected to this block.
         """
-        ans = 0
-        factor = 1
-        for i in range(self.__inputCount):
-            ans += self.__strip(self.__input[i][0], self.__inputSizes[i][0], self.__inputSizes[i][1]) * factor
-            factor = factor * (2 ** self.__inputSizes[i][2])
-        return ans
+        return self.__packed
 
     def isConnectedToInput(self):
         """
@@ -211,6 +314,7 @@ class HasOutputConnections(Block):
         @param env : is the simpy environment.
         @param : blockID is the id of this input block. If blockID is duplicate or
                  None, then new unique ID is given.
+        @param changeOnly : if True, the fan out only runs when the output value changed.
         """
         maxOutSize = kwargs.get("maxOutSize", None)
         self.__maxOutSize = maxOutSize
@@ -218,14 +322,32 @@ class HasOutputConnections(Block):
         self.__fanOutList = []
         self._output = [0]
         self.__regList = []
+        self.__changeOnly = kwargs.get("changeOnly", False)
+        self.__skipped = 0
+        self.__readers = []
+        self.__clockDomain = ClockDomain(self)
         super().__init__(**kwargs)
 
     def addFanOut(self, other, val=0):
         if isinstance(other, HasRegisters) and val == 1:
             self.__regList.append(other)
+            self.__clockDomain.add(other)
         else:
             self.__fanOutList.append(other)
 
+    def _addReader(self, other, index):
+        """
+        Remembers that input index of other reads this output.
+        """
+        self.__readers.append((other, index))
+
+    def _updateReaders(self):
+        """
+        Repacks the inputs that read this output, this must be called whenever the output changes.
+        """
+        for reader, index in self.__readers:
+            reader._updateSlot(index)
+
     def resetState(self):
         """
         Resets the state of the block.
@@ -250,6 +372,12 @@ class HasOutputConnections(Block):
         """
         return self.__state[2]
 
+    def getMaxOutSize(self):
+        """
+        @return int : the number of output wires of this block.
+        """
+        return self.__maxOutSize
+
     def __gt__(self, other):
         """
         Makes it possible to do the following connection:
@@ -266,11 +394,88 @@ class HasOutputConnections(Block):
         self.__state = (left, right, right - left)
         return self
 
-    def processFanOut(self):
+    def getFanOut(self):
+        """
+        @return list : the blocks whose inputs are driven by this block.
+        """
+        return list(self.__fanOutList)
+
+    def getRegisters(self):
+        """
+        @return list : the blocks whose registers are clocked by this block.
+        """
+        return list(self.__regList)
+
+    def getClockDomain(self):
+        """
+        @return ClockDomain : the object that commits the registers clocked by this block.
+        """
+        return self.__clockDomain
+
+    def getState(self):
+        """
+        @return dict : the state of this block, with its output and the registers waiting to be committed.
+        """
+        state = super().getState()
+        state["output"] = self._output[0]
+        state["skipped"] = self.__skipped
+        state["clockDomain"] = self.__clockDomain.getState()
+        return state
+
+    def setState(self, state: dict):
+        """
+        Loads a state given by getState.
+        """
+        super().setState(state)
+        self._output[0] = state["output"]
+        self.__skipped = state["skipped"]
+        self.__clockDomain.setState(state["clockDomain"])
+
+    def setChangeOnly(self, changeOnly: bool):
+        """
+        @param changeOnly : if True, the fan out only runs when the output value changed.
+        """
+        checkType([(changeOnly, bool)])
+        self.__changeOnly = changeOnly
+
+    def isChangeOnly(self):
+        """
+        @return bool : True if the fan out only runs when the output value changed.
+        """
+        return self.__changeOnly
+
+    def getSkippedCount(self):
+        """
+        @return int : the number of fan out evaluations skipped because the output did not change.
+        """
+        return self.__skipped
+
+    def _setOutput(self, value):
+        """
+        Changes the output of this block.
+        @param value : the new output value.
+        @return bool : True if the output value changed, False otherwise.
+        """
+        changed = value != self._output[0]
+        self._output[0] = value
+        return changed
+
+    def processFanOut(self, changed=True):
+        """
+        Runs the blocks connected to the output of this block.
+        @param changed : whether the output changed, if it did not and this block is
+                         change only, the fan out is skipped.
+        """
+        if changed:
+            self._updateReaders()
+        elif self.__changeOnly:
+            self.__skipped += len(self.__fanOutList) + len(self.__regList)
+            return
+
         for i in self.__fanOutList:
             i.run()
-        for i in self.__regList:
-            i.runReg()
+        if self.__regList:
+            self.__clockDomain.edge()
 
 
 class HasOnlyOutputConnections(HasOutputConnections):
@@ -326,19 +531,41 @@ class HasRegisters(Block):
         self.regDelay = kwargs.get("register_delay", 0.01)
         super().__init__(**kwargs)
 
-    def __runReg(self):
+    def commit(self):
+        """
+        Loads the next state into the register, this is called by the ClockDomain of the
+        clock after the register delay.
+        """
+        self.__presentState = self.__nextState
+        self._scopeDump.record(f"PS of {self.getBlockID()}", self._env.now, self.__presentState)
+        self.run()
+
+    def runReg(self):
         """
         Registers run based on clock.
+        This commits only this register, the clock commits all of its registers together
+        through its ClockDomain.
         """
         if (not (bool(self._clkVal[0]) ^ self.__posEdge)):
             if self.__presentState != self.__nextState:
-                yield self._env.timeout(self.regDelay)
-                self.__presentState = self.__nextState
-                self._scopeDump.add(f"PS of {self.getBlockID()}", self._env.now, self.__presentState)
-                self.run()
+                self._callAfter(self.regDelay, self.commit)
 
-    def runReg(self):
-        self._env.process(self.__runReg())
+    def getState(self):
+        """
+        @return dict : the state of this block, with its present and next state.
+        """
+        state = super().getState()
+        state["ps"] = self.__presentState
+        state["ns"] = self.__nextState
+        return state
+
+    def setState(self, state: dict):
+        """
+        Loads a state given by getState.
+        """
+        super().setState(state)
+        self.__presentState = state["ps"]
+        self.__nextState = state["ns"]
 
     def getNS(self):
         return self.__nextState
@@ -349,6 +576,21 @@ class HasRegisters(Block):
     def setNS(self, val):
         self.__nextState = val
 
+    def setPS(self, val):
+        self.__presentState = val
+
+    def isPosEdge(self):
+        """
+        @return bool : True if the registers are updated on the rising edge, False otherwise.
+        """
+        return self.__posEdge
+
+    def getClock(self):
+        """
+        @return HasOutputConnections : the block that clocks the registers.
+        """
+        return self._clkObj
+
     def clock(self):
         """
         Connects the next clock object to the Register
@@ -370,6 +612,12 @@ class HasRegisters(Block):
         dic.update(self._scopeDump.getValues())
         return dic
 
+    def getScopeDumps(self):
+        """
+        @return list : the scope dumps of the clock and of this block.
+        """
+        return self._clkObj.getScopeDumps() + [self._scopeDump]
+
 
 if __name__ == "__main__":
 
@@ -0,0 +1,198 @@
+"""
+This file contains the checkpoints written by pydig.checkpoint(path) and loaded by pydig.restore(path).
+
+A checkpoint holds everything needed to continue a simulation of the event engine
+on the NativeKernel:
+
+    the current time and the events waiting to run. Every event is a method of a block,
+    of the ClockDomain of a block or of the DeltaScheduler with plain arguments, so it is
+    saved as (owner, name of the method, arguments),
+    the state of every block (see Block.getState: the outputs and packed
+    inputs, the present and next states, the cursor of the inputs, the registers waiting
+    for their delay, ...) and the state of the DeltaScheduler,
+    optionally, the samples recorded so far.
+
+The functions of the blocks are not saved, so a checkpoint is restored into a pydig
+object built by the same code as the one that was saved. The blocks are matched in
+the order they were added to the pydig object (the IDs of the building blocks depend
+on how many were created before, the labels of the saved samples are renamed to the
+current IDs) and their types must match. The file is written
+with pickle, only restore checkpoints you trust.
+
+The snapshots kept by pydig.keepSnapshots(interval) hold the same state in memory,
+with the events as they are and the number of samples of every signal instead of the
+samples, so that a re-simulation can go back to them and drop the samples recorded after.
+
+@author Abhirath, Aryan, Gathik
+@date 17/10/2026
+@version 1.0
+"""
+
+import pickle
+from utilities import printErrorAndExit
+from blocks import HasOutputConnections
+
+FORMAT = "pydig checkpoint 1"
+
+
+def _methodName(callback):
+    """
+    @return str : the name of the attribute of a bound method (private methods are name mangled).
+    """
+
+    name = callback.__func__.__name__
+    if name.startswith("__") and not name.endswith("__"):
+        owner = callback.__func__.__qualname__.split(".")[-2]
+        name = f"_{owner.lstrip('_')}{name}"
+    return name
+
+
+def _renameSignals(columns: dict, oldID: str, newID: str):
+    """
+    @return dict : the samples of a block with the ID it had when it was saved replaced by its
+                   current ID in the labels (the building blocks number their IDs when they are built).
+    """
+
+    if oldID == newID:
+        return columns
+    return {label.replace(oldID, newID): x for label, x in columns.items()}
+
+
+def _loadStates(components: list, states: list, deltaScheduler, deltaState):
+    """
+    Loads the states given by getState into the blocks and the DeltaScheduler.
+    """
+
+    for block, state in zip(components, states):
+        block.setState(state)
+    if deltaScheduler is not None:
+        deltaScheduler.setState(deltaState)
+
+
+def writeCheckpoint(path: str, components: list, kernel, deltaScheduler, ticksPerUnit, samples: bool):
+    """
+    Saves a running simulation.
+    @param path : the path of the checkpoint file.
+    @param components : the blocks of the pydig object.
+    @param kernel : the NativeKernel of the pydig object.
+    @param deltaScheduler : the DeltaScheduler of the pydig object, None without delta cycles.
+    @param ticksPerUnit : the integer timebase of the pydig object, None without one.
+    @param samples : if True, the samples recorded so far are saved too.
+    @return : None
+    """
+
+    owners = {}
+    for index, block in enumerate(components):
+        owners[id(block)] = ("block", index)
+        if isinstance(block, HasOutputConnections):
+            owners[id(block.getClockDomain())] = ("clockDomain", index)
+    if deltaScheduler is not None:
+        owners[id(deltaScheduler)] = ("deltaScheduler", None)
+
+    events = []
+    for time, callback, args in kernel.getEvents():
+        owner = owners.get(id(getattr(callback, "__self__", None)))
+        if owner is None:
+            printErrorAndExit(f"The event {callback} does not belong to a block of this simulation, it cannot be saved.")
+        events.append((time, owner, _methodName(callback), args))
+
+    checkpoint = {
+        "format": FORMAT,
+        "now": kernel.now,
+        "ticksPerUnit": ticksPerUnit,
+        "types": [type(x).__name__ for x in components],
+        "blockIDs": [x.getBlockID() for x in components],
+        "states": [x.getState() for x in components],
+        "deltaScheduler": None if deltaScheduler is None else deltaScheduler.getState(),
+        "events": events,
+        "samples": [x._scopeDump.getState() for x in components] if samples else None,
+    }
+
+    with open(path, "wb") as file:
+        pickle.dump(checkpoint, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def readCheckpoint(path: str, components: list, kernel, deltaScheduler, ticksPerUnit):
+    """
+    Loads a checkpoint into the blocks and the kernel of a pydig object built like the one that was saved.
+    @param path : the path of the checkpoint file.
+    @param components : the blocks of the pydig object.
+    @param kernel : the NativeKernel of the pydig object.
+    @param deltaScheduler : the (compiled) DeltaScheduler of the pydig object, None without delta cycles.
+    @param ticksPerUnit : the integer timebase of the pydig object, None without one.
+    @return : the time of the checkpoint.
+    """
+
+    try:
+        with open(path, "rb") as file:
+            checkpoint = pickle.load(file)
+    except OSError as error:
+        printErrorAndExit(f"The checkpoint {path} cannot be read ({error}).")
+    except (pickle.UnpicklingError, EOFError, ValueError, TypeError):
+        checkpoint = None
+    if not isinstance(checkpoint, dict) or checkpoint.get("format") != FORMAT:
+        printErrorAndExit(f"{path} is not a pydig checkpoint.")
+
+    types = [type(x).__name__ for x in components]
+    if types != checkpoint["types"]:
+        printErrorAndExit(f"The checkpoint {path} was not saved from this circuit: it has the blocks {checkpoint['types']}.")
+    if ticksPerUnit != checkpoint["ticksPerUnit"]:
+        printErrorAndExit(f"The checkpoint {path} was saved with {checkpoint['ticksPerUnit']} ticks per time unit, not {ticksPerUnit}.")
+    if (deltaScheduler is None) != (checkpoint["deltaScheduler"] is None):
+        printErrorAndExit(f"The checkpoint {path} was saved {'without' if deltaScheduler is not None else 'with'} delta cycles.")
+
+    _loadStates(components, checkpoint["states"], deltaScheduler, checkpoint["deltaScheduler"])
+
+    # without the samples, the waveforms start at the time of the checkpoint
+    samples = checkpoint["samples"] or [{}] * len(components)
+    for block, blockID, columns in zip(components, checkpoint["blockIDs"], samples):
+        block._scopeDump.setState(_renameSignals(columns, blockID, block.getBlockID()))
+
+    events = []
+    for time, (kind, index), name, args in checkpoint["events"]:
+        if kind == "block":
+            owner = components[index]
+        elif kind == "clockDomain":
+            owner = components[index].getClockDomain()
+        else:
+            owner = deltaScheduler
+        events.append((time, getattr(owner, name), args))
+
+    kernel.restore(checkpoint["now"], events)
+    return checkpoint["now"]
+
+
+def takeSnapshot(components: list, kernel, deltaScheduler):
+    """
+    Saves a running simulation in memory, used by pydig.keepSnapshots to re-simulate from
+    the middle of a run. The events are kept as they are and only the number of samples of
+    every signal is saved: the samples recorded before the snapshot are never changed.
+    @param components : the blocks of the pydig object.
+    @param kernel : the NativeKernel of the pydig object.
+    @param deltaScheduler : the DeltaScheduler of the pydig object, None without delta cycles.
+    @return dict : the snapshot.
+    """
+
+    return {
+        "now": kernel.now,
+        "states": [x.getState() for x in components],
+        "deltaScheduler": None if deltaScheduler is None else deltaScheduler.getState(),
+        "events": kernel.getEvents(),
+        "sampleCounts": [x._scopeDump.getSampleCounts() for x in components],
+    }
+
+
+def loadSnapshot(snapshot: dict, components: list, kernel, deltaScheduler):
+    """
+    Brings a simulation back to a snapshot given by takeSnapshot, the samples recorded after it are dropped.
+    @param snapshot : the snapshot.
+    @param components : the blocks of the pydig object the snapshot was taken from.
+    @param kernel : the NativeKernel of the pydig object.
+    @param deltaScheduler : the DeltaScheduler of the pydig object, None without delta cycles.
+    @return : None
+    """
+
+    _loadStates(components, snapshot["states"], deltaScheduler, snapshot["deltaScheduler"])
+    for block, counts in zip(components, snapshot["sampleCounts"]):
+        block._scopeDump.truncate(counts)
+    kernel.restore(snapshot["now"], snapshot["events"])
@@ -0,0 +1,197 @@
+"""
+This file contains the ChromeTracer used by pydig.dumpChromeTrace(path).
+
+It writes what the blocks do during a run in the trace event format of Chrome (the JSON
+array format), which chrome://tracing and Perfetto (ui.perfetto.dev) open:
+
+    slices (ph "X") for every run of a block by its fan in, every processFanOut (the blocks
+    it runs are nested inside it) and every call of nsl, ol or func, with the block ID and the
+    simulated time in their arguments and the wall time they took as their duration,
+    instant events (ph "i") for every change of a clock,
+    a counter (ph "C") with the depth of the event queue: its largest depth in every
+    counterInterval microseconds of wall time.
+
+The events are kept in a buffer of chunkSize events that is appended to the file when it is
+full, so the trace of a long run is never held in memory. The file is closed by "]" at the end
+of every run and reopened by the next one, like the viewers it can also be read unclosed (after
+a crash). The methods are set on the blocks only while the run is traced (see BlockPatches).
+
+@author Abhirath, Aryan, Gathik
+@date 17/10/2026
+@version 1.0
+"""
+
+import json
+from time import perf_counter_ns
+from profiler import BlockPatches, GETTERS
+from usableBlocks import Clock
+from utilities import printErrorAndExit
+
+# the names of the functions of the blocks in the trace
+_KINDS = {"getNSL": "nsl", "getOL": "ol", "getFunc": "func"}
+
+
+class ChromeTracer:
+    """
+    Streams the activity of the blocks to a Chrome trace file.
+    """
+
+    def __init__(self, path: str, name: str, chunkSize=4096, counterInterval=100, ticksPerUnit=None):
+        """
+        @param path : the path of the trace file.
+        @param name : the name of the simulation, the name of the process in the viewer.
+        @param chunkSize : the number of events written to the file at once.
+        @param counterInterval : the wall time between two values of the queue depth counter, in microseconds.
+        @param ticksPerUnit : the ticks of a time unit with an integer timebase, None otherwise.
+        """
+
+        self.__path = path
+        self.__name = name
+        self.__chunkSize = chunkSize
+        self.__counterInterval = counterInterval * 1000
+        self.__unit = ticksPerUnit or 1
+        self.__file = None
+        self.__buffer = []
+        self.__written = 0
+        # the byte offset of the closing "]" of the file, where the next run continues
+        self.__end = None
+        self.__origin = None
+        self.__patches = BlockPatches()
+
+    def open(self):
+        """
+        Opens the file, or reopens it after the "]" of the run before.
+        """
+
+        # binary, so the offsets are bytes and no newline is translated
+        try:
+            if self.__end is not None:
+                self.__file = open(self.__path, "r+b")
+                self.__file.seek(self.__end)
+                self.__file.truncate()
+            else:
+                self.__file = open(self.__path, "wb")
+                self.__file.write(b"[\n")
+        except OSError as error:
+            printErrorAndExit(f"The trace file {self.__path} cannot be written ({error}).")
+
+        if self.__origin is None:
+            self.__origin = perf_counter_ns()
+            self.__buffer.append(json.dumps({"name": "process_name", "ph": "M", "pid": 1, "args": {"name": f"pydig {self.__name}"}}))
+            self.__buffer.append(json.dumps({"name": "thread_name", "ph": "M", "pid": 1, "tid": 1, "args": {"name": "blocks"}}))
+
+    def start(self, components: list, env):
+        """
+        Opens the file and sets the tracing methods on the blocks.
+        @param components : the blocks of the pydig object.
+        @param env : the simpy environment or the NativeKernel the blocks run on.
+        """
+
+        self.open()
+        if hasattr(env, "getQueueLength"):
+            queueLength = env.getQueueLength
+        else:
+            # simpy keeps its events in a list
+            queueLength = lambda: len(env._queue)
+        # the largest depth since the last value of the counter and the wall time of that value
+        counter = [0, perf_counter_ns()]
+
+        for block in components:
+            self.__patches.set(block, "run", self.__slice(block.run, "run", block, env))
+            if hasattr(block, "processFanOut"):
+                self.__patches.set(block, "processFanOut", self.__fanOut(block, env))
+            self.__patches.set(block, "_callAfter", self.__scheduled(block._callAfter, queueLength, counter))
+            for getter in GETTERS:
+                if hasattr(block, getter):
+                    traced = self.__slice(getattr(block, getter)(), _KINDS[getter], block, env)
+                    self.__patches.set(block, getter, lambda traced=traced: traced)
+
+    def stop(self):
+        """
+        Removes the tracing methods from the blocks and closes the file.
+        """
+
+        self.__patches.restore()
+        self.__flush()
+        self.__end = self.__file.tell()
+        self.__file.write(b"\n]\n")
+        self.__file.close()
+        self.__file = None
+
+    def __flush(self):
+        """
+        Appends the buffered events to the file.
+        """
+
+        if self.__buffer:
+            self.__file.write(((",\n" if self.__written else "") + ",\n".join(self.__buffer)).encode())
+            self.__written += len(self.__buffer)
+            self.__buffer = []
+
+    def __add(self, event):
+        self.__buffer.append(event)
+        if len(self.__buffer) >= self.__chunkSize:
+            self.__flush()
+
+    def __slice(self, function, kind, block, env):
+        """
+        @return function : function, adding a slice named "<kind> <block ID>" for every call.
+        """
+
+        origin = self.__origin
+        unit = self.__unit
+        add = self.__add
+        blockID = json.dumps(str(block.getBlockID()))
+        name = json.dumps(f"{kind} {block.getBlockID()}")
+
+        def traced(*args):
+            start = perf_counter_ns()
+            value = function(*args)
+            end = perf_counter_ns()
+            add(f'{{"name":{name},"cat":"{kind}","ph":"X","ts":{(start - origin) / 1000:.3f},"dur":{(end - start) / 1000:.3f},'
+                f'"pid":1,"tid":1,"args":{{"block":{blockID},"t":{env.now / unit}}}}}')
+            return value
+        return traced
+
+    def __fanOut(self, block, env):
+        """
+        @return function : processFanOut of the block, with an instant event first if the block is a clock.
+        """
+
+        traced = self.__slice(block.processFanOut, "fanOut", block, env)
+        if not isinstance(block, Clock):
+            return traced
+
+        origin = self.__origin
+        unit = self.__unit
+        add = self.__add
+        output = block._output
+        blockID = json.dumps(str(block.getBlockID()))
+
+        def edge(changed=True):
+            add(f'{{"name":"{"rising" if output[0] else "falling"} edge","cat":"clock","ph":"i","s":"p","ts":{(perf_counter_ns() - origin) / 1000:.3f},'
+                f'"pid":1,"tid":1,"args":{{"block":{blockID},"t":{env.now / unit}}}}}')
+            traced(changed)
+        return edge
+
+    def __scheduled(self, callAfter, queueLength, counter):
+        """
+        @return function : _callAfter of a block, adding a value to the queue depth counter at most
+                           once every counterInterval.
+        """
+
+        origin = self.__origin
+        interval = self.__counterInterval
+        add = self.__add
+
+        def scheduled(delay, callback, *args):
+            callAfter(delay, callback, *args)
+            depth = queueLength()
+            if depth > counter[0]:
+                counter[0] = depth
+            now = perf_counter_ns()
+            if now - counter[1] >= interval:
+                add(f'{{"name":"event queue","ph":"C","ts":{(now - origin) / 1000:.3f},"pid":1,"args":{{"depth":{counter[0]}}}}}')
+                counter[0] = 0
+                counter[1] = now
+        return scheduled
@@ -0,0 +1,107 @@
+"""
+This file contains the ClockDomain, which owns all the registers clocked by one block.
+
+Every time the clock changes, the domain finds the registers that see their active
+edge and whose next state differs from their present state. They are committed
+together in a single event after their register delay (one event per distinct
+register delay) instead of one event per register. Only the registers whose
+state actually changes are loaded and run again.
+
+@author Abhirath, Aryan, Gathik
+@date 17/10/2026
+@version 1.0
+"""
+
+
+class ClockDomain:
+    """
+    Commits the registers of one clock in batches.
+    """
+
+    def __init__(self, clock):
+        """
+        @param clock : the HasOutputConnections block that clocks the registers.
+        """
+
+        self.__clock = clock
+        self.__registers = []
+        self.__pending = {}
+        self.__commits = 0
+        self.__batches = 0
+
+    def add(self, register):
+        """
+        Adds a register to this domain.
+        @param register : a HasRegisters block clocked by the clock of this domain.
+        """
+        self.__registers.append(register)
+
+    def getRegisters(self):
+        """
+        @return list : the registers of this domain, in the order they were added.
+        """
+        return list(self.__registers)
+
+    def edge(self):
+        """
+        Called every time the clock changes. Schedules the commit of every register
+        that sees its active edge and has a new next state.
+        """
+
+        level = bool(self.__clock._output[0])
+        batches = {}
+        for register in self.__registers:
+            if level == register.isPosEdge() and register.getPS() != register.getNS():
+                batches.setdefault(register.regDelay, []).append(register)
+
+        for delay, registers in batches.items():
+            self.__pending.setdefault(delay, []).append(registers)
+            self.__clock._callAfter(delay, self.__commit, delay)
+
+    def __commit(self, delay):
+        """
+        Loads the next state of the oldest batch scheduled with this delay.
+        """
+
+        registers = self.__pending[delay].pop(0)
+        self.__batches += 1
+        for register in registers:
+            if register.getPS() != register.getNS():
+                self.__commits += 1
+                register.commit()
+
+    def getPending(self):
+        """
+        @return dict : the batches waiting for their register delay, by delay.
+        """
+        return {delay: [list(x) for x in batches] for delay, batches in self.__pending.items() if batches}
+
+    def getState(self):
+        """
+        @return dict : the batches waiting for their register delay and the counters. The registers are
+                       given by their index in this domain, their block IDs may differ in another build.
+        """
+        index = {id(x): i for i, x in enumerate(self.__registers)}
+        pending = {delay: [[index[id(x)] for x in batch] for batch in batches] for delay, batches in self.__pending.items() if batches}
+        return {"pending": pending, "commits": self.__commits, "batches": self.__batches}
+
+    def setState(self, state: dict):
+        """
+        Loads a state given by getState.
+        """
+        registers = self.__registers
+        self.__pending = {delay: [[registers[x] for x in batch] for batch in batches] for delay, batches in state["pending"].items()}
+        self.__commits = state["commits"]
+        self.__batches = state["batches"]
+
+    def getCommitCount(self):
+        """
+        @return int : the number of registers committed so far.
+        """
+        return self.__commits
+
+    def getBatchCount(self):
+        """
+        @return int : the number of batches committed so far.
+        """
+        return self.__batches
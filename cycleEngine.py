@@ -0,0 +1,408 @@
+"""
+This file contains the cycle based simulation engine.
+It is used by pydig.run(until, engine="cycle") instead of the simpy environment.
+
+The engine compiles the blocks of a pydig object once:
+
+    Clock, Input and MooreMachine outputs are the sources of the circuit.
+    Combinational blocks and the output logic of MealyMachines are levelized
+    (sorted topologically) so that each of them only depends on blocks before it.
+    The registers of each machine are grouped by the clock that drives them.
+
+Every time a clock toggles or an input changes, the registers that see their active
+edge are committed together and the affected logic is evaluated in one ordered sweep.
+The delays of the blocks are not modelled; the engine gives the same register and
+output values per clock as the event engine, at the instant of the edge.
+
+With steadyState=True, once every input change has been applied, the state of the
+circuit is hashed at every toggle of the first clock. When a state repeats, the
+circuit is periodic from then on: the waveforms of one period are copied up to
+until instead of being simulated, and the start and period of the cycle are reported.
+
+@author Abhirath, Aryan, Gathik
+@date 17/10/2026
+@version 1.0
+"""
+
+import heapq
+from utilities import printErrorAndExit
+from usableBlocks import MooreMachine, MealyMachine, Combinational, Clock, Input, Output
+
+
+def levelize(logic: list, engine: str):
+    """
+    Sorts combinational logic topologically (Kahn's algorithm).
+    A combinational loop cannot be levelized, so an error is generated for it.
+    @param logic : the combinational blocks (and Mealy machines) to sort.
+    @param engine : the name of the engine, for the error message.
+    @return list : the blocks, each one after all the blocks that drive it.
+    """
+
+    logicIDs = set(id(x) for x in logic)
+    pending = {}
+    users = {id(x): [] for x in logic}
+
+    for block in logic:
+        drivers = [x for x in block.getDrivers() if id(x) in logicIDs]
+        pending[id(block)] = len(drivers)
+        for driver in drivers:
+            users[id(driver)].append(block)
+
+    order = [x for x in logic if pending[id(x)] == 0]
+    i = 0
+    while i < len(order):
+        for user in users[id(order[i])]:
+            pending[id(user)] -= 1
+            if pending[id(user)] == 0:
+                order.append(user)
+        i += 1
+
+    if len(order) != len(logic):
+        loop = [str(x) for x in logic if pending[id(x)] > 0]
+        printErrorAndExit(f"The {engine} cannot levelize the combinational loop through {', '.join(loop)}.")
+
+    return order
+
+
+class CycleEngine:
+    """
+    Simulates the blocks of a pydig object one clock edge at a time.
+    """
+
+    def __init__(self, components: list, steadyState=False):
+        """
+        Compiles the block graph.
+        @param components : the blocks of the pydig object (they must all be connected).
+        @param steadyState : if True, a periodic steady state is detected and fast forwarded.
+        """
+
+        self.__clocks = []
+        self.__inputs = []
+        self.__machines = []
+        self.__outputs = []
+        self.__logic = []
+
+        for block in components:
+            if isinstance(block, Clock):
+                self.__clocks.append(block)
+            elif isinstance(block, Input):
+                self.__inputs.append(block)
+            elif isinstance(block, MooreMachine):
+                self.__machines.append(block)
+            elif isinstance(block, MealyMachine):
+                self.__machines.append(block)
+                self.__logic.append(block)
+            elif isinstance(block, Combinational):
+                self.__logic.append(block)
+            elif isinstance(block, Output):
+                self.__outputs.append(block)
+            else:
+                printErrorAndExit(f"{block} cannot be simulated by the cycle engine.")
+
+        for machine in self.__machines:
+            if not isinstance(machine.getClock(), Clock):
+                printErrorAndExit(f"{machine} must be clocked by a Clock block to use the cycle engine.")
+
+        self.__levelize()
+        self.__buildFanOut()
+
+        self.__time = 0
+        self.__started = False
+        self.__events = []
+        self.__sequence = 0
+        self.__cycles = 0
+        self.__detect = steadyState
+        self.__seen = {}
+        self.__pendingInputs = 0
+        self.__steadyState = None
+
+    def __levelize(self):
+        """
+        Sorts the combinational logic topologically.
+        """
+
+        self.__logic = levelize(self.__logic, "cycle engine")
+        self.__rank = {id(x): i for i, x in enumerate(self.__logic)}
+
+    def __buildFanOut(self):
+        """
+        For every block, finds the logic, machines and outputs that read its output.
+        """
+
+        machineIndex = {id(x): i for i, x in enumerate(self.__machines)}
+        outputIndex = {id(x): i for i, x in enumerate(self.__outputs)}
+        self.__fanOut = {}
+
+        for reader in self.__logic + self.__machines + self.__outputs:
+            for driver in reader.getDrivers():
+                ranks, machines, outputs = self.__fanOut.setdefault(id(driver), ([], [], []))
+                if id(reader) in machineIndex:
+                    machines.append(machineIndex[id(reader)])
+                    if id(reader) in self.__rank:
+                        ranks.append(self.__rank[id(reader)])
+                elif id(reader) in self.__rank:
+                    ranks.append(self.__rank[id(reader)])
+                else:
+                    outputs.append(outputIndex[id(reader)])
+
+        # every Mealy machine appears once for its output logic and once for its NSL
+        for ranks, machines, outputs in self.__fanOut.values():
+            ranks[:] = sorted(set(ranks))
+            machines[:] = sorted(set(machines))
+            outputs[:] = sorted(set(outputs))
+
+        self.__edges = {id(x): [] for x in self.__clocks}
+        for i, machine in enumerate(self.__machines):
+            self.__edges[id(machine.getClock())].append(i)
+
+    def __push(self, time, kind, index, value=None):
+        """
+        Adds a clock toggle or an input change to the event queue.
+        """
+
+        heapq.heappush(self.__events, (time, self.__sequence, kind, index, value))
+        self.__sequence += 1
+
+    def __start(self):
+        """
+        Evaluates every block at time 0 and schedules the first clock toggles and input changes.
+        """
+
+        self.__started = True
+        self.__dirtyLogic = list(range(len(self.__logic)))
+        self.__dirtyMachines = set(range(len(self.__machines)))
+        self.__dirtyOutputs = set(range(len(self.__outputs)))
+        self.__lastInput = [None] * len(self.__machines)
+        self.__lastOutput = [None] * len(self.__outputs)
+
+        for machine in self.__machines:
+            if isinstance(machine, MooreMachine):
+                self.__setOutput(machine, machine.getOL()(machine.getPS()), f"output of {machine.getBlockID()}", True)
+
+        for i, clock in enumerate(self.__clocks):
+            self.__push(self.__nextToggle(clock, 0), 0, i)
+
+        for i, source in enumerate(self.__inputs):
+            for time, value in source.getInputList():
+                self.__push(time, 1, i, value)
+                self.__pendingInputs += 1
+
+        self.__settle(True)
+
+    @staticmethod
+    def __nextToggle(clock, now):
+        """
+        @return float : the time at which the clock toggles next.
+        """
+
+        if clock._output[0]:
+            return now + clock.getOnTime()
+        return now + (clock.getTimePeriod() - clock.getOnTime())
+
+    def __setOutput(self, block, value, label, force=False):
+        """
+        Changes the output of a block and marks its readers.
+        @return bool : True if the output changed.
+        """
+
+        if value == block._output[0] and not force:
+            return False
+
+        block._output[0] = value
+        block._updateReaders()
+        block._scopeDump.record(label, self.__time, value)
+        self.__markReaders(block)
+        return True
+
+    def __markReaders(self, block):
+        """
+        Marks all the blocks that read the output of block for evaluation.
+        """
+
+        readers = self.__fanOut.get(id(block))
+        if readers is None:
+            return
+
+        for rank in readers[0]:
+            heapq.heappush(self.__dirtyLogic, rank)
+        self.__dirtyMachines.update(readers[1])
+        self.__dirtyOutputs.update(readers[2])
+
+    def __settle(self, force=False):
+        """
+        Evaluates the logic, the next state logic and the outputs that are affected
+        by the changes at the current time.
+        @param force : records every value even if it did not change (used at time 0).
+        """
+
+        logic = self.__logic
+        dirty = self.__dirtyLogic
+        heapq.heapify(dirty)
+        last = -1
+
+        while dirty:
+            rank = heapq.heappop(dirty)
+            if rank == last:
+                continue
+            last = rank
+
+            block = logic[rank]
+            if isinstance(block, MealyMachine):
+                self.__setOutput(block, block.getOL()(block.getPS(), block.getInputVal()), f"output of {block.getBlockID()}", force)
+            else:
+                self.__setOutput(block, block.getFunc()(block.getInputVal()), f"{block.getBlockID()} output", force)
+
+        for i in sorted(self.__dirtyMachines):
+            machine = self.__machines[i]
+            value = machine.getInputVal()
+            if force or value != self.__lastInput[i]:
+                self.__lastInput[i] = value
+                machine._scopeDump.record(f"Input to {machine.getBlockID()}", self.__time, value)
+
+            ns = machine.getNSL()(machine.getPS(), value)
+            if force or ns != machine.getNS():
+                machine.setNS(ns)
+                machine._scopeDump.record(f"NS of {machine.getBlockID()}", self.__time, ns)
+        self.__dirtyMachines.clear()
+
+        for i in sorted(self.__dirtyOutputs):
+            output = self.__outputs[i]
+            value = output.getInputVal()
+            if force or value != self.__lastOutput[i]:
+                self.__lastOutput[i] = value
+                output._scopeDump.record(f"Final Output from {output.getBlockID()}", self.__time, value)
+        self.__dirtyOutputs.clear()
+
+    def __toggle(self, index):
+        """
+        Toggles a clock and commits the registers that see their active edge.
+        @return list : the machines whose present state changed.
+        """
+
+        clock = self.__clocks[index]
+        self.__setOutput(clock, 1 - clock._output[0], f"Clock {clock.getBlockID()}", True)
+        self.__push(self.__nextToggle(clock, self.__time), 0, index)
+
+        level = bool(clock._output[0])
+        changed = []
+        for i in self.__edges[id(clock)]:
+            machine = self.__machines[i]
+            if level == machine.isPosEdge() and machine.getPS() != machine.getNS():
+                changed.append(i)
+        return changed
+
+    def run(self, until):
+        """
+        Runs the simulation up to (but not including) until.
+        @param until : the time up to which the simulation runs.
+        @return : None
+        """
+
+        if not self.__started:
+            self.__start()
+
+        events = self.__events
+        while events and events[0][0] < until:
+            self.__time = events[0][0]
+            edges = []
+            reference = False
+
+            while events and events[0][0] == self.__time:
+                _, _, kind, index, value = heapq.heappop(events)
+                if kind == 0:
+                    edges.extend(self.__toggle(index))
+                    self.__cycles += 1
+                    reference = reference or index == 0
+                else:
+                    source = self.__inputs[index]
+                    self.__setOutput(source, value, f"Input to {source.getBlockID()}", True)
+                    self.__pendingInputs -= 1
+
+            # all registers of an edge are committed together with the next state computed before it
+            for i in edges:
+                machine = self.__machines[i]
+                machine.setPS(machine.getNS())
+                machine._scopeDump.record(f"PS of {machine.getBlockID()}", self.__time, machine.getPS())
+                self.__dirtyMachines.add(i)
+                if isinstance(machine, MooreMachine):
+                    self.__setOutput(machine, machine.getOL()(machine.getPS()), f"output of {machine.getBlockID()}")
+                else:
+                    heapq.heappush(self.__dirtyLogic, self.__rank[id(machine)])
+
+            self.__settle()
+
+            if self.__detect and reference and self.__pendingInputs == 0:
+                self.__detectSteadyState(until)
+            events = self.__events
+
+        self.__time = until
+
+    def __snapshot(self):
+        """
+        @return tuple : the complete state of the circuit relative to the current time. The states are
+                        compared whole, two different states with the same hash are not a cycle.
+        """
+
+        state = [x._output[0] for x in self.__clocks + self.__inputs + self.__machines + self.__logic]
+        state += [(x.getPS(), x.getNS()) for x in self.__machines]
+        state += self.__lastInput + self.__lastOutput
+        state += sorted((round(t - self.__time, 9), kind, index) for t, _, kind, index, _ in self.__events)
+        return tuple(state)
+
+    def __detectSteadyState(self, until):
+        """
+        Remembers the state at this toggle of the first clock. If it was seen before,
+        the waveforms of the cycle are repeated for as many whole periods as fit before until.
+        """
+
+        state = self.__snapshot()
+        if state not in self.__seen:
+            self.__seen[state] = (self.__time, self.__cycles)
+            return
+
+        start, startCycles = self.__seen[state]
+        period = self.__time - start
+        self.__detect = False
+        self.__seen = {}
+
+        repeats = int((until - self.__time) // period)
+        while repeats > 0 and self.__time + repeats * period >= until:
+            repeats -= 1
+        self.__steadyState = {"start": start, "period": period, "repeats": max(repeats, 0)}
+        if repeats <= 0:
+            return
+
+        # the samples of the cycle are copied in time order, as a listener of the dumps expects them
+        window = []
+        blocks = self.__clocks + self.__inputs + self.__machines + self.__logic + self.__outputs
+        for block in blocks:
+            for label in block._scopeDump.getLabels():
+                times, intTimes, values = block._scopeDump.getColumns(label)
+                first = len(times)
+                while first > 0 and times[first - 1] > start:
+                    first -= 1
+                window += [(int(times[i]) if intTimes[i] else times[i], block, label, values[i]) for i in range(first, len(times))]
+        window.sort(key=lambda x: x[0])
+
+        for k in range(1, repeats + 1):
+            for time, block, label, value in window:
+                block._scopeDump.record(label, time + k * period, value)
+
+        shift = repeats * period
+        self.__events = [(t + shift, sequence, kind, index, value) for t, sequence, kind, index, value in self.__events]
+        heapq.heapify(self.__events)
+        self.__cycles += repeats * (self.__cycles - startCycles)
+        self.__time += shift
+
+    def getSteadyState(self):
+        """
+        @return dict : the start time, the period and the number of periods that were fast
+                       forwarded, or None if no steady state was found.
+        """
+        return self.__steadyState
+
+    def getCycleCount(self):
+        """
+        @return int : the number of clock toggles simulated so far.
+        """
+        return self.__cycles
@@ -0,0 +1,181 @@
+"""
+This file contains the delta cycle scheduler for zero delay combinational blocks.
+It is used when the simulator is created with pydig(deltaCycles=True).
+
+Without it, every input change of a Combinational block with delay = 0 schedules its own
+zero time evaluation, so a block whose inputs change several times at the same time is
+evaluated once for every change. With it, the zero delay blocks only mark themselves as
+pending; all the pending blocks of a time are then evaluated once each, in topological
+order, and only the blocks whose output actually changed propagate to their fan out.
+
+A zero delay loop is evaluated again in the next delta cycle. If it has not settled after
+maxDeltaCycles delta cycles at the same time, the loop is reported instead of spinning.
+
+@author Abhirath, Aryan, Gathik
+@date 17/10/2026
+@version 1.0
+"""
+
+from heapq import heappush, heappop
+from utilities import printErrorAndExit
+
+
+class DeltaScheduler:
+    """
+    Collects the zero delay combinational evaluations of a time and runs them in topological order.
+    """
+
+    def __init__(self, maxDeltaCycles=1000):
+        """
+        @param maxDeltaCycles : the number of delta cycles after which a zero delay loop is reported.
+        """
+
+        self.__maxDeltaCycles = maxDeltaCycles
+        self.__rank = {}
+        self.__blocks = []
+        self.__current = []
+        self.__next = []
+        self.__inCurrent = set()
+        self.__inNext = set()
+        self.__flushing = False
+        self.__scheduled = False
+        self.__rankNow = -1
+        self.__evaluations = 0
+
+    def compile(self, blocks: list):
+        """
+        Orders the zero delay blocks topologically. The blocks of a loop are kept together
+        (strongly connected components, Tarjan's algorithm) in the order they were created.
+        @param blocks : the Combinational blocks with delay = 0.
+        """
+
+        ids = {id(x): x for x in blocks}
+        index = {}
+        low = {}
+        stack = []
+        onStack = set()
+        components = []
+
+        # iterative Tarjan so that long chains do not hit the recursion limit
+        for root in blocks:
+            if id(root) in index:
+                continue
+
+            work = [(root, iter([x for x in root.getDrivers() if id(x) in ids]))]
+            index[id(root)] = low[id(root)] = len(index)
+            stack.append(root)
+            onStack.add(id(root))
+
+            while work:
+                block, drivers = work[-1]
+                advanced = False
+
+                for driver in drivers:
+                    if id(driver) not in index:
+                        index[id(driver)] = low[id(driver)] = len(index)
+                        stack.append(driver)
+                        onStack.add(id(driver))
+                        work.append((driver, iter([x for x in driver.getDrivers() if id(x) in ids])))
+                        advanced = True
+                        break
+                    elif id(driver) in onStack:
+                        low[id(block)] = min(low[id(block)], index[id(driver)])
+
+                if advanced:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[id(parent)] = min(low[id(parent)], low[id(block)])
+
+                if low[id(block)] == index[id(block)]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        onStack.discard(id(member))
+                        component.append(member)
+                        if member is block:
+                            break
+                    components.append(component)
+
+        # drivers are visited first, so the components are already in topological order
+        order = {id(x): i for i, x in enumerate(blocks)}
+        self.__blocks = []
+        for component in components:
+            self.__blocks.extend(sorted(component, key=lambda x: order[id(x)]))
+
+        self.__rank = {id(x): i for i, x in enumerate(self.__blocks)}
+
+        for block in self.__blocks:
+            block.setDeltaScheduler(self)
+
+    def schedule(self, block):
+        """
+        Marks a zero delay block for evaluation at the current time.
+        @param block : the Combinational block whose input changed.
+        """
+
+        rank = self.__rank[id(block)]
+
+        # a block at or before the one being evaluated closes a loop, so it waits for the next delta
+        if self.__flushing and rank <= self.__rankNow:
+            if rank not in self.__inNext:
+                self.__inNext.add(rank)
+                heappush(self.__next, rank)
+            return
+
+        if rank not in self.__inCurrent:
+            self.__inCurrent.add(rank)
+            heappush(self.__current, rank)
+
+        if not (self.__scheduled or self.__flushing):
+            self.__scheduled = True
+            block._callAfter(0, self.__flush)
+
+    def __flush(self):
+        """
+        Evaluates the pending blocks one delta cycle at a time until nothing changes.
+        """
+
+        self.__scheduled = False
+        self.__flushing = True
+        deltas = 0
+
+        while self.__current:
+            deltas += 1
+            if deltas > self.__maxDeltaCycles:
+                loop = ", ".join(str(self.__blocks[x]) for x in sorted(self.__inCurrent))
+                printErrorAndExit(f"The zero delay loop through {loop} did not settle after {self.__maxDeltaCycles} delta cycles.")
+
+            while self.__current:
+                self.__rankNow = heappop(self.__current)
+                self.__evaluations += 1
+                self.__blocks[self.__rankNow].evaluate()
+
+            self.__current, self.__next = self.__next, []
+            self.__inCurrent, self.__inNext = self.__inNext, set()
+            self.__rankNow = -1
+
+        self.__flushing = False
+
+    def getState(self):
+        """
+        @return dict : the blocks marked for evaluation (by rank) and whether a flush is scheduled.
+        """
+        return {"current": list(self.__current), "scheduled": self.__scheduled, "evaluations": self.__evaluations}
+
+    def setState(self, state: dict):
+        """
+        Loads a state given by getState, the blocks must have been compiled in the same order.
+        """
+        self.__current = list(state["current"])
+        self.__inCurrent = set(self.__current)
+        self.__scheduled = state["scheduled"]
+        self.__evaluations = state["evaluations"]
+
+    def getEvaluationCount(self):
+        """
+        @return int : the number of zero delay evaluations run so far.
+        """
+        return self.__evaluations
@@ -0,0 +1,136 @@
+"""
+This file contains the native event kernel that can be used instead of simpy.
+It is selected by creating the simulator with pydig(kernel="native").
+
+The kernel is a binary heap of (time, priority, sequence, callback, arguments) entries.
+Blocks register plain callbacks with call(), so no generator, process or event object
+is created for an evaluation. Events at the same time run in the order they were
+scheduled, exactly like simpy timeouts, so both kernels give the same simulation.
+
+process() and timeout() are kept so that blocks written for simpy, whose generators only
+yield timeouts, still run on this kernel.
+
+@author Abhirath, Aryan, Gathik
+@date 17/10/2026
+@version 1.0
+"""
+
+from heapq import heappush, heappop
+from utilities import printErrorAndExit
+
+URGENT = 0
+NORMAL = 1
+
+
+class NativeKernel:
+    """
+    A lightweight discrete event scheduler.
+    """
+
+    def __init__(self):
+        """
+        Creates an empty kernel at time 0.
+        """
+
+        self.now = 0
+        self.__queue = []
+        self.__sequence = 0
+        self.__events = 0
+
+    def call(self, delay, callback, *args):
+        """
+        Calls callback(*args) after delay time units.
+        @param delay : the time after which the callback runs (must not be negative).
+        @param callback : the function to call.
+        @param args : the arguments of the callback.
+        @return : None
+        """
+
+        if delay < 0:
+            printErrorAndExit(f"Negative delay {delay}.")
+
+        heappush(self.__queue, (self.now + delay, NORMAL, self.__sequence, callback, args))
+        self.__sequence += 1
+
+    def process(self, generator):
+        """
+        Runs a simpy style generator that only yields timeouts.
+        @param generator : the generator to run.
+        @return : None
+        """
+
+        heappush(self.__queue, (self.now, URGENT, self.__sequence, self.__step, (generator,)))
+        self.__sequence += 1
+
+    def timeout(self, delay):
+        """
+        @param delay : the time to wait.
+        @return : the delay, so that "yield env.timeout(delay)" works inside process().
+        """
+
+        return delay
+
+    def __step(self, generator):
+        """
+        Resumes a generator started by process() until its next timeout.
+        """
+
+        try:
+            delay = next(generator)
+        except StopIteration:
+            return
+
+        self.call(delay, self.__step, generator)
+
+    def run(self, until):
+        """
+        Runs all the events that happen before until.
+        @param until : the time up to which the simulation runs.
+        @return : None
+        """
+
+        queue = self.__queue
+        count = 0
+
+        while queue and queue[0][0] < until:
+            time, _, _, callback, args = heappop(queue)
+            self.now = time
+            callback(*args)
+            count += 1
+
+        self.__events += count
+        self.now = until
+
+    def getEvents(self):
+        """
+        @return list : the (time, callback, arguments) of the events waiting to run, in the order they will run.
+        """
+        for entry in self.__queue:
+            if entry[1] == URGENT:
+                printErrorAndExit(f"The process {entry[4][0]} cannot be saved, only callbacks can.")
+        return [(time, callback, args) for time, _, _, callback, args in sorted(self.__queue, key=lambda x: x[:3])]
+
+    def restore(self, now, events: list):
+        """
+        Replaces the events waiting to run.
+        @param now : the current time.
+        @param events : the (time, callback, arguments) of the events, in the order they must run.
+        """
+
+        self.now = now
+        self.__queue = []
+        for time, callback, args in events:
+            heappush(self.__queue, (time, NORMAL, self.__sequence, callback, args))
+            self.__sequence += 1
+
+    def getEventCount(self):
+        """
+        @return int : the number of events run so far.
+        """
+        return self.__events
+
+    def getQueueLength(self):
+        """
+        @return int : the number of events waiting to run.
+        """
+        return len(self.__queue)
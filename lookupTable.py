@@ -0,0 +1,135 @@
+"""
+This file contains the lookup tables used by blocks created with tabulate=True.
+
+A LookupTable wraps a pure function of one or two integers (the input of a
+combinational block, or the present state and the input of a machine).
+If the widths of all the arguments are known and small enough, the function is
+evaluated for every possible argument when the simulation starts and stored in
+a flat array, so an evaluation becomes an index into the array. Otherwise (or if
+the function cannot be evaluated on its whole domain) the results are memoized
+in a least recently used cache.
+
+The function must not have side effects, it is called once per argument.
+
+@author Abhirath, Aryan, Gathik
+@date 17/10/2026
+@version 1.0
+"""
+
+from array import array
+from collections import OrderedDict
+
+
+class LookupTable:
+    """
+    A callable that evaluates a function from a precomputed table or a memo.
+    """
+
+    def __init__(self, func, widths: list, maxTableBits=16, memoSize=4096):
+        """
+        @param func : the function to tabulate.
+        @param widths : the number of bits of every argument of func, None if it is not known.
+        @param maxTableBits : the largest number of argument bits that is enumerated into a table.
+        @param memoSize : the number of results kept by the memo when no table is used.
+        """
+
+        self.__func = func
+        self.__widths = list(widths)
+        self.__memoSize = memoSize
+        self.__memo = OrderedDict()
+        self.__table = None
+        self.__hits = 0
+        self.__misses = 0
+
+        if None not in self.__widths and sum(self.__widths) <= maxTableBits:
+            self.__table = self.__enumerate()
+
+    def __enumerate(self):
+        """
+        Evaluates the function on its whole domain.
+        @return array or list : the table, or None if the function failed on some argument.
+        """
+
+        values = []
+        try:
+            if len(self.__widths) == 1:
+                for x in range(1 << self.__widths[0]):
+                    values.append(self.__func(x))
+            else:
+                for a in range(1 << self.__widths[0]):
+                    for b in range(1 << self.__widths[1]):
+                        values.append(self.__func(a, b))
+        except Exception:
+            return None
+
+        # an array is only used if it gives back exactly the same values
+        if all(type(x) is int for x in values):
+            try:
+                return array("q", values)
+            except OverflowError:
+                pass
+        return values
+
+    def __call__(self, *args):
+        """
+        @return : func(*args)
+        """
+
+        table = self.__table
+        if table is not None:
+            if len(args) == 1:
+                if 0 <= args[0] < len(table):
+                    self.__hits += 1
+                    return table[args[0]]
+            else:
+                width = self.__widths[1]
+                if 0 <= args[1] < (1 << width) and 0 <= args[0] < (1 << self.__widths[0]):
+                    self.__hits += 1
+                    return table[(args[0] << width) | args[1]]
+
+            # outside the declared widths
+            self.__misses += 1
+            return self.__func(*args)
+
+        memo = self.__memo
+        if args in memo:
+            self.__hits += 1
+            memo.move_to_end(args)
+            return memo[args]
+
+        self.__misses += 1
+        value = self.__func(*args)
+        memo[args] = value
+        if len(memo) > self.__memoSize:
+            memo.popitem(last=False)
+        return value
+
+    def getFunc(self):
+        """
+        @return function : the function that is tabulated.
+        """
+        return self.__func
+
+    def getTable(self):
+        """
+        @return array or list : the precomputed table, None if the results are memoized.
+        """
+        return self.__table
+
+    def getWidths(self):
+        """
+        @return list : the number of bits of every argument.
+        """
+        return list(self.__widths)
+
+    def isTable(self):
+        """
+        @return bool : True if a precomputed table is used, False if the results are memoized.
+        """
+        return self.__table is not None
+
+    def getStats(self):
+        """
+        @return dict : the hits, the misses and whether a table is used.
+        """
+        return {"table": self.isTable(), "hits": self.__hits, "misses": self.__misses}
@@ -0,0 +1,226 @@
+"""
+This file contains the Profiler used by pydig.run(until, profile=True).
+
+While it is started, every block counts:
+
+    runs     : the times the block was run by its fan in (or by its clock),
+    calls    : the calls of its nsl, ol or func (or of their lookup tables),
+    callTime : the wall time spent inside these calls, in seconds,
+    events   : the events it scheduled on the kernel (delays, clock ticks, register commits),
+    samples  : the samples its scope dump stored.
+
+The depth of the event queue is read every time an event is scheduled, and its peak is kept
+for each of a number of equal slices of the simulated time. The counters are plain methods set
+on the blocks themselves while the profiler runs (and removed by stop), so a run without
+profile=True does not pay for them, and the callbacks waiting on the kernel are never wrapped
+(checkpoints and snapshots still work).
+
+@author Abhirath, Aryan, Gathik
+@date 17/10/2026
+@version 1.0
+"""
+
+import json
+import os
+from time import perf_counter
+
+# the positions of the counters of a block
+RUNS, CALLS, CALL_TIME, EVENTS = range(4)
+
+# the methods that give the functions of the blocks
+GETTERS = ("getNSL", "getOL", "getFunc")
+
+
+class BlockPatches:
+    """
+    Methods set on blocks for a while (by the Profiler and the ChromeTracer), and what to put back.
+    """
+
+    def __init__(self):
+        self.__installed = []
+
+    def set(self, block, name, value):
+        """
+        Sets a method on a block and remembers what to put back.
+        """
+        self.__installed.append((block, name, name in vars(block), vars(block).get(name)))
+        setattr(block, name, value)
+
+    def restore(self):
+        """
+        Puts back what was there before, the last method set first.
+        """
+
+        for block, name, had, old in reversed(self.__installed):
+            if had:
+                setattr(block, name, old)
+            else:
+                delattr(block, name)
+        self.__installed = []
+
+
+class Profiler:
+    """
+    Counts the cost of every block of a simulation between start() and stop().
+    """
+
+    def __init__(self, components: list, env, ticksPerUnit=None, slices=100):
+        """
+        @param components : the blocks of the pydig object.
+        @param env : the simpy environment or the NativeKernel the blocks run on.
+        @param ticksPerUnit : the ticks of a time unit with an integer timebase, None otherwise.
+        @param slices : the number of slices of the simulated time the peak queue depth is kept for.
+        """
+
+        self.__components = components
+        self.__env = env
+        self.__ticksPerUnit = ticksPerUnit
+        self.__slices = slices
+        self.__stats = [[0, 0, 0.0, 0] for _ in components]
+        self.__samples = [0 for _ in components]
+        self.__peaks = {}
+        self.__patches = BlockPatches()
+        self.__wallTime = 0.0
+        self.__started = None
+        self.__start = 0
+        self.__sliceTime = 1
+        self.__current = None
+        self.__counts = []
+
+        if hasattr(env, "getQueueLength"):
+            self.__queueLength = env.getQueueLength
+        else:
+            # simpy keeps its events in a list
+            self.__queueLength = lambda: len(env._queue)
+
+    def start(self, until):
+        """
+        Sets the counters on the blocks. A profiler is started once, for one run.
+        @param until : the time the simulation runs until (in ticks with an integer timebase).
+        """
+
+        self.__start = self.__env.now
+        self.__sliceTime = max((until - self.__start) / self.__slices, 1e-12)
+        # the end of the slice of the simulated time being run, its peak queue depth and its index
+        self.__current = [-1, 0, -1]
+        self.__counts = [sum(i._scopeDump.getSampleCounts().values()) for i in self.__components]
+
+        for block, stats in zip(self.__components, self.__stats):
+            self.__patches.set(block, "run", self.__counted(block.run, stats))
+            self.__patches.set(block, "_callAfter", self.__scheduled(block._callAfter, stats))
+            for getter in GETTERS:
+                if hasattr(block, getter):
+                    timed = self.__timed(getattr(block, getter)(), stats)
+                    self.__patches.set(block, getter, lambda timed=timed: timed)
+
+        self.__started = perf_counter()
+
+    def stop(self):
+        """
+        Removes the counters from the blocks.
+        """
+
+        self.__wallTime += perf_counter() - self.__started
+        self.__patches.restore()
+
+        for i, block in enumerate(self.__components):
+            self.__samples[i] += sum(block._scopeDump.getSampleCounts().values()) - self.__counts[i]
+
+    @staticmethod
+    def __counted(run, stats):
+        def counted():
+            stats[RUNS] += 1
+            run()
+        return counted
+
+    @staticmethod
+    def __timed(function, stats):
+        def timed(*args):
+            start = perf_counter()
+            value = function(*args)
+            stats[CALL_TIME] += perf_counter() - start
+            stats[CALLS] += 1
+            return value
+        return timed
+
+    def __scheduled(self, callAfter, stats):
+        env = self.__env
+        queueLength = self.__queueLength
+        current = self.__current
+        peak = self.__peak
+
+        def scheduled(delay, callback, *args):
+            callAfter(delay, callback, *args)
+            stats[EVENTS] += 1
+            depth = queueLength()
+            # most events neither raise the peak nor start a new slice
+            if depth > current[1] or env.now >= current[0]:
+                peak(depth)
+        return scheduled
+
+    def __peak(self, depth):
+        """
+        Keeps the depth of the queue if it is the largest of its slice of the simulated time.
+        """
+
+        current = self.__current
+        now = self.__env.now
+        if now >= current[0] or now < current[0] - self.__sliceTime:
+            index = int((now - self.__start) // self.__sliceTime)
+            current[:] = [self.__start + (index + 1) * self.__sliceTime, self.__peaks.get(index, 0), index]
+        if depth > current[1]:
+            current[1] = depth
+            self.__peaks[current[2]] = depth
+
+    def getReport(self):
+        """
+        @return dict : the wall time of the profiled runs, the totals, the peak queue depth of every
+                       slice of the simulated time ([start time of the slice, depth]) and the counters
+                       of every block, the most expensive first.
+        """
+
+        blocks = []
+        for block, stats, samples in zip(self.__components, self.__stats, self.__samples):
+            blocks.append({"blockID": block.getBlockID(), "type": type(block).__name__,
+                           "runs": stats[RUNS], "calls": stats[CALLS], "callTime": stats[CALL_TIME],
+                           "events": stats[EVENTS], "samples": samples})
+        blocks.sort(key=lambda x: (-x["callTime"], -x["events"], -x["runs"]))
+
+        unit = self.__ticksPerUnit or 1
+        queueDepth = [[(self.__start + index * self.__sliceTime) / unit, depth] for index, depth in sorted(self.__peaks.items())]
+        return {"wallTime": self.__wallTime,
+                "callTime": sum(x["callTime"] for x in blocks),
+                "events": sum(x["events"] for x in blocks),
+                "samples": sum(x["samples"] for x in blocks),
+                "peakQueueDepth": max((x[1] for x in queueDepth), default=0),
+                "queueDepth": queueDepth,
+                "blocks": blocks}
+
+    def format(self, count=20):
+        """
+        @param count : the number of blocks listed.
+        @return str : the report as a table, the most expensive blocks first.
+        """
+
+        report = self.getReport()
+        lines = [f"{report['wallTime']:.3f} s, {report['callTime']:.3f} s in nsl/ol/func, {report['events']} events, "
+                 f"{report['samples']} samples, peak queue depth {report['peakQueueDepth']}",
+                 f"{'block':<28} {'type':<14} {'runs':>9} {'calls':>9} {'call ms':>9} {'events':>9} {'samples':>9}"]
+        for x in report["blocks"][:count]:
+            lines.append(f"{str(x['blockID'])[:28]:<28} {x['type'][:14]:<14} {x['runs']:>9} {x['calls']:>9} "
+                         f"{x['callTime'] * 1000:>9.2f} {x['events']:>9} {x['samples']:>9}")
+        if len(report["blocks"]) > count:
+            lines.append(f"... {len(report['blocks']) - count} more blocks in the json file")
+        return "\n".join(lines)
+
+    def write(self, path: str):
+        """
+        Writes the report (see getReport) to a json file.
+        @param path : the path of the file, its directory is created if needed.
+        """
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as file:
+            json.dump(self.getReport(), file, indent=1)
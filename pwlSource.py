@@ -2,6 +2,7 @@
 This class is used for getting input from the user.
 The valid formats are txt, csv, and xlsx.
 In order to use this class for reading xlsx, one needs to have openpyxl installed.
+pandas and openpyxl are only imported when a file is read.
 
 @author: Abhirath, Aryan, Gathik
 @date: 4/12/2023
@@ -9,7 +10,6 @@ In order to use this class for reading xlsx, one needs to have openpyxl installe
 """
 
 from utilities import checkType, printErrorAndExit
-import pandas as pd
 
 class InputGenerator:
 
@@ -185,6 +185,8 @@ class InputGenerator:
             padded_value = str(value).zfill(length)
             return padded_value
 
+        import pandas as pd
+
         #For txt files
         df = pd.DataFrame(data = iterable).replace("\n", "", regex = True)
 
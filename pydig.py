@@ -19,12 +19,21 @@ current = os.path.dirname(os.path.realpath(__file__))
 parent = os.path.dirname(current)
 sys.path.append(parent)
 
-from utilities import printErrorAndExit, checkType, dumpVars
-from scope import Plotter
+from utilities import printErrorAndExit, checkType, dumpRows, parseTime, timeToTicks, ticksToTime
+from scope import ScopeMerger, Plotter
 from blocks import *
 from usableBlocks import *
 from pwlSource import InputGenerator
-import simpy
+from cycleEngine import CycleEngine
+from sweep import runSweep
+from kernel import NativeKernel
+from deltaCycle import DeltaScheduler
+from vcdWriter import VCDWriter
+from traceFile import TraceWriter
+from checkpoint import writeCheckpoint, readCheckpoint, takeSnapshot, loadSnapshot
+from resultCache import ResultCache, circuitKey
+from profiler import Profiler
+from chromeTrace import ChromeTracer
 
 
 class pydig:
@@ -32,19 +41,100 @@ class pydig:
     This class is used for adding your moore machines, input block, and output block.
     """
 
-    def __init__(self, name="pydig"):
+    def __init__(self, name="pydig", kernel="simpy", deltaCycles=False, maxDeltaCycles=1000, changeOnly=False, cancelStale=False, timescale=None, timeUnit="1ns", headless=False):
         """
         Creates a new simpy environment.
         It is a manager class for all blocks. 
         @param name : the name of this object (It will be used as the name of the output CSV file produced by this object). 
+        @param kernel : "simpy" schedules the blocks on a simpy environment (default).
+                        "native" uses the built in NativeKernel, which runs plain callbacks from a binary heap.
+                        Both give the same simulation.
+        @param deltaCycles : if True, all the zero delay combinational blocks that are affected at a time are
+                             evaluated once each in topological order, and only propagate if their output changed.
+        @param maxDeltaCycles : the number of delta cycles after which a zero delay loop that does not settle is reported.
+        @param changeOnly : if True, the blocks created by this object only run their fan out when their output changed.
+                            It can be changed for a single block with block.setChangeOnly().
+        @param cancelStale : if True, a pending NSL or OL evaluation of a moore or mealy machine is dropped when a newer
+                             evaluation of the same function is scheduled before its delay is over (inertial delay).
+        @param timescale : the tick of an integer timebase, like "10ps". All the delays, clock periods and input times
+                           are converted to whole ticks when the blocks are created, so the simulation time is an int
+                           and equal times are exactly equal. None (default) simulates with float time units.
+        @param timeUnit : the duration of one time unit, like "1ns" (the unit of all the delays and of until).
+        @param headless : if True, run() does not plot the blocks created with plot=True, so matplotlib is never
+                          imported (the csv file and the trace are still written, and so are the plots if
+                          savePlots was called, they need no window).
         """
 
+        checkType([(kernel, str), (deltaCycles, bool), (maxDeltaCycles, int), (changeOnly, bool), (cancelStale, bool), (timeUnit, str), (headless, bool)])
+
+        self.__timeUnit = timeUnit
+        self.__ticksPerUnit = None
+        if timescale is not None:
+            ticks = parseTime(timeUnit) / parseTime(timescale)
+            if ticks.denominator != 1:
+                printErrorAndExit(f"The time unit {timeUnit} is not a whole number of {timescale} ticks.")
+            self.__ticksPerUnit = int(ticks)
+
         self.__uniqueIDlist = []
-        self.__env = simpy.Environment()
+        if kernel == "simpy":
+            # imported here so that the native kernel does not need simpy
+            import simpy
+            self.__env = simpy.Environment()
+        elif kernel == "native":
+            self.__env = NativeKernel()
+        else:
+            printErrorAndExit(f"{kernel} is not a valid kernel, use \"simpy\" or \"native\".")
         self.__components = []
         self.__count = 0
         self.__name = name
         self.__dump = False
+        self.__deltaScheduler = DeltaScheduler(maxDeltaCycles) if deltaCycles else None
+        self.__changeOnly = changeOnly
+        self.__cancelStale = cancelStale
+        self.__steadyState = None
+        self.__probes = {}
+        self.__vcd = None
+        self.__trace = None
+        self.__keepSamples = True
+        self.__started = False
+        self.__snapshotInterval = None
+        self.__startSnapshot = None
+        self.__snapshots = []
+        self.__cache = None
+        self.__cacheHit = None
+        self.__cacheable = None
+        self.__headless = headless
+        self.__plotter = None
+        self.__plotFiles = []
+        self.__profiler = None
+        self.__chromeTrace = None
+
+    def __toTicks(self, time, what):
+        """
+        Converts a time given in time units to ticks when an integer timebase is used.
+        @param time : the time (a delay, a clock period, ...).
+        @param what : what the time is, used in the error message.
+        @return : the number of ticks, or time itself without an integer timebase.
+        """
+
+        if self.__ticksPerUnit is None:
+            return time
+        return timeToTicks(time, self.__ticksPerUnit, what)
+
+    def __toTime(self, ticks):
+        """
+        @return : ticks converted back to time units, or ticks itself without an integer timebase.
+        """
+
+        if self.__ticksPerUnit is None:
+            return ticks
+        return ticksToTime(ticks, self.__ticksPerUnit)
+
+    def getTicksPerUnit(self):
+        """
+        @return int : the number of ticks in one time unit, None without an integer timebase.
+        """
+        return self.__ticksPerUnit
 
     def __makeUniqueID(self, blockType):
         """
@@ -57,7 +147,7 @@ class pydig:
             self.__count += 1
         return f"{blockType} {self.__count}"
 
-    def combinational(self, maxOutSize, plot=False, blockID=None, func=lambda x: x, delay=0, initialValue=0):
+    def combinational(self, maxOutSize, plot=False, blockID=None, func=lambda x: x, delay=0, initialValue=0, tabulate=False):
         """
         Adds a combinational block to this class. 
         @param maxOutSize : the maximum number of parallel output wires
@@ -66,10 +156,12 @@ class pydig:
         @param function : inner gate logic
         @param delay : the time delay for this object
         @param initialValue : The initial output value given by this block at t = 0 while running
+        @param tabulate : if True, the function is evaluated once for every possible input when the simulation
+                          starts and then looked up (it must not have side effects)
         @return Combinational : a combinational instance. 
         """
 
-        checkType([(plot, bool), (maxOutSize, int)])
+        checkType([(plot, bool), (maxOutSize, int), (tabulate, bool)])
         self.__count += 1
         if (blockID == None):
             blockID = self.__makeUniqueID("Combi")
@@ -79,7 +171,7 @@ class pydig:
             blockID = id
 
         self.__uniqueIDlist.append(blockID)
-        temp = Combinational(func=func, env=self.__env, blockID=blockID, maxOutSize=maxOutSize, delay=delay, plot=plot, initialValue=initialValue)
+        temp = Combinational(func=func, env=self.__env, blockID=blockID, maxOutSize=maxOutSize, delay=self.__toTicks(delay, "delay"), plot=plot, initialValue=initialValue, changeOnly=self.__changeOnly, tabulate=tabulate)
         self.__components.append(temp)
         return temp
 
@@ -98,10 +190,11 @@ class pydig:
             combObj.setBlockID(id)
 
         self.__uniqueIDlist.append(combObj.getBlockID())
+        combObj.setDelay(self.__toTicks(combObj.getDelay(), "delay"))
         self.__components.append(combObj)
         return combObj
 
-    def moore(self, maxOutSize, plot=False, blockID=None, nsl=lambda ps, i: 0, ol=lambda ps: 0, startingState = 0, risingEdge = True, clock  = None, nsl_delay = 0.01, ol_delay = 0.01, register_delay = 0.01):
+    def moore(self, maxOutSize, plot=False, blockID=None, nsl=lambda ps, i: 0, ol=lambda ps: 0, startingState = 0, risingEdge = True, clock  = None, nsl_delay = 0.01, ol_delay = 0.01, register_delay = 0.01, tabulate = False, stateSize = None):
         """
         Adds a moore machine to this class. 
         @param maxOutSize : the maximum number of output wires
@@ -115,9 +208,14 @@ class pydig:
         @param nsl_delay : the delay in the next state logic
         @param ol_delay : the delay in the output logic
         @param register_delay : the delay in the register
+        @param tabulate : if True, the nsl and ol are evaluated from lookup tables (they must not have side effects)
+        @param stateSize : the number of bits of the state. Without it the tabulated functions are memoized
+                           instead of being enumerated into full tables.
         @return MooreMachine : the moore machine instance. 
         """
-        checkType([(plot, bool), (startingState, int), (risingEdge, bool), (nsl_delay, (int, float)), (ol_delay, (int, float))])
+        checkType([(plot, bool), (startingState, int), (risingEdge, bool), (nsl_delay, (int, float)), (ol_delay, (int, float)), (tabulate, bool)])
+        if stateSize is not None:
+            checkType([(stateSize, int)])
 
         self.__count += 1
         if (blockID == None):
@@ -128,11 +226,12 @@ class pydig:
             blockID = id
 
         self.__uniqueIDlist.append(blockID)
-        temp = MooreMachine(env=self.__env, maxOutSize=maxOutSize, nsl=nsl, ol=ol, plot=plot, blockID=blockID, startingState=startingState, clk = clock, posEdge = risingEdge, nsl_delay = nsl_delay, ol_delay = ol_delay, register_delay = register_delay)
+        temp = MooreMachine(env=self.__env, maxOutSize=maxOutSize, nsl=nsl, ol=ol, plot=plot, blockID=blockID, startingState=startingState, clk = clock, posEdge = risingEdge, nsl_delay = self.__toTicks(nsl_delay, "nsl delay"),
+                           ol_delay = self.__toTicks(ol_delay, "ol delay"), register_delay = self.__toTicks(register_delay, "register delay"), changeOnly=self.__changeOnly, cancelStale=self.__cancelStale, tabulate=tabulate, stateSize=stateSize)
         self.__components.append(temp)
         return temp
 
-    def mealy(self, maxOutSize, plot=False, blockID=None, nsl=lambda ps, i: 0, ol=lambda ps: 0, startingState=0, risingEdge = True, clock = None, nsl_delay = 0.01, ol_delay = 0.01, register_delay = 0.01):
+    def mealy(self, maxOutSize, plot=False, blockID=None, nsl=lambda ps, i: 0, ol=lambda ps: 0, startingState=0, risingEdge = True, clock = None, nsl_delay = 0.01, ol_delay = 0.01, register_delay = 0.01, tabulate = False, stateSize = None):
         """
         Adds a mealy machine to this class. 
         @param maxOutSize : the maximum number of output wires
@@ -146,9 +245,14 @@ class pydig:
         @param nsl_delay : the delay in the next state logic
         @param ol_delay : the delay in the output logic
         @param register_delay : the delay in the register
+        @param tabulate : if True, the nsl and ol are evaluated from lookup tables (they must not have side effects)
+        @param stateSize : the number of bits of the state. Without it the tabulated functions are memoized
+                           instead of being enumerated into full tables.
         @return MealyMachine : the mealy machine instance. 
         """
-        checkType([(plot, bool), (startingState, int), (risingEdge, bool), (nsl_delay, (int, float)), (ol_delay, (int, float))])
+        checkType([(plot, bool), (startingState, int), (risingEdge, bool), (nsl_delay, (int, float)), (ol_delay, (int, float)), (tabulate, bool)])
+        if stateSize is not None:
+            checkType([(stateSize, int)])
 
         self.__count += 1
         if (blockID == None):
@@ -159,7 +263,8 @@ class pydig:
             blockID = id
 
         self.__uniqueIDlist.append(blockID)
-        temp = MealyMachine(env=self.__env, maxOutSize=maxOutSize, nsl=nsl, ol=ol, plot=plot, blockID=blockID, startingState=startingState, clk = clock, posEdge = risingEdge, nsl_delay = nsl_delay, ol_delay = ol_delay, register_delay = register_delay)
+        temp = MealyMachine(env=self.__env, maxOutSize=maxOutSize, nsl=nsl, ol=ol, plot=plot, blockID=blockID, startingState=startingState, clk = clock, posEdge = risingEdge, nsl_delay = self.__toTicks(nsl_delay, "nsl delay"),
+                           ol_delay = self.__toTicks(ol_delay, "ol delay"), register_delay = self.__toTicks(register_delay, "register delay"), changeOnly=self.__changeOnly, cancelStale=self.__cancelStale, tabulate=tabulate, stateSize=stateSize)
         self.__components.append(temp)
         return temp
 
@@ -185,7 +290,8 @@ class pydig:
             blockID = id
 
         self.__uniqueIDlist.append(blockID)
-        temp = Clock(env=self.__env, maxOutSize=1, plot=plot, blockID=blockID, timePeriod=timePeriod, onTime=onTime, initialValue=initialValue)
+        temp = Clock(env=self.__env, maxOutSize=1, plot=plot, blockID=blockID, timePeriod=self.__toTicks(timePeriod, "time period"),
+                     onTime=self.__toTicks(onTime, "on time"), initialValue=initialValue)
         self.__components.append(temp)
         return temp
 
@@ -199,6 +305,8 @@ class pydig:
         """
 
         inputList = InputGenerator(filePath).getInput()["Inputs"]
+        if self.__ticksPerUnit is not None:
+            inputList = [(self.__toTicks(time, f"input time in {filePath}"), value) for time, value in inputList]
         self.__count += 1
         if (blockID == None):
             blockID = self.__makeUniqueID("Source")
@@ -208,7 +316,7 @@ class pydig:
             blockID = id
 
         self.__uniqueIDlist.append(blockID)
-        temp = Input(inputList=inputList, env=self.__env, plot=plot, blockID=blockID)
+        temp = Input(inputList=inputList, env=self.__env, plot=plot, blockID=blockID, changeOnly=self.__changeOnly)
         self.__components.append(temp)
         return temp
 
@@ -228,7 +336,7 @@ class pydig:
             blockID = id
 
         self.__uniqueIDlist.append(blockID)
-        temp = Output(env=self.__env, plot=plot, blockID=blockID)
+        temp = Output(env=self.__env, plot=plot, blockID=blockID, delay=self.__toTicks(0.01, "output delay"))
         self.__components.append(temp)
         return temp
 
@@ -250,66 +358,660 @@ class pydig:
             blockID = id
         
         self.__uniqueIDlist.append(blockID)
-        return Register(env=self.__env, clock=clock, delay=delay, initialValue=initalValue, plot=plot, blockID=blockID)
+        return Register(env=self.__env, clock=clock, delay=self.__toTicks(delay, "delay"), initialValue=initalValue, plot=plot, blockID=blockID)
+
+    def probe(self, block, which=None):
+        """
+        Records the given signals of a block. Once probe is used, the blocks that are not
+        probed (and are not plotted) record nothing, so only the probed signals are plotted
+        and written to the csv file.
+        @param block : a block added to this object.
+        @param which : the kind of signal ("input", "ns", "ps" or "output") or a tuple of kinds.
+                       None records every signal of the block.
+        @return : None
+        """
 
-    def run(self, until: int):
+        checkType([(block, Block)])
+        if not any(block is i for i in self.__components):
+            printErrorAndExit(f"{block} was not added to {self.__name}.")
+
+        if isinstance(which, str):
+            which = (which,)
+        elif which is not None:
+            checkType([(which, (tuple, list))])
+
+        # checks the kinds now rather than when the simulation starts
+        if which is not None:
+            block.setProbe(which)
+        self.__probes[id(block)] = which
+
+    def run(self, until: int, engine="event", steadyState=False, profile=False):
         """
         Runs each of the blocks that are added to this class for "until" time units. 
         If any block is not connected to an input source, then error is thrown.
         @param until : must be of type int and must specify the number of time units the block is supposed to run.
+        @param engine : "event" runs every block as a simpy process (default).
+                        "cycle" compiles the blocks once and evaluates each clock edge as a single
+                        ordered sweep. It is much faster for synchronous designs but does not model delays.
+        @param steadyState : if True (cycle engine only), once all the inputs have been applied the simulation stops
+                             as soon as the circuit repeats a state and the waveforms of the cycle are repeated up to
+                             until. The cycle that was found is returned by getSteadyState().
+        @param profile : if True, the cost of every block is counted while simulating (see profiler.py),
+                         a report is printed at the end and written to output/<name>_profile.json.
         @return : None
         """
 
-        checkType([(until, int)])
+        self.simulate(until, engine, steadyState, profile)
+        self.__writeResults()
 
-        for i in self.__components:
-            if (isinstance(i, HasOnlyOutputConnections) or i.isConnected()):
+        if profile and self.__profiler is not None:
+            path = os.path.join("output", f"{self.__name}_profile.json")
+            self.__profiler.write(path)
+            print(f"Profile of {self.__name}: {self.__profiler.format()}")
+            print(f"The profile was written to {path}.")
+
+    def __writeResults(self):
+        """
+        Plots the blocks and writes the csv file and the trace if they were asked for.
+        """
+
+        # plotting the plots, matplotlib is only imported if a block is plotted
+        if not self.__headless or self.__plotter is not None:
+            plotter = self.__plotter or Block.plotter
+            for i in self.__components:
+                i.plot(plotter)
+
+            self.__plotFiles = plotter.show()
+
+        # Generating csv file
+        if self.__dump:
+            merger = ScopeMerger([i.getScopeDumps() for i in self.__components], self.__ticksPerUnit)
+            dumpRows(merger.getLabels(), merger.rows(), self.__name)
+
+        # Generating the binary trace
+        if self.__trace is not None:
+            merger = ScopeMerger([i.getScopeDumps() for i in self.__components], self.__ticksPerUnit)
+            trace = TraceWriter(*self.__trace)
+            for label in merger.getLabels():
+                trace.addSignal(label, *merger.getColumns(label))
+            trace.close()
+
+    def simulate(self, until: int, engine="event", steadyState=False, profile=False):
+        """
+        Same as run, without plotting and without writing the csv file or the trace.
+        The recorded signals are given by getWaveforms() (and by the scope dumps of the blocks).
+        A VCD file set with dumpVCD is still written, while the simulation runs.
+        Once the event engine has run (or a checkpoint was restored), the next call continues the
+        simulation from where it stopped until the new until time.
+        @param until : the number of time units to simulate.
+        @param engine : "event" or "cycle", see run.
+        @param steadyState : see run.
+        @param profile : if True, the cost of every block is counted while simulating, see getProfile().
+        @return : None
+        """
+
+        checkType([(until, int), (engine, str), (steadyState, bool), (profile, bool)])
+        self.__profiler = None
+
+        if engine not in ("event", "cycle"):
+            printErrorAndExit(f"{engine} is not a valid engine, use \"event\" or \"cycle\".")
+
+        if steadyState and engine != "cycle":
+            printErrorAndExit("Steady state detection is only supported by the cycle engine.")
+
+        if self.__cacheHit:
+            printErrorAndExit(f"The waveforms of {self.__name} were loaded from the result cache, it cannot be run again.")
+
+        # a simulation of the event engine that was run before or restored continues from where it is
+        if self.__started:
+            if engine != "event":
+                printErrorAndExit(f"{self.__name} was already run with the event engine, it can only be continued with it.")
+            if self.__vcd is not None:
+                printErrorAndExit("The VCD file is closed at the end of a run, a simulation with dumpVCD cannot be continued.")
+            until = self.__toTicks(until, "until time")
+            if until < self.__env.now:
+                printErrorAndExit(f"{self.__name} is already at time {self.__toTime(self.__env.now)}, it cannot run until {self.__toTime(until)}.")
+            self.__startInstruments(profile, until)
+            self.__runEvents(until)
+            self.__stopInstruments()
+            return
+
+        self.__prepare()
+        until = self.__toTicks(until, "until time")
+
+        # the VCD file is written while simulating and the snapshots are taken while simulating
+        key = None
+        if self.__cache is not None and self.__vcd is None and self.__snapshotInterval is None:
+            key = self.__cacheKey(until, engine, steadyState)
+            # a run that depends on a value that cannot be hashed is simulated and not stored
+            result = self.__cache.get(key) if key is not None else None
+            self.__cacheHit = result is not None
+            self.__cacheable = key is not None
+            if self.__cacheHit:
+                for i, samples in zip(self.__components, result["samples"]):
+                    i._scopeDump.setState(samples)
+                self.__steadyState = result["steadyState"]
+                return
+
+        if self.__vcd is not None:
+            self.__startVCD(steadyState)
+
+        self.__startInstruments(profile, until)
+        if engine == "cycle":
+            cycleEngine = CycleEngine(self.__components, steadyState)
+            cycleEngine.run(until)
+            self.__steadyState = cycleEngine.getSteadyState()
+            if self.__steadyState is not None:
+                self.__steadyState["start"] = self.__toTime(self.__steadyState["start"])
+                self.__steadyState["period"] = self.__toTime(self.__steadyState["period"])
+        else:
+            if self.__snapshotInterval is not None:
+                self.__startSnapshot = takeSnapshot(self.__components, self.__env, self.__deltaScheduler)
+            for i in self.__components:
                 i.run()
-            else:
-                printErrorAndExit(f"{i} is not connected.")
+            self.__started = True
+            self.__runEvents(until)
+        self.__stopInstruments()
+
+        if self.__vcd is not None:
+            self.__vcd.close(until)
+
+        if key is not None:
+            self.__cache.put(key, {"samples": [i._scopeDump.getState() for i in self.__components], "steadyState": self.__steadyState})
+
+    def __startInstruments(self, profile, until):
+        """
+        Starts counting the cost of every block if profile is True, and tracing the blocks if
+        dumpChromeTrace was called.
+        """
+        if profile:
+            self.__profiler = Profiler(self.__components, self.__env, self.__ticksPerUnit)
+            self.__profiler.start(until)
+        if self.__chromeTrace is not None:
+            self.__chromeTrace.start(self.__components, self.__env)
+
+    def __stopInstruments(self):
+        # in the reverse order, the tracer set its methods over the ones of the profiler
+        if self.__chromeTrace is not None:
+            self.__chromeTrace.stop()
+        if self.__profiler is not None:
+            self.__profiler.stop()
+
+    def getProfile(self):
+        """
+        @return dict : the profile of the last run made with profile=True (see Profiler.getReport),
+                       None if it was not profiled (or its waveforms were loaded from the result cache).
+        """
+        return None if self.__profiler is None else self.__profiler.getReport()
+
+    def __runEvents(self, until):
+        """
+        Runs the event engine until the given time, taking a snapshot every snapshot interval
+        if keepSnapshots was called.
+        @param until : the time (in ticks with an integer timebase).
+        """
+
+        if self.__snapshotInterval is None:
+            self.__env.run(until=until)
+            return
 
+        time = (self.__snapshots[-1]["now"] if self.__snapshots else self.__env.now) + self.__snapshotInterval
+        while time < until:
+            self.__env.run(until=time)
+            self.__snapshots.append(takeSnapshot(self.__components, self.__env, self.__deltaScheduler))
+            time += self.__snapshotInterval
         self.__env.run(until=until)
 
-        # plotting the plots
+    def cacheResults(self, directory: str, maxSize=256 * 2**20):
+        """
+        Keeps the waveforms of the runs of this pydig object in an on disk cache (see resultCache.py).
+        A run of the same circuit, with the same functions, stimuli, until and engine as a run in the cache
+        is not simulated: its waveforms are loaded (and plotted and written to the csv file by run).
+        Runs with dumpVCD or keepSnapshots are not cached, nor runs whose functions use values the key
+        cannot be made of (see resultCache.py).
+        @param directory : the directory of the cache, it can be shared by many pydig objects and processes.
+        @param maxSize : the number of bytes the cache may take, the least recently used runs are removed above it.
+        @return : None
+        """
+
+        checkType([(directory, str), (maxSize, int)])
+        if maxSize <= 0:
+            printErrorAndExit(f"The size of the result cache must be positive, not {maxSize}.")
+        self.__cache = ResultCache(directory, maxSize)
+
+    def __cacheKey(self, until, engine, steadyState):
+        """
+        @return str : the key of a run in the result cache, None if the run cannot be cached.
+        """
+
+        blocks = {id(x): i for i, x in enumerate(self.__components)}
+        options = {
+            "until": until,
+            "engine": engine,
+            "steadyState": steadyState,
+            "ticksPerUnit": self.__ticksPerUnit,
+            "deltaCycles": self.__deltaScheduler is not None,
+            "probes": sorted((blocks[x], which) for x, which in self.__probes.items() if x in blocks),
+        }
+        return circuitKey(self.__components, options)
+
+    def getCacheStats(self):
+        """
+        @return dict : the hits, misses and evictions of all the runs that used the cache directory, the number
+                       of entries and their size in bytes, whether the last run of this object was a "hit" and
+                       whether it could be cached at all ("cacheable").
+        """
+
+        if self.__cache is None:
+            printErrorAndExit(f"{self.__name} has no result cache, call cacheResults(directory) first.")
+        stats = self.__cache.getStats()
+        stats["hit"] = self.__cacheHit
+        stats["cacheable"] = self.__cacheable
+        return stats
+
+    def keepSnapshots(self, interval):
+        """
+        Keeps a snapshot of the simulation in memory every interval time units while the event engine runs,
+        so that resimulate(stimuli) can go back to the last one before a change of the stimuli instead of
+        simulating again from time 0. It must be called before the first run, on pydig(kernel="native").
+        @param interval : the time between two snapshots.
+        @return : None
+        """
+
+        checkType([(interval, (int, float))])
+        if not isinstance(self.__env, NativeKernel):
+            printErrorAndExit("Snapshots need the native kernel, create the simulator with pydig(kernel=\"native\").")
+        if self.__started:
+            printErrorAndExit(f"{self.__name} is already running, keepSnapshots must be called before the first run.")
+        if interval <= 0:
+            printErrorAndExit(f"The snapshot interval must be positive, not {interval}.")
+        self.__snapshotInterval = self.__toTicks(interval, "snapshot interval")
+
+    def resimulate(self, stimuli: dict):
+        """
+        Simulates the last run again with new changes for some Input blocks, until the same time.
+        The new schedules are compared with the ones that were simulated: the simulation goes back to the
+        latest snapshot (see keepSnapshots) taken before the first difference and only the rest of the run is
+        simulated again. The samples recorded before that snapshot are kept, so the waveforms are the ones of
+        a full run with the new stimuli.
+        @param stimuli : the new stimulus of some Input blocks: a file path (like for source) or a list of (time, value) changes.
+        @return : the time from which the simulation was run again, None if no stimulus changed.
+        """
+
+        checkType([(stimuli, dict)])
+        if self.__snapshotInterval is None:
+            printErrorAndExit(f"{self.__name} keeps no snapshots, call keepSnapshots(interval) before the first run.")
+        if not self.__started:
+            printErrorAndExit(f"{self.__name} has not been run with the event engine, there is nothing to simulate again.")
+        if self.__vcd is not None:
+            printErrorAndExit("The VCD file is closed at the end of a run, a simulation with dumpVCD cannot be simulated again.")
+
+        blocks = [id(i) for i in self.__components]
+        changes = []
+        for source, stimulus in stimuli.items():
+            checkType([(source, Input), (stimulus, (str, list, tuple))])
+            if id(source) not in blocks:
+                printErrorAndExit(f"{source} is not a block of {self.__name}.")
+            old = source.getInputList()
+            new = self.__parseStimulus(stimulus, source)
+            first = pydig.__firstChange(old, new)
+            if first is not None:
+                changes.append((blocks.index(id(source)), first, old, new))
+
+        if not changes:
+            return None
+
+        # the latest snapshot where every changed input has not scheduled a change that differs
+        until = self.__env.now
+        keep = len(self.__snapshots)
+        while keep > 0 and not pydig.__canResumeFrom(self.__snapshots[keep - 1], changes):
+            keep -= 1
+        if keep == 0 and self.__startSnapshot is None:
+            printErrorAndExit(f"{self.__name} was restored from a checkpoint after the first change, it cannot be simulated again.")
+
+        for index, _, _, new in changes:
+            self.__components[index].setInputList(new)
+
+        del self.__snapshots[keep:]
+        if keep > 0:
+            loadSnapshot(self.__snapshots[-1], self.__components, self.__env, self.__deltaScheduler)
+        else:
+            loadSnapshot(self.__startSnapshot, self.__components, self.__env, self.__deltaScheduler)
+            for i in self.__components:
+                i.run()
+
+        start = self.__env.now
+        self.__runEvents(until)
+        return self.__toTime(start)
+
+    def rerun(self, stimuli: dict):
+        """
+        Same as resimulate, then plots and writes the csv file and the trace like run.
+        @param stimuli : see resimulate.
+        @return : the time from which the simulation was run again, None if no stimulus changed.
+        """
+
+        start = self.resimulate(stimuli)
+        self.__writeResults()
+        return start
+
+    @staticmethod
+    def __firstChange(old: list, new: list):
+        """
+        @return int : the index of the first (time, value) change that differs between two schedules, None if they are equal.
+        """
+
+        for i, (a, b) in enumerate(zip(old, new)):
+            if a != b:
+                return i
+        if len(old) == len(new):
+            return None
+        return min(len(old), len(new))
+
+    @staticmethod
+    def __canResumeFrom(snapshot: dict, changes: list):
+        """
+        @param changes : (index of the Input block, index of its first change, old schedule, new schedule).
+        @return bool : True if the inputs of the snapshot have only applied and scheduled changes that are the same in both schedules.
+        """
+
+        for index, first, old, new in changes:
+            cursor = snapshot["states"][index]["cursor"]
+            if cursor > first:
+                return False
+            # the change at the cursor is already scheduled, only its value may differ
+            if cursor == first and (first >= len(old) or first >= len(new) or old[first][0] != new[first][0]):
+                return False
+        return True
+
+    def __parseStimulus(self, stimulus, source):
+        """
+        @param stimulus : a file path (like for source) or a list of (time, value) changes.
+        @param source : the Input block the stimulus is for, used in the error messages.
+        @return list : the (time, value) changes, in ticks with an integer timebase.
+        """
+
+        inputList = InputGenerator(stimulus).getInput()["Inputs"] if isinstance(stimulus, str) else list(stimulus)
+        if self.__ticksPerUnit is not None:
+            inputList = [(self.__toTicks(time, f"input time of {source}"), value) for time, value in inputList]
+        return inputList
+
+    def __prepare(self):
+        """
+        Compiles the blocks, applies the probes and the timebase to their scope dumps and
+        compiles the delta cycles, before the blocks start running.
+        """
+
+        self.__compile()
+
+        if self.__probes:
+            for i in self.__components:
+                if id(i) in self.__probes:
+                    i.setProbe(self.__probes[id(i)])
+                elif i.isPlotted():
+                    i.setProbe(None)
+                else:
+                    i.setProbe(())
+
+        # with an integer timebase the blocks record ticks, their dumps give them back in time units
         for i in self.__components:
-            i.plot()
+            i._scopeDump.setTimeScale(self.__ticksPerUnit)
 
-        Block.plotter.show()
+        if self.__deltaScheduler is not None:
+            self.__deltaScheduler.compile([i for i in self.__components if isinstance(i, Combinational) and i.getDelay() == 0])
 
-        # Generating csv file
-        if self.__dump:
-            self.__accumalateDump()
-            dumpVars(Plotter.fillEmptyTimeSlots(self.__timeValues, self.__data), self.__name)
+    def checkpoint(self, path: str, samples=True):
+        """
+        Saves the running simulation to a file (see checkpoint.py): the current time, the events waiting
+        to run and the state of every block. It can be continued later with restore(path) and run(until)
+        on a pydig object built by the same code. Only the event engine on pydig(kernel="native") can be saved.
+        @param path : the path of the checkpoint file.
+        @param samples : if True, the samples recorded so far are saved too, so the waveforms of the
+                         restored simulation start at time 0 instead of at the checkpoint.
+        @return : None
+        """
+
+        checkType([(path, str), (samples, bool)])
+        if not isinstance(self.__env, NativeKernel):
+            printErrorAndExit("Checkpoints need the native kernel, create the simulator with pydig(kernel=\"native\").")
+        if not self.__started:
+            printErrorAndExit(f"{self.__name} has not been run with the event engine, there is nothing to save.")
+
+        writeCheckpoint(path, self.__components, self.__env, self.__deltaScheduler, self.__ticksPerUnit, samples)
+
+    def restore(self, path: str):
+        """
+        Loads a checkpoint saved by checkpoint(path) into this pydig object, which must have been built
+        by the same code and not run yet. The next run(until) continues the simulation from the time of the checkpoint.
+        @param path : the path of the checkpoint file.
+        @return : None
+        """
+
+        checkType([(path, str)])
+        if not isinstance(self.__env, NativeKernel):
+            printErrorAndExit("Checkpoints need the native kernel, create the simulator with pydig(kernel=\"native\").")
+        if self.__started:
+            printErrorAndExit(f"{self.__name} is already running, a checkpoint can only be restored before the first run.")
+
+        self.__prepare()
+        readCheckpoint(path, self.__components, self.__env, self.__deltaScheduler, self.__ticksPerUnit)
+        self.__started = True
+
+    def getWaveforms(self, signals=None):
+        """
+        @param signals : the labels of the signals to give back (the columns of the csv file), None for all of them.
+        @return dict : (times, intTimes, values) of every recorded signal by label, as compact arrays
+                       (see ScopeDump.getColumns), with the times in time units.
+        """
+
+        merger = ScopeMerger([i.getScopeDumps() for i in self.__components], self.__ticksPerUnit)
+        labels = merger.getLabels()
+        if signals is not None:
+            checkType([(signals, (list, tuple))])
+            missing = [x for x in signals if x not in labels]
+            if missing:
+                printErrorAndExit(f"{', '.join(missing)} {'is' if len(missing) == 1 else 'are'} not recorded by {self.__name}.")
+            labels = signals
+        return {label: merger.getColumns(label) for label in labels}
+
+    @staticmethod
+    def sweep(buildFn, params, until: int, workers=None, engine="event", signals=None):
+        """
+        Runs independent simulations in a pool of processes, one for every point of params (see sweep.py).
+        Every worker builds its circuit with buildFn(**point), simulates it without plotting and sends
+        back the compact arrays of getWaveforms(signals). This must be called under
+        if __name__ == "__main__" on platforms that start the workers with spawn (Windows, macOS).
+        @param buildFn : a function defined at the top level of a module that returns a pydig object.
+        @param params : a list of dicts, the keyword arguments of buildFn for every point.
+        @param until : the number of time units every point is simulated.
+        @param workers : the number of processes, None for one per CPU. With 1, the points run in this process.
+        @param engine : "event" or "cycle", see run.
+        @param signals : the labels of the signals to send back, None for all of them.
+        @return generator : (index of the point in params, waveforms) as soon as every point finishes.
+        """
+        return runSweep(buildFn, params, until, workers, engine, signals)
+
+    def __compile(self):
+        """
+        Checks that every block is connected and builds the lookup tables of the tabulated blocks.
+        """
+
+        for i in self.__components:
+            if not (isinstance(i, HasOnlyOutputConnections) or i.isConnected()):
+                printErrorAndExit(f"{i} is not connected.")
+
+        for i in self.__components:
+            if isinstance(i, (Combinational, MooreMachine, MealyMachine)):
+                i.compileTables()
+
+    def runBatch(self, until: int, stimuli: dict):
+        """
+        Runs the circuit against many stimulus schedules (lanes) at once with the batch engine (see batchEngine.py).
+        The lanes share the clocks and are evaluated together, like the cycle engine the delays are not modelled.
+        The functions of the blocks are called with NumPy arrays, so they must be NumPy compatible
+        unless the block was created with tabulate=True.
+        Nothing is plotted or dumped and the blocks keep their own waveforms.
+        @param until : must be of type int and must specify the number of time units the lanes are simulated.
+        @param stimuli : for some Input blocks, a list with one stimulus per lane: a file path (like for source)
+                         or a list of (time, value) changes. All the lists must have the same length.
+                         The other Input blocks apply their own file in every lane.
+        @return list : for every lane, the value changes [(time, value)] of every signal, by label.
+        """
+
+        checkType([(until, int), (stimuli, dict)])
+
+        lanes = None
+        schedules = {}
+        for source, stimulus in stimuli.items():
+            checkType([(source, Input), (stimulus, (list, tuple))])
+            if source not in self.__components:
+                printErrorAndExit(f"{source} is not a block of {self.__name}.")
+            if lanes is not None and len(stimulus) != lanes:
+                printErrorAndExit(f"Every Input must be given the same number of stimuli, not {lanes} and {len(stimulus)}.")
+            lanes = len(stimulus)
+
+            schedules[id(source)] = []
+            for x in stimulus:
+                schedules[id(source)].append(self.__parseStimulus(x, source))
+
+        if not lanes:
+            printErrorAndExit("runBatch needs at least one stimulus for an Input block.")
+
+        # NumPy is only imported by the batch engine
+        from batchEngine import BatchEngine
+
+        self.__compile()
+        batchEngine = BatchEngine(self.__components, schedules, lanes)
+        batchEngine.run(self.__toTicks(until, "until time"))
+
+        waveforms = batchEngine.getWaveforms()
+        if self.__ticksPerUnit is not None:
+            waveforms = [{label: [(self.__toTime(t), v) for t, v in samples] for label, samples in lane.items()}
+                         for lane in waveforms]
+        return waveforms
 
     def getEnv(self):
         """
         This method returns the environment of the current pydig object
-        @return : simpy.Environment
+        @return : simpy.Environment or NativeKernel
         """
         return self.__env
 
-    def generateCSV(self):
+    def getSkippedCount(self):
         """
-        This method is used only when you want to dump all the variables in a (csv) file.
-        @return : None
+        @return int : the number of fan out evaluations skipped by all the change only blocks.
         """
-        self.__dump = True
+        return sum(i.getSkippedCount() for i in self.__components if isinstance(i, HasOutputConnections))
 
-    def __accumalateDump(self):
+    def getSteadyState(self):
         """
-        This method accumalates the data from all blocks/components and creates a dump-able for them.
+        @return dict : the "start" time and the "period" of the cycle found by run(until, "cycle", steadyState=True)
+                       and the number of periods ("repeats") that were not simulated, None if no cycle was found.
+        """
+        return self.__steadyState
+
+    def getTableStats(self):
+        """
+        @return dict : the lookup statistics of every tabulated block, by block ID.
+        """
+        return {i.getBlockID(): i.getTableStats() for i in self.__components
+                if isinstance(i, (Combinational, MooreMachine, MealyMachine)) and i.getTableStats()}
+
+    def dumpVCD(self, path: str, timescale="1ps", timeUnit=None, keepSamples=False):
+        """
+        Writes every recorded signal to a VCD file while the simulation runs, one scope per block.
+        The outputs are declared with maxOutSize bits, the inputs with the width of their connections
+        and the states of the machines with stateSize bits (32 if it was not given).
+        @param path : the path of the VCD file.
+        @param timescale : the resolution of the file: 1, 10 or 100 followed by s, ms, us, ns, ps or fs.
+        @param timeUnit : the duration of one time unit of the simulation, None for the timeUnit of this object.
+        @param keepSamples : if False, the blocks that are not plotted only give their samples to the
+                             VCD file and do not keep them (unless a csv file, a trace or steady state needs them).
         @return : None
         """
 
-        self.__data = {}
-        self.__timeValues = set()
+        checkType([(keepSamples, bool)])
+        timeUnit = parseTime(self.__timeUnit if timeUnit is None else timeUnit)
+        if self.__ticksPerUnit is not None:
+            # the blocks record ticks
+            timeUnit /= self.__ticksPerUnit
+        self.__vcd = VCDWriter(path, self.__name, timescale, timeUnit)
+        self.__keepSamples = keepSamples
+
+    def __startVCD(self, steadyState):
+        """
+        Declares the signals of every block in the VCD file and listens to their scope dumps.
+        @param steadyState : True if the samples are needed to repeat a steady state.
+        """
+
+        keepAll = self.__keepSamples or self.__dump or self.__trace is not None or steadyState
+        kept = set(id(x) for i in self.__components if i.isPlotted() for x in i.getScopeDumps())
 
         for i in self.__components:
-            vals = i.getScopeDump()
-            self.__data.update(vals)
+            widths = i.getSignalWidths()
+            for kind, label in i.getSignals().items():
+                if i._scopeDump.isProbed(label):
+                    self.__vcd.addSignal(i.getBlockID(), kind, label, widths.get(kind))
 
-            discreteTimeValues = set(y[0] for x in vals for y in vals[x])
-            self.__timeValues.update(discreteTimeValues)
+        self.__vcd.open()
+        for i in self.__components:
+            i._scopeDump.setListener(self.__vcd.change, keepAll or id(i._scopeDump) in kept)
+
+    def dumpTrace(self, path: str, chunkSize=4096):
+        """
+        Writes every recorded signal to a binary trace file (see traceFile.py) at the end of the run.
+        The signals are the columns of the csv file, the file can be read with traceFile.TraceReader.
+        @param path : the path of the trace file.
+        @param chunkSize : the number of samples of a signal in a chunk of the file.
+        @return : None
+        """
 
-        self.__timeValues.update([0, max(self.__timeValues) + 1])
-        self.__timeValues = list(sorted(self.__timeValues))
+        checkType([(path, str), (chunkSize, int)])
+        if chunkSize < 1:
+            printErrorAndExit(f"The chunk size of a trace must be positive, not {chunkSize}.")
+        self.__trace = (path, chunkSize)
+
+    def savePlots(self, directory: str, fileFormat="png", width=1600, workers=None):
+        """
+        Makes run() save the plots of the blocks created with plot=True to files instead of showing them
+        in windows, one file "Plot of <blockID> #<n>.<fileFormat>" per figure of five signals.
+        The figures are drawn without a window by a pool of processes, and the waveforms are decimated
+        to the width of the figure, so a run of millions of time units still gives small files quickly.
+        @param directory : the directory of the files, it is created if needed.
+        @param fileFormat : "png", "svg" or "pdf".
+        @param width : the width of a figure in pixels.
+        @param workers : the number of processes, None for one per CPU. With 1, the figures are saved in this process.
+        @return : None
+        """
+
+        self.__plotter = Plotter(directory, fileFormat, width, workers)
+
+    def getPlotFiles(self):
+        """
+        @return list : the paths of the figures saved by the last run (see savePlots).
+        """
+        return self.__plotFiles
+
+    def dumpChromeTrace(self, path: str, chunkSize=4096, counterInterval=100):
+        """
+        Writes what the blocks do during the run to a trace event file of Chrome (see chromeTrace.py), which
+        chrome://tracing and ui.perfetto.dev open: a slice for every run, processFanOut and nsl/ol/func call of
+        a block (with its wall time), an instant event for every clock edge and a counter with the depth of the
+        event queue. The file is written while the simulation runs, chunkSize events at a time.
+        @param path : the path of the trace file (a .json file).
+        @param chunkSize : the number of events written to the file at once.
+        @param counterInterval : the wall time between two values of the queue depth counter, in microseconds.
+        @return : None
+        """
+
+        checkType([(path, str), (chunkSize, int), (counterInterval, (int, float))])
+        if chunkSize < 1:
+            printErrorAndExit(f"The chunk size of a trace must be positive, not {chunkSize}.")
+        self.__chromeTrace = ChromeTracer(path, self.__name, chunkSize, counterInterval, self.__ticksPerUnit)
+
+    def generateCSV(self):
+        """
+        This method is used only when you want to dump all the variables in a (csv) file.
+        @return : None
+        """
+        self.__dump = True
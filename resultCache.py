@@ -0,0 +1,412 @@
+"""
+This file contains the on disk result cache used by pydig.cacheResults(directory).
+
+A run is identified by a hash of everything its waveforms depend on:
+
+    the netlist: the type, the parameters and the initial values of every block
+    (delays, clock periods, widths, block IDs, ...) and the blocks it is connected to,
+    the functions of the blocks (nsl, ol, func): their bytecode and constants, the values
+    of their closures and defaults and the functions and values of their module they use,
+    and for other callables (functools.partial, bound methods, objects with __call__) the
+    function they call, their bound arguments and the attributes and class of their object,
+    the stimuli: the (time, value) changes of every Input block, so two files with the
+    same changes give the same key,
+    until, the engine and the options of the pydig object (timebase, delta cycles, probes, ...).
+
+A run that depends on a value that cannot be hashed this way (an object of a C extension,
+a generator, an open file, ...) has no key and is not cached, rather than risking a key that
+misses part of the circuit. The kernel is not part of the key, both kernels give the same
+simulation. The bytecode
+depends on the version of Python, so is the key. An entry holds the samples of every block,
+the least recently used entries are removed once the cache is larger than its maximum size.
+The number of hits and misses is kept in the directory, so it adds up over many runs; the
+file is updated under a lock, so runs in parallel processes (pydig.sweep) do not lose counts.
+
+@author Abhirath, Aryan, Gathik
+@date 17/10/2026
+@version 1.0
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import sys
+import tempfile
+import time
+from array import array
+from contextlib import contextmanager
+from functools import partial
+from types import FunctionType, MethodType, BuiltinFunctionType, CodeType, ModuleType
+from utilities import printErrorAndExit
+
+FORMAT = "pydig result cache 1"
+STATS_FILE = "stats.json"
+LOCK_FILE = "stats.lock"
+
+# the attributes of the blocks that connect them to the simulation, not part of the circuit
+_SKIPPED = ("_env", "_callAfter", "_scopeDump")
+
+
+@contextmanager
+def _locked(path):
+    """
+    Holds an exclusive lock on a file (created if needed) for the duration of a with block,
+    the other processes that lock it wait for it.
+    @param path : the path of the lock file.
+    """
+
+    with open(path, "a+b") as file:
+        if os.name == "nt":
+            import msvcrt
+            file.seek(0)
+            # LK_LOCK gives up after 10 seconds, so it is tried again until the lock is free
+            while True:
+                try:
+                    msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+            try:
+                yield
+            finally:
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+class _Uncacheable(Exception):
+    """
+    Raised by _Feeder for a value whose state cannot be added to the hash.
+    """
+
+
+def circuitKey(components: list, options: dict):
+    """
+    @param components : the blocks of the pydig object, compiled and not run yet.
+    @param options : the other values the waveforms depend on (until, engine, ...), plain values only.
+    @return str : the hash of the run, in hex, None if the run depends on a value that cannot be hashed.
+    """
+
+    digest = hashlib.sha256()
+    feed = _Feeder(digest, components)
+    try:
+        feed.value((FORMAT, sys.version_info[:2], sorted(options.items())))
+        for block in components:
+            feed.value(type(block).__qualname__)
+            for name in sorted(vars(block)):
+                if name not in _SKIPPED:
+                    feed.value(name)
+                    feed.value(vars(block)[name])
+    except _Uncacheable:
+        return None
+    return digest.hexdigest()
+
+
+class _Feeder:
+    """
+    Adds values to a hash, with the blocks replaced by their index, the functions by their code
+    and other objects by their class and attributes.
+    """
+
+    def __init__(self, digest, components):
+        self.__digest = digest
+        self.__blocks = {id(x): i for i, x in enumerate(components)}
+        self.__seen = set()
+
+    def __add(self, text):
+        self.__digest.update(text.encode())
+        self.__digest.update(b"\0")
+
+    def value(self, value):
+        """
+        Adds a value to the hash.
+        """
+
+        if value is None or isinstance(value, (bool, int, float, str, bytes)):
+            self.__add(f"{type(value).__name__}:{value!r}")
+        elif id(value) in self.__blocks:
+            self.__add(f"block:{self.__blocks[id(value)]}")
+        elif isinstance(value, (list, tuple)):
+            self.__add(f"{type(value).__name__}:{len(value)}")
+            for x in value:
+                self.value(x)
+        elif isinstance(value, dict):
+            self.__add(f"dict:{len(value)}")
+            for k in sorted(value, key=repr):
+                self.value(k)
+                self.value(value[k])
+        elif isinstance(value, (set, frozenset)):
+            self.__add(f"set:{len(value)}")
+            for x in sorted(value, key=repr):
+                self.value(x)
+        elif isinstance(value, array):
+            self.__add(f"array:{value.typecode}:{len(value)}")
+            self.__digest.update(value.tobytes())
+        elif isinstance(value, FunctionType):
+            self.__function(value)
+        elif isinstance(value, MethodType):
+            self.__add("method")
+            self.value(value.__self__)
+            self.__function(value.__func__)
+        elif isinstance(value, partial):
+            self.__add("partial")
+            self.value(value.func)
+            self.value(value.args)
+            self.value(value.keywords)
+        elif isinstance(value, BuiltinFunctionType):
+            # a function of a module written in C (len, math.sqrt) or a method of a builtin object ([].append)
+            owner = value.__self__
+            if owner is None or isinstance(owner, ModuleType):
+                self.__add(f"builtin:{getattr(owner, '__name__', '')}.{value.__qualname__}")
+            else:
+                self.__add(f"builtin:{value.__qualname__}")
+                self.value(owner)
+        elif isinstance(value, type):
+            self.__class(value)
+        elif isinstance(value, ModuleType):
+            self.__add(f"module:{value.__name__}")
+        else:
+            self.__object(value)
+
+    def __object(self, value):
+        """
+        Adds an object (a clock domain, a lookup table, an object with __call__, ...): its class and
+        its attributes. Objects without attributes that Python can read are not hashed.
+        """
+
+        if id(value) in self.__seen:
+            self.__add(f"object:{type(value).__qualname__}")
+            return
+        slots = [x for cls in type(value).__mro__ for x in vars(cls).get("__slots__", ())]
+        if not hasattr(value, "__dict__") and not slots:
+            raise _Uncacheable(type(value).__qualname__)
+        self.__seen.add(id(value))
+
+        self.__class(type(value))
+        attributes = dict(getattr(value, "__dict__", {}))
+        for name in slots:
+            if name not in ("__dict__", "__weakref__") and hasattr(value, name):
+                attributes[name] = getattr(value, name)
+        self.value(attributes)
+
+    def __class(self, cls):
+        """
+        Adds a class: its name, and the code and values of the classes it is made of that are written
+        in Python, so a change of __call__ or of a class attribute changes the key.
+        """
+
+        self.__add(f"class:{cls.__module__}.{cls.__qualname__}")
+        if id(cls) in self.__seen:
+            return
+        self.__seen.add(id(cls))
+
+        for base in cls.__mro__:
+            if base.__module__ == "builtins":
+                continue
+            for name, member in sorted(vars(base).items()):
+                if isinstance(member, (staticmethod, classmethod)):
+                    member = member.__func__
+                if isinstance(member, FunctionType):
+                    self.__add(f"member:{name}")
+                    self.__function(member)
+                elif isinstance(member, property):
+                    self.__add(f"member:{name}")
+                    self.value((member.fget, member.fset))
+                elif not (name.startswith("__") and name.endswith("__")) and name != "_abc_impl":
+                    self.__add(f"member:{name}")
+                    self.value(member)
+
+    def __function(self, func):
+        """
+        Adds a function: its code, its defaults, its closure and what it uses from its module.
+        """
+
+        self.__add(f"function:{func.__qualname__}")
+        if id(func) in self.__seen:
+            return
+        self.__seen.add(id(func))
+
+        names = set()
+        self.__code(func.__code__, names)
+        self.value(func.__defaults__)
+        self.value(func.__kwdefaults__)
+        for cell in func.__closure__ or ():
+            try:
+                self.value(cell.cell_contents)
+            except ValueError:
+                # a cell that is not set yet
+                self.__add("cell")
+
+        for name in sorted(names):
+            if name not in func.__globals__:
+                continue
+            value = func.__globals__[name]
+            self.__add(f"global:{name}")
+            if isinstance(value, (type, ModuleType)):
+                # the functions of a class or module are reached by the names used as attributes
+                self.__add(f"object:{value.__name__}")
+                for attribute in sorted(names):
+                    member = getattr(value, attribute, None)
+                    if isinstance(member, FunctionType):
+                        self.__function(member)
+            else:
+                self.value(value)
+
+    def __code(self, code, names):
+        """
+        Adds a code object and the code objects it contains, and collects the names it uses.
+        """
+
+        self.__digest.update(code.co_code)
+        names.update(code.co_names)
+        for const in code.co_consts:
+            if isinstance(const, CodeType):
+                self.__code(const, names)
+            else:
+                self.value(const)
+
+
+class ResultCache:
+    """
+    A directory of results, one file per key, with least recently used eviction.
+    """
+
+    def __init__(self, directory: str, maxSize: int):
+        """
+        @param directory : the directory of the cache, it is created if needed.
+        @param maxSize : the number of bytes the entries may take.
+        """
+
+        try:
+            os.makedirs(directory, exist_ok=True)
+        except OSError as error:
+            printErrorAndExit(f"The cache directory {directory} cannot be created ({error}).")
+        self.__directory = directory
+        self.__maxSize = maxSize
+
+    def __path(self, key):
+        return os.path.join(self.__directory, f"{key}.pkl")
+
+    def get(self, key: str):
+        """
+        @param key : the key of the run (see circuitKey).
+        @return : the result stored for the key, None on a miss.
+        """
+
+        path = self.__path(key)
+        try:
+            with open(path, "rb") as file:
+                result = pickle.load(file)
+            self.__touch(path)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError, AttributeError):
+            result = None
+
+        self.__count("hits" if result is not None else "misses")
+        return result
+
+    def put(self, key: str, result):
+        """
+        Stores the result of a run and removes the least recently used entries if the cache is too large.
+        @param key : the key of the run (see circuitKey).
+        @param result : the result, anything that can be pickled.
+        """
+
+        # written to a temporary file first, so a reader never sees a partial entry
+        handle, temporary = tempfile.mkstemp(dir=self.__directory, suffix=".tmp")
+        with os.fdopen(handle, "wb") as file:
+            pickle.dump(result, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, self.__path(key))
+        self.__touch(self.__path(key))
+        self.__evict()
+
+    @staticmethod
+    def __touch(path):
+        """
+        Makes an entry the most recently used one. The time is set from the clock of Python, the
+        time the file system gives to a written file is too coarse to order entries used in a row.
+        """
+        now = time.time_ns()
+        os.utime(path, ns=(now, now))
+
+    def __entries(self):
+        """
+        @return list : (last use, size, path) of every entry, the least recently used first.
+        """
+
+        entries = []
+        for name in os.listdir(self.__directory):
+            if name.endswith(".pkl"):
+                path = os.path.join(self.__directory, name)
+                try:
+                    status = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((status.st_mtime, status.st_size, path))
+        return sorted(entries)
+
+    def __evict(self):
+        """
+        Removes the least recently used entries until the cache fits in its maximum size.
+        """
+
+        entries = self.__entries()
+        size = sum(x[1] for x in entries)
+        evicted = 0
+        for _, entrySize, path in entries:
+            if size <= self.__maxSize:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            size -= entrySize
+            evicted += 1
+        if evicted:
+            self.__count("evictions", evicted)
+
+    def __readStats(self):
+        try:
+            with open(os.path.join(self.__directory, STATS_FILE)) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {"hits": 0, "misses": 0, "evictions": 0}
+
+    def __count(self, what, count=1):
+        """
+        Adds to one of the counters kept in the directory, under the lock of the directory so that
+        the counts of processes using it at the same time all add up.
+        """
+
+        with _locked(os.path.join(self.__directory, LOCK_FILE)):
+            stats = self.__readStats()
+            stats[what] = stats.get(what, 0) + count
+            handle, temporary = tempfile.mkstemp(dir=self.__directory, suffix=".tmp")
+            with os.fdopen(handle, "w") as file:
+                json.dump(stats, file)
+            os.replace(temporary, os.path.join(self.__directory, STATS_FILE))
+
+    def getStats(self):
+        """
+        @return dict : the hits, misses and evictions of all the runs that used this directory,
+                       the number of entries and their size in bytes.
+        """
+
+        stats = self.__readStats()
+        entries = self.__entries()
+        stats["entries"] = len(entries)
+        stats["size"] = sum(x[1] for x in entries)
+        return stats
+
+
+if __name__ == "__main__":
+    # python resultCache.py <directory> prints the statistics of a cache
+    if len(sys.argv) != 2:
+        printErrorAndExit("Usage: python resultCache.py <cache directory>")
+    print(ResultCache(sys.argv[1], 0).getStats() if os.path.isdir(sys.argv[1]) else f"{sys.argv[1]} is not a directory.")
@@ -3,34 +3,77 @@ This class plots the waveforms that have been generated.
 It requires that matplotlib has been already downloaded.
 One can download matplotlib by
     pip install matplotlib
+matplotlib is only imported when the first plot is made, so a run that plots nothing never loads it.
 
 @author: Abhirath, Aryan, Gathik
 @date: 31/12/2023
 @version: 1.0
 """
 
-from utilities import checkType, printErrorAndExit
-from matplotlib import pyplot as plt
+import os
+import re
+from array import array
+from heapq import heappush, heappop
+from math import inf
+from utilities import checkType, printErrorAndExit, ticksToTime
+
+
+# the number of subplots in one figure
+_PER_FIGURE = 5
+# the most ticks drawn one per unit on the time and value axes, above it the ticks are spread by matplotlib
+_MAX_TIME_TICKS = 25
+_MAX_VALUE_TICKS = 8
+# the height of a figure in inches and the resolution of the files in pixels per inch
+_HEIGHT = 7.5
+_DPI = 100
 
 
 class Plotter:
 
-    def __init__(self):
-        pass
+    def __init__(self, directory=None, fileFormat="png", width=1600, workers=None):
+        """
+        @param directory : None to show the plots in windows, else the directory the figures are saved in.
+        @param fileFormat : the format of the saved figures, "png", "svg" or "pdf".
+        @param width : the width of a saved figure in pixels, the waveforms are decimated to it.
+        @param workers : the number of processes that save the figures, None for one per CPU.
+        """
 
-    def plot(self, inputs: dict, name: str):
+        if directory is not None:
+            checkType([(directory, str), (fileFormat, str), (width, int)])
+            if fileFormat not in ("png", "svg", "pdf"):
+                printErrorAndExit(f"{fileFormat} is not a valid figure format, use \"png\", \"svg\" or \"pdf\".")
+            if width < 100:
+                printErrorAndExit(f"A figure must be at least 100 pixels wide, not {width}.")
+            if workers is not None:
+                checkType([(workers, int)])
+                if workers < 1:
+                    printErrorAndExit(f"Saving the figures needs at least one worker, not {workers}.")
+
+        self.__plots = 0
+        self.__directory = directory
+        self.__fileFormat = fileFormat
+        self.__width = width
+        self.__workers = workers
+        self.__figures = []
+
+    def plot(self, inputs: dict, name: str, check=True):
         """
         plots the wave forms in a single window that are supplied in form of a dict.
+        The waveforms are decimated to the width of the figure: every pixel column keeps the first,
+        the lowest, the highest and the last sample that fall in it, so the envelope looks the same.
         @param inputs : the variables to plot
         @param name ; the name of the plot
+        @param check : if False the samples are not checked (the scope dumps of the blocks are always valid).
         """
 
         # checking if data provided is correct
         checkType([(inputs, dict), (name, str)])
         for key in inputs:
             checkType([(key, str), (inputs[key], list)])
+            if not inputs[key]:
+                printErrorAndExit(f"{key} in {inputs} has no samples.")
 
-            for value in inputs[key]:
+            for value in inputs[key] if check else ():
                 checkType([(value, tuple)])
 
                 if (len(value) == 2):
@@ -41,62 +84,66 @@ class Plotter:
         # calculating max time
         maxTime = 0
         for key in inputs:
-            time = [x[0] for x in inputs[key]]
-            maxTime = int(max(maxTime, max(time) + 1))
+            maxTime = int(max(maxTime, max(x[0] for x in inputs[key]) + 1))
 
-        # finally plotting
-        counter = 0
-        done = 0
-        numPlots = 0
-        ticks = range(0, maxTime + 1)
+        # the windows are 8 inches wide
+        width = self.__width if self.__directory is not None else 8 * _DPI
+        signals = [(key,) + _padSignal(inputs[key], maxTime, width) for key in inputs]
+        keys = list(inputs)
 
-        for key in inputs:
-            if (counter == 0):
-                numPlots += 1
-                fig, axs = plt.subplots(min(5, len(inputs) - done), 1, figsize=(8, 7.5), num=name + " #" + str(numPlots))
+        for start in range(0, len(signals), _PER_FIGURE):
+            title = name + " #" + str(start // _PER_FIGURE + 1)
+            figure = (name, title, signals[start:start + _PER_FIGURE], maxTime)
 
-                if (len(inputs) - done == 1):
-                    axs = [axs, None]
+            if self.__directory is None:
+                # finally plotting
+                from matplotlib import pyplot as plt
 
-                fig.suptitle(name)
+                self.__plots += 1
+                fig = plt.figure(figsize=(8, _HEIGHT), num=title)
+                _drawFigure(fig, *figure)
+            else:
+                self.__figures.append(figure)
 
-            time = [x[0] for x in inputs[key]]
-            value = [y[1] for y in inputs[key]]
+    def show(self):
+        """
+        This function shows all the plots that have bee made, or saves them if
+        the plotter has a directory.
+        @return list : the paths of the saved figures (an empty list when the plots are shown).
+        """
 
-            if (not (0 in time)):
-                value.insert(0, 0)
-                time.insert(0, 0)
-            if (not (maxTime in time)):
-                value.insert(len(value), value[time.index((max(time)))])
-                time.insert(len(time), maxTime)
+        if self.__directory is not None:
+            return self.__save()
 
-            # Plot data on each subplot
-            axs[counter].step(time, value, where="post")
-            axs[counter].grid(True)
+        if self.__plots:
+            from matplotlib import pyplot as plt
+            plt.show()
+        return []
 
-            # formatting plots
-            value = set(value)
-            axs[counter].set_ylabel(key, fontsize=8, va="center")
-            axs[counter].set_yticks(range(0, max(value)+1))
-            axs[counter].set_yticklabels([f"{x}" for x in range(0, max(value)+1)])
+    def __save(self):
+        """
+        Saves the figures that have been made, one file per figure, and forgets them.
+        With more than one figure and worker they are drawn by a pool of processes.
+        """
 
-            axs[counter].set_xticks(ticks)
-            axs[counter].set_xticklabels([f"{int(x)}" for x in ticks])
-            axs[counter].set_xlim(left=0.0)
-            axs[counter].sharex(axs[0])
+        try:
+            os.makedirs(self.__directory, exist_ok=True)
+        except OSError as error:
+            printErrorAndExit(f"The plot directory {self.__directory} cannot be created ({error}).")
 
-            fig.tight_layout()
+        jobs = []
+        for figure in self.__figures:
+            fileName = re.sub(r"[^\w\-. #]", "_", figure[1]) + "." + self.__fileFormat
+            jobs.append((os.path.join(self.__directory, fileName), self.__fileFormat, self.__width) + figure)
+        self.__figures = []
 
-            counter += 1
-            done += 1
-            counter %= 5
+        if self.__workers == 1 or len(jobs) < 2:
+            return [_saveFigure(*job) for job in jobs]
 
-    def show(self):
-        """
-        This function shows all the plots that have bee made
-        """
+        from concurrent.futures import ProcessPoolExecutor
 
-        plt.show()
+        with ProcessPoolExecutor(max_workers=self.__workers) as executor:
+            return list(executor.map(_saveFigure, *zip(*jobs)))
 
     @staticmethod
     def fillEmptyTimeSlots(timeValues: list, data: dict):
@@ -145,11 +192,114 @@ class Plotter:
         return finalData
 
 
+def decimate(times, values, end, width: int):
+    """
+    Reduces a waveform to at most four samples per pixel column (first, lowest, highest and last),
+    a step plot of the result covers the same pixels as the one of the whole waveform.
+    @param times : the times of the samples, in order.
+    @param values : the values of the samples.
+    @param end : the time at the right edge of the plot.
+    @param width : the number of pixel columns.
+    @return tuple : the kept times and values, as NumPy arrays.
+    """
+
+    import numpy as np
+
+    times = np.asarray(times, dtype=float)
+    values = np.asarray(values, dtype=float)
+    if len(times) <= 4 * width or end <= 0:
+        return times, values
+
+    column = np.minimum((times * (width / end)).astype(np.int64), width - 1)
+    starts = np.flatnonzero(np.r_[True, column[1:] != column[:-1]])
+    ends = np.r_[starts[1:], len(times)] - 1
+
+    # sorted by column then value, the first and last sample of a column are its lowest and highest
+    order = np.lexsort((values, column))
+    kept = np.unique(np.concatenate((starts, ends, order[starts], order[ends])))
+    return times[kept], values[kept]
+
+
+def _padSignal(samples, maxTime, width):
+    """
+    @return tuple : the times and values of a signal that starts at 0 and holds its last value
+                    up to maxTime, decimated to width pixel columns.
+    """
+
+    time = [x[0] for x in samples]
+    value = [x[1] for x in samples]
+
+    if (not (0 in time)):
+        value.insert(0, 0)
+        time.insert(0, 0)
+    # maxTime is after every sample
+    value.append(value[-1])
+    time.append(maxTime)
+
+    return decimate(time, value, maxTime, width)
+
+
+def _setTicks(axis, top, most):
+    """
+    Puts a tick on every whole number from 0 to top, or lets matplotlib choose
+    a few whole numbers when there would be more than most of them.
+    """
+
+    if top <= most:
+        ticks = range(0, int(top) + 1)
+        axis.set_ticks(ticks)
+        axis.set_ticklabels([f"{x}" for x in ticks])
+    else:
+        from matplotlib.ticker import MaxNLocator
+        axis.set_major_locator(MaxNLocator(nbins="auto", integer=True))
+
+
+def _drawFigure(fig, name, title, signals, maxTime):
+    """
+    Draws up to five signals (label, times, values) as step plots, one above the other.
+    """
+
+    axs = fig.subplots(len(signals), 1, sharex=True, squeeze=False)[:, 0]
+    fig.suptitle(name)
+
+    for ax, (key, time, value) in zip(axs, signals):
+        # Plot data on each subplot
+        ax.step(time, value, where="post")
+        ax.grid(True)
+
+        # formatting plots
+        ax.set_ylabel(key, fontsize=8, va="center")
+        _setTicks(ax.yaxis, max(value.max(), 0), _MAX_VALUE_TICKS)
+        _setTicks(ax.xaxis, maxTime, _MAX_TIME_TICKS)
+        ax.set_xlim(0.0, maxTime)
+
+    fig.tight_layout()
+
+
+def _saveFigure(path, fileFormat, width, name, title, signals, maxTime):
+    """
+    Draws a figure without a window (no pyplot) and saves it, this runs in the workers of Plotter.
+    @return str : the path of the file.
+    """
+
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(width / _DPI, _HEIGHT))
+    _drawFigure(fig, name, title, signals, maxTime)
+    fig.savefig(path, format=fileFormat, dpi=_DPI)
+    return path
+
+
 class ScopeDump():
     """
     This class is used for creating the scope. 
     All the different values that the user wants
     should be added to this class.
+
+    The samples of every signal are stored in columns: the times in an array of
+    doubles (with one byte per sample remembering whether the time was an int) and
+    the values in an array of 64 bit ints. A signal whose values do not fit in 64 bits
+    (or are not plain ints, like bools) keeps its values in a list instead.
     """
 
     def __init__(self):
@@ -157,7 +307,13 @@ class ScopeDump():
         Creates a ScopeDumpy Object.
         """
 
+        self.__times = {}
+        self.__intTimes = {}
         self.__values = {}
+        self.__probe = None
+        self.__listener = None
+        self.__keep = True
+        self.__ticksPerUnit = None
 
     def add(self, classification: str, time: float, value: int):
         """
@@ -171,11 +327,164 @@ class ScopeDump():
         """
 
         checkType([(classification, str), (time, (float, int)), (value, int)])
+        self.record(classification, time, value)
 
-        if (classification in self.__values):
-            self.__values[classification].append((time, value))
-        else:
-            self.__values[classification] = [(time, value)]
+    def record(self, classification, time, value):
+        """
+        Same as add, without checking the types of the arguments.
+        This is used by the blocks, which always record valid samples.
+        """
+
+        if self.__probe is not None and classification not in self.__probe:
+            return
+
+        if self.__listener is not None:
+            self.__listener(classification, time, value)
+            if not self.__keep:
+                return
+
+        times = self.__times.get(classification)
+        if times is None:
+            times = self.__times[classification] = array("d")
+            self.__intTimes[classification] = bytearray()
+            self.__values[classification] = array("q")
+
+        times.append(time)
+        self.__intTimes[classification].append(type(time) is int)
+
+        values = self.__values[classification]
+        if type(value) is int and type(values) is array:
+            try:
+                values.append(value)
+                return
+            except OverflowError:
+                pass
+
+        if type(values) is array:
+            values = self.__values[classification] = values.tolist()
+        values.append(value)
+
+    def setProbe(self, classifications):
+        """
+        Only records the given signals from now on, the samples already recorded for
+        the other signals are discarded.
+        @param classifications : the names of the signals to record, None to record everything.
+        """
+
+        if classifications is None:
+            self.__probe = None
+            return
+
+        self.__probe = set(classifications)
+        for label in list(self.__times):
+            if label not in self.__probe:
+                del self.__times[label], self.__intTimes[label], self.__values[label]
+
+    def isProbed(self, classification: str):
+        """
+        @return bool : True if the signal is recorded (see setProbe).
+        """
+        return self.__probe is None or classification in self.__probe
+
+    def setListener(self, listener, keep=True):
+        """
+        Passes every sample recorded from now on to listener(classification, time, value),
+        the samples already recorded are passed to it first.
+        @param listener : the function to call, None to remove the listener.
+        @param keep : if False, the samples are only given to the listener and are not stored
+                      (the samples already recorded are discarded).
+        """
+
+        if listener is not None:
+            for label in list(self.__times):
+                times, intTimes, values = self.getColumns(label)
+                for time, isInt, value in zip(times, intTimes, values):
+                    listener(label, int(time) if isInt else time, value)
+
+        self.__listener = listener
+        self.__keep = keep or listener is None
+        if not self.__keep:
+            self.__times, self.__intTimes, self.__values = {}, {}, {}
+
+    def getLabels(self):
+        """
+        @return list : the names of the signals, in the order they were first added.
+        """
+        return list(self.__times)
+
+    def getColumns(self, classification: str):
+        """
+        @param classification : the name of the signal.
+        @return tuple : (times, intTimes, values), the columns of the signal. intTimes has a
+                        non zero byte for every time that was given as an int.
+                        The columns must not be changed.
+        """
+        return self.__times[classification], self.__intTimes[classification], self.__values[classification]
+
+    def getState(self):
+        """
+        @return dict : the samples recorded so far, (times, intTimes, values) by label.
+        """
+        return {x: self.getColumns(x) for x in self.__times}
+
+    def setState(self, state: dict):
+        """
+        Replaces the recorded samples with the ones given by getState.
+        """
+        self.__times = {x: array("d", c[0]) for x, c in state.items()}
+        self.__intTimes = {x: bytearray(c[1]) for x, c in state.items()}
+        self.__values = {x: c[2][:] for x, c in state.items()}
+
+    def getSampleCounts(self):
+        """
+        @return dict : the number of samples recorded so far, by label.
+        """
+        return {x: len(times) for x, times in self.__times.items()}
+
+    def truncate(self, counts: dict):
+        """
+        Drops the samples recorded after getSampleCounts gave counts.
+        @param counts : the number of samples to keep by label, the other signals are removed.
+        """
+
+        for label in list(self.__times):
+            count = counts.get(label, 0)
+            if count == 0:
+                del self.__times[label], self.__intTimes[label], self.__values[label]
+                continue
+            del self.__times[label][count:]
+            del self.__intTimes[label][count:]
+            del self.__values[label][count:]
+
+    def setTimeScale(self, ticksPerUnit):
+        """
+        Tells the dump that its times are ticks of an integer timebase. The columns keep the
+        ticks, getSeries and getValues give the times in time units.
+        @param ticksPerUnit : the number of ticks in one time unit, None if the times are time units.
+        """
+        self.__ticksPerUnit = ticksPerUnit
+
+    def getTimeScale(self):
+        """
+        @return int : the number of ticks in one time unit, None if the times are time units.
+        """
+        return self.__ticksPerUnit
+
+    def getSampleCount(self):
+        """
+        @return int : the number of samples of all the signals.
+        """
+        return sum(len(x) for x in self.__times.values())
+
+    def getSeries(self, classification: str):
+        """
+        @param classification : the name of the signal.
+        @return list : the (time, value) samples of the signal.
+        """
+        times, intTimes, values = self.getColumns(classification)
+        if self.__ticksPerUnit is not None:
+            return [(ticksToTime(int(t), self.__ticksPerUnit), v) for t, v in zip(times, values)]
+        return [(int(t) if i else t, v) for t, i, v in zip(times, intTimes, values)]
 
     def getValues(self):
         """
@@ -183,7 +492,132 @@ class ScopeDump():
         @return : Dictionary holding the changed value and time of change of the value for different blocks.
         """
 
-        return dict(self.__values)
+        return {x: self.getSeries(x) for x in self.__times}
+
+
+class ScopeMerger():
+    """
+    Merges the scope dumps of all the blocks into the rows of the csv dump, one row at a time.
+
+    The rows are the same as Plotter.fillEmptyTimeSlots would give for the merged
+    getScopeDump() of the blocks, but the time column is produced by a k-way merge
+    of the sample times of every signal and every signal keeps only a cursor on its
+    samples, so the memory used does not grow with the number of rows.
+
+    With an integer timebase the dumps hold ticks: the times are merged as ticks and
+    only converted to time units when they are given out.
+    """
+
+    def __init__(self, groups: list, ticksPerUnit=None):
+        """
+        @param groups : one list of ScopeDump per block (see Block.getScopeDumps), in the order of the blocks.
+        @param ticksPerUnit : the number of ticks in one time unit if the dumps hold ticks, None otherwise.
+        """
+
+        self.__ticksPerUnit = ticksPerUnit
+
+        self.__cursors = []  # (label, dump) of every signal of every block, they make up the time column
+        self.__columns = {}  # label -> the dump whose values are written
+
+        for dumps in groups:
+            merged = {}
+            for dump in dumps:
+                for label in dump.getLabels():
+                    merged[label] = dump
+
+            self.__cursors.extend(merged.items())
+            self.__columns.update(merged)
+
+    def getLabels(self):
+        """
+        @return list : the names of the signals, in the order of the columns.
+        """
+        return list(self.__columns)
+
+    def getColumns(self, label: str):
+        """
+        @param label : the name of a signal.
+        @return tuple : (times, intTimes, values), the columns that are written for the signal (see ScopeDump.getColumns).
+        """
+
+        times, intTimes, values = self.__columns[label].getColumns(label)
+        if self.__ticksPerUnit is None:
+            return times, intTimes, values
+
+        converted = [ticksToTime(int(x), self.__ticksPerUnit) for x in times]
+        return array("d", converted), bytearray(type(x) is int for x in converted), values
+
+    def getTimes(self):
+        """
+        Yields the distinct sample times in increasing order, with 0 and the last time + 1 added.
+        When a time was recorded both as an int and as a float, the first one recorded is used.
+        """
+
+        if self.__ticksPerUnit is None:
+            yield from self.__rawTimes()
+        else:
+            for time in self.__rawTimes():
+                yield ticksToTime(time, self.__ticksPerUnit)
+
+    def __rawTimes(self):
+        """
+        Yields the times of getTimes as they are stored in the dumps.
+        """
+
+        heap = []
+        cursors = []
+        for label, dump in self.__cursors:
+            times, intTimes, _ = dump.getColumns(label)
+            if len(times):
+                heappush(heap, (int(times[0]) if intTimes[0] else times[0], len(cursors)))
+            cursors.append([times, intTimes, 0])
+
+        last = None
+        zero = True
+        while heap:
+            time, index = heappop(heap)
+            cursor = cursors[index]
+            j = cursor[2] = cursor[2] + 1
+            if j < len(cursor[0]):
+                heappush(heap, (int(cursor[0][j]) if cursor[1][j] else cursor[0][j], index))
+
+            if last is not None and time == last:
+                continue
+
+            if zero and time >= 0:
+                zero = False
+                if time > 0:
+                    yield 0
+            yield time
+            last = time
+
+        if zero:
+            yield 0
+        yield (last if last is not None else 0) + (self.__ticksPerUnit or 1)
+
+    def rows(self):
+        """
+        Yields the rows [time, value of every signal], missing values are filled with the previous value.
+        """
+
+        series = [dump.getColumns(label) for label, dump in self.__columns.items()]
+        positions = [0] * len(series)
+        previous = [0] * len(series)
+        upcoming = [times[0] if len(times) else inf for times, _, _ in series]
+        columns = range(len(series))
+
+        for time in self.__rawTimes():
+            for k in columns:
+                # the time of the next sample of a signal is always one of the times
+                if not time < upcoming[k]:
+                    times, _, values = series[k]
+                    j = positions[k]
+                    while j < len(times) - 1 and times[j] == times[j + 1]:
+                        j += 1
+                    previous[k] = values[j]
+                    positions[k] = j + 1
+                    upcoming[k] = times[j + 1] if j + 1 < len(times) else inf
+            yield [time if self.__ticksPerUnit is None else ticksToTime(time, self.__ticksPerUnit)] + previous
 
 
 if __name__ == "__main__":
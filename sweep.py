@@ -0,0 +1,81 @@
+"""
+This file contains the sweep runner used by pydig.sweep(buildFn, params, until).
+
+A sweep runs the same circuit for many parameter points (clock periods, delays,
+stimulus files, ...). The points are independent, so they are simulated in a pool
+of processes: every worker calls buildFn(**point) to build its own pydig object,
+simulates it without plotting and sends back the waveforms as compact arrays
+(the times, intTimes and values columns of every signal) instead of writing a csv
+file. The results are given back as soon as each point finishes.
+
+buildFn and the points are sent to the workers with pickle, so buildFn must be a
+function defined at the top level of a module; the functions of the blocks are
+created by buildFn in the worker and do not need to be picklable.
+
+@author Abhirath, Aryan, Gathik
+@date 17/10/2026
+@version 1.0
+"""
+
+import pickle
+from utilities import printErrorAndExit, checkType
+
+
+def runPoint(buildFn, point: dict, until, engine: str, signals):
+    """
+    Builds and simulates one point of a sweep.
+    @return dict : the waveforms of the point (see pydig.getWaveforms).
+    """
+
+    pysim = buildFn(**point)
+    pysim.simulate(until, engine)
+    return pysim.getWaveforms(signals)
+
+
+def runSweep(buildFn, params, until, workers=None, engine="event", signals=None):
+    """
+    Checks the arguments of a sweep and starts it.
+    @param buildFn : a function defined at the top level of a module that returns a pydig object.
+    @param params : a list of dicts, the keyword arguments of buildFn for every point.
+    @param until : the number of time units every point is simulated.
+    @param workers : the number of processes, None for one per CPU. With 1, the points run in this process.
+    @param engine : "event" or "cycle".
+    @param signals : the labels of the signals to send back, None for all of them.
+    @return generator : (index of the point in params, waveforms) as soon as every point finishes.
+    """
+
+    checkType([(params, (list, tuple)), (until, int), (engine, str)])
+    for point in params:
+        checkType([(point, dict)])
+    if workers is not None:
+        checkType([(workers, int)])
+        if workers < 1:
+            printErrorAndExit(f"A sweep needs at least one worker, not {workers}.")
+
+    if workers == 1:
+        return ((i, runPoint(buildFn, point, until, engine, signals)) for i, point in enumerate(params))
+
+    try:
+        pickle.dumps((buildFn, params))
+    except (pickle.PicklingError, AttributeError, TypeError) as error:
+        printErrorAndExit(f"The build function and the points of a sweep must be picklable ({error}), "
+                          f"define the build function at the top level of a module.")
+    return _runPool(buildFn, params, until, workers, engine, signals)
+
+
+def _runPool(buildFn, params, until, workers, engine, signals):
+    """
+    Simulates the points in a pool of processes.
+    """
+
+    # imported here, loading multiprocessing takes longer than simulating a small circuit
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = {executor.submit(runPoint, buildFn, point, until, engine, signals): i for i, point in enumerate(params)}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        # the points that have not started are dropped if the results are not all read
+        executor.shutdown(cancel_futures=True)
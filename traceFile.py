@@ -0,0 +1,318 @@
+"""
+This file contains the binary trace format written by pydig.dumpTrace(path) and its reader.
+
+The samples of every signal are split in chunks of chunkSize samples. In a chunk,
+every sample is two variable length integers:
+
+    the time, as the difference to the previous time in millionths of a time unit,
+    shifted left by two bits and tagged with 0 for a float time, 1 for an int time,
+    2 for a float time a few units in the last place away from a whole number of
+    millionths (like 0.30000000000000004, the distance follows) or 3 for any other
+    time (its 8 bytes follow),
+    the value, as the difference to the previous value.
+
+Differences are zigzag encoded, so small negative differences are short too.
+Every chunk can be decoded on its own. The index at the end of the file gives, for
+every signal, the first and last time, the offset, the length and the number of
+samples of each of its chunks, so a reader only decodes the chunks it needs.
+
+    "PYDIGTR1" | chunks ... | index | index offset (8 bytes) | "PYDIGIDX"
+
+TraceReader maps the file in memory (mmap) and answers valueAt(signal, t) and
+changes(signal, t0, t1) without reading the whole trace.
+
+@author Abhirath, Aryan, Gathik
+@date 17/10/2026
+@version 1.0
+"""
+
+import mmap
+import struct
+from bisect import bisect_left, bisect_right
+from utilities import printErrorAndExit, checkType
+
+MAGIC = b"PYDIGTR1"
+INDEX_MAGIC = b"PYDIGIDX"
+SCALE = 10 ** 6
+CHUNK = struct.Struct("<ddQII")  # first time, last time, offset, length, samples
+DOUBLE = struct.Struct("<d")
+BITS = struct.Struct("<q")
+MAX_ULPS = 1 << 20
+
+
+def _putInt(out: bytearray, number: int):
+    """
+    Appends a non negative integer of any size, 7 bits per byte.
+    """
+
+    while number > 0x7F:
+        out.append((number & 0x7F) | 0x80)
+        number >>= 7
+    out.append(number)
+
+
+def _zigzag(number: int):
+    """
+    @return int : number mapped to a non negative integer (0, -1, 1, -2, ... -> 0, 1, 2, 3, ...).
+    """
+    return number << 1 if number >= 0 else ((-number) << 1) - 1
+
+
+def _unzigzag(number: int):
+    """
+    @return int : the inverse of _zigzag.
+    """
+    return number >> 1 if not number & 1 else -((number + 1) >> 1)
+
+
+class TraceWriter:
+    """
+    Writes the samples of signals to a binary trace file.
+    """
+
+    def __init__(self, path: str, chunkSize=4096):
+        """
+        @param path : the path of the trace file.
+        @param chunkSize : the number of samples in a chunk.
+        """
+
+        checkType([(path, str), (chunkSize, int)])
+        if chunkSize < 1:
+            printErrorAndExit(f"The chunk size of a trace must be positive, not {chunkSize}.")
+
+        self.__path = path
+        self.__chunkSize = chunkSize
+        self.__file = open(path, "wb")
+        self.__file.write(MAGIC)
+        self.__offset = len(MAGIC)
+        self.__index = []
+
+    def addSignal(self, label: str, times, intTimes, values):
+        """
+        Writes the samples of a signal.
+        @param label : the name of the signal.
+        @param times : the times of the samples, in increasing order.
+        @param intTimes : a non zero value for every time that is an int.
+        @param values : the integer values of the samples.
+        """
+
+        chunks = []
+        for start in range(0, len(times), self.__chunkSize):
+            end = min(start + self.__chunkSize, len(times))
+            data = self.__encode(times, intTimes, values, start, end)
+            self.__file.write(data)
+            chunks.append((float(times[start]), float(times[end - 1]), self.__offset, len(data), end - start))
+            self.__offset += len(data)
+
+        self.__index.append((label, chunks))
+
+    @staticmethod
+    def __encode(times, intTimes, values, start, end):
+        """
+        @return bytearray : the samples start to end - 1 as a chunk.
+        """
+
+        out = bytearray()
+        previousTime = 0
+        previousValue = 0
+
+        for i in range(start, end):
+            time = times[i]
+            if intTimes[i]:
+                ticks = int(time) * SCALE
+                _putInt(out, _zigzag(ticks - previousTime) << 2 | 1)
+            else:
+                ticks = round(time * SCALE)
+                ulps = BITS.unpack(DOUBLE.pack(time))[0] - BITS.unpack(DOUBLE.pack(ticks / SCALE))[0]
+                if ulps == 0:
+                    _putInt(out, _zigzag(ticks - previousTime) << 2)
+                elif abs(ulps) < MAX_ULPS:
+                    _putInt(out, _zigzag(ticks - previousTime) << 2 | 2)
+                    _putInt(out, _zigzag(ulps))
+                else:
+                    out.append(3)
+                    out += DOUBLE.pack(time)
+            previousTime = ticks
+
+            value = int(values[i])
+            _putInt(out, _zigzag(value - previousValue))
+            previousValue = value
+
+        return out
+
+    def close(self):
+        """
+        Writes the index and closes the file.
+        """
+
+        index = bytearray()
+        _putInt(index, len(self.__index))
+        for label, chunks in self.__index:
+            name = label.encode("utf-8")
+            _putInt(index, len(name))
+            index += name
+            _putInt(index, len(chunks))
+            for chunk in chunks:
+                index += CHUNK.pack(*chunk)
+
+        self.__file.write(index)
+        self.__file.write(struct.pack("<Q", self.__offset))
+        self.__file.write(INDEX_MAGIC)
+        self.__file.close()
+
+    def getPath(self):
+        """
+        @return str : the path of the trace file.
+        """
+        return self.__path
+
+
+class TraceReader:
+    """
+    Reads a binary trace file written by TraceWriter, decoding only the chunks it needs.
+    """
+
+    def __init__(self, path: str):
+        """
+        @param path : the path of the trace file.
+        """
+
+        checkType([(path, str)])
+        self.__file = open(path, "rb")
+        self.__data = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        data = self.__data
+        if len(data) < len(MAGIC) + 8 + len(INDEX_MAGIC) or data[:len(MAGIC)] != MAGIC or data[-len(INDEX_MAGIC):] != INDEX_MAGIC:
+            self.close()
+            printErrorAndExit(f"{path} is not a pydig trace file.")
+
+        position = struct.unpack_from("<Q", data, len(data) - len(INDEX_MAGIC) - 8)[0]
+        self.__signals = {}
+        count, position = self.__getInt(position)
+        for _ in range(count):
+            length, position = self.__getInt(position)
+            label = bytes(data[position:position + length]).decode("utf-8")
+            position += length
+            chunks, position = self.__getInt(position)
+            index = [CHUNK.unpack_from(data, position + k * CHUNK.size) for k in range(chunks)]
+            position += chunks * CHUNK.size
+            self.__signals[label] = ([x[0] for x in index], index)
+
+        self.__cache = (None, None, None)
+
+    def __getInt(self, position):
+        """
+        @return tuple : the integer at position and the position after it.
+        """
+
+        data = self.__data
+        number = 0
+        shift = 0
+        while True:
+            byte = data[position]
+            position += 1
+            number |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return number, position
+            shift += 7
+
+    def __decode(self, signal, k):
+        """
+        @return tuple : (times, values) of chunk k of signal.
+        """
+
+        if self.__cache[0] == (signal, k):
+            return self.__cache[1], self.__cache[2]
+
+        _, _, position, _, count = self.__signals[signal][1][k]
+        times = []
+        values = []
+        previousTime = 0
+        previousValue = 0
+        for _ in range(count):
+            key, position = self.__getInt(position)
+            tag = key & 3
+            if tag == 3:
+                time = DOUBLE.unpack_from(self.__data, position)[0]
+                position += DOUBLE.size
+                previousTime = round(time * SCALE)
+            else:
+                previousTime += _unzigzag(key >> 2)
+                if tag == 1:
+                    time = previousTime // SCALE
+                elif tag == 0:
+                    time = previousTime / SCALE
+                else:
+                    ulps, position = self.__getInt(position)
+                    bits = BITS.unpack(DOUBLE.pack(previousTime / SCALE))[0] + _unzigzag(ulps)
+                    time = DOUBLE.unpack(BITS.pack(bits))[0]
+            delta, position = self.__getInt(position)
+            previousValue += _unzigzag(delta)
+            times.append(time)
+            values.append(previousValue)
+
+        self.__cache = ((signal, k), times, values)
+        return times, values
+
+    def __chunks(self, signal):
+        """
+        @return tuple : the first times and the index of the chunks of signal.
+        """
+
+        if signal not in self.__signals:
+            printErrorAndExit(f"{signal} is not in the trace, use one of {list(self.__signals)}.")
+        return self.__signals[signal]
+
+    def getSignals(self):
+        """
+        @return list : the names of the signals in the trace.
+        """
+        return list(self.__signals)
+
+    def getSampleCount(self, signal: str):
+        """
+        @return int : the number of samples of signal.
+        """
+        return sum(x[4] for x in self.__chunks(signal)[1])
+
+    def valueAt(self, signal: str, time):
+        """
+        @param signal : the name of the signal.
+        @param time : the time at which the value is needed.
+        @return int : the value of the last sample at or before time (0 before the first sample).
+        """
+
+        firsts, index = self.__chunks(signal)
+        k = bisect_right(firsts, time) - 1
+        if k < 0:
+            return 0
+
+        times, values = self.__decode(signal, k)
+        return values[bisect_right(times, time) - 1]
+
+    def changes(self, signal: str, start, end):
+        """
+        @param signal : the name of the signal.
+        @param start : the first time.
+        @param end : the last time.
+        @return list : the (time, value) samples of signal from start to end, both included.
+        """
+
+        firsts, index = self.__chunks(signal)
+        samples = []
+        for k in range(max(bisect_left(firsts, start) - 1, 0), bisect_right(firsts, end)):
+            if index[k][1] < start:
+                continue
+            times, values = self.__decode(signal, k)
+            first = bisect_left(times, start)
+            last = bisect_right(times, end)
+            samples += zip(times[first:last], values[first:last])
+        return samples
+
+    def close(self):
+        """
+        Closes the file.
+        """
+
+        self.__data.close()
+        self.__file.close()
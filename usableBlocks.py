@@ -1,5 +1,6 @@
 from blocks import *
 from utilities import checkType, printErrorAndExit
+from lookupTable import LookupTable
 
 
 class MooreMachine(HasInputConnections, HasOutputConnections, HasRegisters):
@@ -20,13 +21,26 @@ class MooreMachine(HasInputConnections, HasOutputConnections, HasRegisters):
         @param : blockID is the id of this input block. If blockId is a duplicate
                  or None, then new unique ID is given.
         @param : register_delay is the time taken by the register to update.
+        @param : cancelStale if True, an NSL or OL evaluation that is superseded by a newer one
+                 before its delay is over is dropped (inertial delay).
+        @param : tabulate if True, the NSL and OL are evaluated from lookup tables (see compileTables).
+        @param : stateSize is the number of bits of the state, it is needed to build full tables.
         """
         self.nsl = kwargs.get("nsl")
         self.ol = kwargs.get("ol")
         self.nsl_delay = kwargs.get("nsl_delay", 0.01)
         self.ol_delay = kwargs.get("ol_delay", 0.01)
+        self.__cancelStale = kwargs.get("cancelStale", False)
+        self.__nslKey = None
+        self.__olKey = None
+        self.__nslCount = 0
+        self.__olCount = 0
+        self.__tabulate = kwargs.get("tabulate", False)
+        self.__stateSize = kwargs.get("stateSize", None)
+        self.__nslTable = None
+        self.__olTable = None
         super().__init__(**kwargs)
-        self._scopeDump.add(f"Input to {self.getBlockID()}", 0, self._output[0])
+        self._scopeDump.record(f"Input to {self.getBlockID()}", 0, self._output[0])
 
     def __str__(self):
         """
@@ -34,46 +48,131 @@ class MooreMachine(HasInputConnections, HasOutputConnections, HasRegisters):
         """
         return f"MooreMachine ID {self.getBlockID()}"
 
-    def __runNSL(self):
+    def getSignals(self):
         """
-        Runs the next state logic if the input to this machine changed.
+        @return dict : the name of every signal recorded by this block, by kind.
         """
-        # adding the inputs to scopedump
-        self._scopeDump.add(f"Input to {self.getBlockID()}", self._env.now, self.getInputVal())
+        return {"input": f"Input to {self.getBlockID()}", "ns": f"NS of {self.getBlockID()}",
+                "ps": f"PS of {self.getBlockID()}", "output": f"output of {self.getBlockID()}"}
 
-        # running the NSL
-        tempout = self.nsl(self.getPS(), self.getInputVal())
-        yield self._env.timeout(self.nsl_delay)
+    def getSignalWidths(self):
+        """
+        @return dict : the number of bits of every signal, by kind. The state has stateSize bits (32 if it was not given).
+        """
+        state = self.__stateSize or 32
+        return {"input": self.getInputWidth(), "ns": state, "ps": state, "output": self.getMaxOutSize()}
+
+    def __setNS(self, tempout, count):
+        """
+        Updates the next state once the NSL delay is over.
+        """
+        if self.__cancelStale and count != self.__nslCount:
+            return
 
-        # updating the next State
         self.setNS(tempout)
-        self._scopeDump.add(f"NS of {self.getBlockID()}", self._env.now, self.getNS())
+        self._scopeDump.record(f"NS of {self.getBlockID()}", self._env.now, self.getNS())
 
-    def __runOL(self):
+    def __setOutput(self, temp, count):
         """
-        Output logic runs when the output value is changed.
+        Updates the output once the OL delay is over.
         """
+        if self.__cancelStale and count != self.__olCount:
+            return
 
-        temp = self.ol(self.getPS())
-        yield self._env.timeout(self.ol_delay)
-        self._output[0] = temp
-        self._scopeDump.add(f"output of {self.getBlockID()}", self._env.now, self._output[0])
+        changed = self._setOutput(temp)
+        self._scopeDump.record(f"output of {self.getBlockID()}", self._env.now, self._output[0])
 
         # triggering events for the connected machines
-        self.processFanOut()
+        self.processFanOut(changed)
 
     def runNSL(self):
-        self._env.process(self.__runNSL())
+        """
+        Runs the next state logic if the input to this machine or its present state changed.
+        """
+        inputVal = self.getInputVal()
+
+        # adding the inputs to scopedump
+        self._scopeDump.record(f"Input to {self.getBlockID()}", self._env.now, inputVal)
+
+        key = (self.getPS(), inputVal)
+        if key == self.__nslKey:
+            return
+        self.__nslKey = key
+
+        # running the NSL
+        self.__nslCount += 1
+        self._callAfter(self.nsl_delay, self.__setNS, self.getNSL()(*key), self.__nslCount)
 
     def runOL(self):
-        self._env.process(self.__runOL())
+        """
+        Output logic runs when the present state changed (it does not depend on the input).
+        """
+        if self.getPS() == self.__olKey:
+            return
+
+        self.__olKey = self.getPS()
+        self.__olCount += 1
+        self._callAfter(self.ol_delay, self.__setOutput, self.getOL()(self.__olKey), self.__olCount)
+
+    def compileTables(self):
+        """
+        Builds the lookup tables of the NSL and the OL if this machine was created with tabulate=True.
+        It is called by pydig.run once all the connections are made.
+        """
+        if not self.__tabulate:
+            self.__nslTable = self.__olTable = None
+            return
+
+        self.__nslTable = LookupTable(self.nsl, [self.__stateSize, self.getInputWidth()])
+        self.__olTable = LookupTable(self.ol, [self.__stateSize])
+
+    def getNSL(self):
+        """
+        @return function : the next state logic (its lookup table if it is tabulated).
+        """
+        return self.nsl if self.__nslTable is None else self.__nslTable
+
+    def getOL(self):
+        """
+        @return function : the output logic (its lookup table if it is tabulated).
+        """
+        return self.ol if self.__olTable is None else self.__olTable
+
+    def getTableStats(self):
+        """
+        @return dict : the lookup statistics of the tabulated functions.
+        """
+        if self.__nslTable is None:
+            return {}
+        return {"nsl": self.__nslTable.getStats(), "ol": self.__olTable.getStats()}
+
+    def getState(self):
+        """
+        @return dict : the state of this machine, with the last evaluated NSL and OL arguments.
+        """
+        state = super().getState()
+        state["nslKey"] = self.__nslKey
+        state["olKey"] = self.__olKey
+        state["nslCount"] = self.__nslCount
+        state["olCount"] = self.__olCount
+        return state
+
+    def setState(self, state: dict):
+        """
+        Loads a state given by getState.
+        """
+        super().setState(state)
+        self.__nslKey = state["nslKey"]
+        self.__olKey = state["olKey"]
+        self.__nslCount = state["nslCount"]
+        self.__olCount = state["olCount"]
 
     def run(self):
         """
         Runs this block.
         """
-        self._env.process(self.__runNSL())
-        self._env.process(self.__runOL())
+        self.runNSL()
+        self.runOL()
 
     def isConnected(self):
         """
@@ -108,13 +207,26 @@ class MealyMachine(HasInputConnections, HasOutputConnections, HasRegisters):
         @param : blockID is the id of this input block. If blockId is a duplicate
                  or None, then new unique ID is given.
         @param : register_delay is the time taken by the register to update.
+        @param : cancelStale if True, an NSL or OL evaluation that is superseded by a newer one
+                 before its delay is over is dropped (inertial delay).
+        @param : tabulate if True, the NSL and OL are evaluated from lookup tables (see compileTables).
+        @param : stateSize is the number of bits of the state, it is needed to build full tables.
         """
         self.nsl = kwargs.get("nsl")
         self.nsl_delay = kwargs.get("nsl_delay", 0.01)
         self.ol = kwargs.get("ol")
         self.ol_delay = kwargs.get("ol_delay", 0.01)
+        self.__cancelStale = kwargs.get("cancelStale", False)
+        self.__nslKey = None
+        self.__olKey = None
+        self.__nslCount = 0
+        self.__olCount = 0
+        self.__tabulate = kwargs.get("tabulate", False)
+        self.__stateSize = kwargs.get("stateSize", None)
+        self.__nslTable = None
+        self.__olTable = None
         super().__init__(**kwargs)
-        self._scopeDump.add(f"Input to {self.getBlockID()}", 0, self._output[0])
+        self._scopeDump.record(f"Input to {self.getBlockID()}", 0, self._output[0])
 
     def __str__(self):
         """
@@ -122,46 +234,132 @@ class MealyMachine(HasInputConnections, HasOutputConnections, HasRegisters):
         """
         return f"Mealy Machine ID {self.getBlockID()}"
 
-    def __runNSL(self):
+    def getSignals(self):
         """
-        Runs the next state logic if the input to this machine changed.
+        @return dict : the name of every signal recorded by this block, by kind.
         """
-        # adding the inputs to scopedump
-        self._scopeDump.add(f"Input to {self.getBlockID()}", self._env.now, self.getInputVal())
+        return {"input": f"Input to {self.getBlockID()}", "ns": f"NS of {self.getBlockID()}",
+                "ps": f"PS of {self.getBlockID()}", "output": f"output of {self.getBlockID()}"}
 
-        # running the NSL
-        tempout = self.nsl(self.getPS(), self.getInputVal())
-        yield self._env.timeout(self.nsl_delay)
+    def getSignalWidths(self):
+        """
+        @return dict : the number of bits of every signal, by kind. The state has stateSize bits (32 if it was not given).
+        """
+        state = self.__stateSize or 32
+        return {"input": self.getInputWidth(), "ns": state, "ps": state, "output": self.getMaxOutSize()}
+
+    def __setNS(self, tempout, count):
+        """
+        Updates the next state once the NSL delay is over.
+        """
+        if self.__cancelStale and count != self.__nslCount:
+            return
 
-        # updating the next State
         self.setNS(tempout)
-        self._scopeDump.add(f"NS of {self.getBlockID()}", self._env.now, self.getNS())
+        self._scopeDump.record(f"NS of {self.getBlockID()}", self._env.now, self.getNS())
 
-    def __runOL(self):
+    def __setOutput(self, temp, count):
         """
-        Output logic runs when the output value is changed.
+        Updates the output once the OL delay is over.
         """
+        if self.__cancelStale and count != self.__olCount:
+            return
 
-        temp = self.ol(self.getPS(), self.getInputVal())
-        yield self._env.timeout(self.ol_delay)
-        self._output[0] = temp
-        self._scopeDump.add(f"output of {self.getBlockID()}", self._env.now, self._output[0])
+        changed = self._setOutput(temp)
+        self._scopeDump.record(f"output of {self.getBlockID()}", self._env.now, self._output[0])
 
         # triggering events for the connected machines
-        self.processFanOut()
+        self.processFanOut(changed)
 
     def runNSL(self):
-        self._env.process(self.__runNSL())
+        """
+        Runs the next state logic if the input to this machine or its present state changed.
+        """
+        inputVal = self.getInputVal()
+
+        # adding the inputs to scopedump
+        self._scopeDump.record(f"Input to {self.getBlockID()}", self._env.now, inputVal)
+
+        key = (self.getPS(), inputVal)
+        if key == self.__nslKey:
+            return
+        self.__nslKey = key
+
+        # running the NSL
+        self.__nslCount += 1
+        self._callAfter(self.nsl_delay, self.__setNS, self.getNSL()(*key), self.__nslCount)
 
     def runOL(self):
-        self._env.process(self.__runOL())
+        """
+        Output logic runs when the input to this machine or its present state changed.
+        """
+        key = (self.getPS(), self.getInputVal())
+        if key == self.__olKey:
+            return
+
+        self.__olKey = key
+        self.__olCount += 1
+        self._callAfter(self.ol_delay, self.__setOutput, self.getOL()(*key), self.__olCount)
+
+    def compileTables(self):
+        """
+        Builds the lookup tables of the NSL and the OL if this machine was created with tabulate=True.
+        It is called by pydig.run once all the connections are made.
+        """
+        if not self.__tabulate:
+            self.__nslTable = self.__olTable = None
+            return
+
+        self.__nslTable = LookupTable(self.nsl, [self.__stateSize, self.getInputWidth()])
+        self.__olTable = LookupTable(self.ol, [self.__stateSize, self.getInputWidth()])
+
+    def getNSL(self):
+        """
+        @return function : the next state logic (its lookup table if it is tabulated).
+        """
+        return self.nsl if self.__nslTable is None else self.__nslTable
+
+    def getOL(self):
+        """
+        @return function : the output logic (its lookup table if it is tabulated).
+        """
+        return self.ol if self.__olTable is None else self.__olTable
+
+    def getTableStats(self):
+        """
+        @return dict : the lookup statistics of the tabulated functions.
+        """
+        if self.__nslTable is None:
+            return {}
+        return {"nsl": self.__nslTable.getStats(), "ol": self.__olTable.getStats()}
+
+    def getState(self):
+        """
+        @return dict : the state of this machine, with the last evaluated NSL and OL arguments.
+        """
+        state = super().getState()
+        state["nslKey"] = self.__nslKey
+        state["olKey"] = self.__olKey
+        state["nslCount"] = self.__nslCount
+        state["olCount"] = self.__olCount
+        return state
+
+    def setState(self, state: dict):
+        """
+        Loads a state given by getState.
+        """
+        super().setState(state)
+        self.__nslKey = state["nslKey"]
+        self.__olKey = state["olKey"]
+        self.__nslCount = state["nslCount"]
+        self.__olCount = state["olCount"]
 
     def run(self):
         """
         Runs this block.
         """
-        self._env.process(self.__runNSL())
-        self._env.process(self.__runOL())
+        self.runNSL()
+        self.runOL()
 
     def isConnected(self):
         """
@@ -202,8 +400,9 @@ class Input(HasOnlyOutputConnections):
         maxOutSize -= 2
 
         self.__input = inputList
+        self.__cursor = 0
         super().__init__(maxOutSize=maxOutSize, **kwargs)
-        self._scopeDump.add(f"Input to {self.getBlockID()}", 0, self._output[0])
+        self._scopeDump.record(f"Input to {self.getBlockID()}", 0, self._output[0])
 
     def __str__(self):
         """
@@ -211,16 +410,73 @@ class Input(HasOnlyOutputConnections):
         """
         return f"Input ID {self.getBlockID()}"
 
+    def getSignals(self):
+        """
+        @return dict : the name of every signal recorded by this block, by kind.
+        """
+        return {"output": f"Input to {self.getBlockID()}"}
+
+    def getSignalWidths(self):
+        """
+        @return dict : the number of bits of every signal, by kind.
+        """
+        return {"output": self.getMaxOutSize()}
+
+    def getInputList(self):
+        """
+        @return list : the (time, value) changes that this block generates.
+        """
+        return list(self.__input)
+
+    def setInputList(self, inputList: list):
+        """
+        Replaces the (time, value) changes that this block generates, the changes that
+        were already applied are not applied again.
+        @param inputList : the new changes, their values must fit in the width of this block.
+        """
+        for time, value in inputList:
+            if value < 0 or value >> self.getMaxOutSize():
+                printErrorAndExit(f"The value {value} at time {time} does not fit in the {self.getMaxOutSize()} bits of {self}.")
+        self.__input = list(inputList)
+
+    def getState(self):
+        """
+        @return dict : the state of this block, with the position of the next change in inputList.
+        """
+        state = super().getState()
+        state["cursor"] = self.__cursor
+        return state
+
+    def setState(self, state: dict):
+        """
+        Loads a state given by getState.
+        """
+        super().setState(state)
+        self.__cursor = state["cursor"]
+
+    def __scheduleNext(self):
+        """
+        Schedules the next change in input value specified by inputList.
+        """
+        if self.__cursor < len(self.__input):
+            self._callAfter(self.__input[self.__cursor][0] - self._env.now, self._go)
+
     def _go(self):
         """
-        Runs the input at every change in input value specified by inputList.
+        Applies the current change in input value specified by inputList.
         """
-        for i in self.__input:
-            yield self._env.timeout(i[0]-self._env.now)
+        changed = self._setOutput(self.__input[self.__cursor][1])
+        self._scopeDump.record(f"Input to {self.getBlockID()}", self._env.now, self._output[0])
+        self.__cursor += 1
+        self.__scheduleNext()
+        self.processFanOut(changed)
 
-            self._output[0] = i[1]
-            self._scopeDump.add(f"Input to {self.getBlockID()}", self._env.now, self._output[0])
-            self.processFanOut()
+    def run(self):
+        """
+        Runs the input at every change in input value specified by inputList.
+        """
+        self.__cursor = 0
+        self.__scheduleNext()
 
 
 class Clock(HasOnlyOutputConnections):
@@ -251,7 +507,7 @@ class Clock(HasOnlyOutputConnections):
         self.__onTime = onTime
         super().__init__(**kwargs)
         self._output[0] = initialValue & 1
-        self._scopeDump.add(f"Clock {self.getBlockID()}", 0, self._output[0])
+        self._scopeDump.record(f"Clock {self.getBlockID()}", 0, self._output[0])
 
     # left, right are for future versions. NOT USED IN CURRENT VERSION.
 
@@ -267,15 +523,50 @@ class Clock(HasOnlyOutputConnections):
         """
         return f"Clock ID {self.getBlockID()}"
 
+    def getSignals(self):
+        """
+        @return dict : the name of every signal recorded by this block, by kind.
+        """
+        return {"output": f"Clock {self.getBlockID()}"}
+
+    def getSignalWidths(self):
+        """
+        @return dict : the number of bits of every signal, by kind.
+        """
+        return {"output": 1}
+
+    def getTimePeriod(self):
+        """
+        @return float : the time period of the clock.
+        """
+        return self.__timePeriod
+
+    def getOnTime(self):
+        """
+        @return float : the amount of time in each cycle that the clock shows high.
+        """
+        return self.__onTime
+
+    def __scheduleNext(self):
+        """
+        Schedules the next toggle of the clock.
+        """
+        self._callAfter((1-self._output[0])*(self.__timePeriod - self.__onTime)+self._output[0]*(self.__onTime), self._go)
+
     def _go(self):
+        """
+        Toggles the clock, this happens every half period.
+        """
+        self._output[0] = 1 - self._output[0]
+        self._scopeDump.record(f"Clock {self.getBlockID()}", self._env.now, self._output[0])
+        self.__scheduleNext()
+        self.processFanOut()
+
+    def run(self):
         """
         Runs the clock at every time period.
         """
-        while True:
-            yield self._env.timeout((1-self._output[0])*(self.__timePeriod - self.__onTime)+self._output[0]*(self.__onTime))
-            self._output[0] = 1 - self._output[0]
-            self._scopeDump.add(f"Clock {self.getBlockID()}", self._env.now, self._output[0])
-            self.processFanOut()
+        self.__scheduleNext()
 
 
 class Output(HasInputConnections):
@@ -292,7 +583,9 @@ class Output(HasInputConnections):
         @param env : is a simpy environment.
         @param blockID : is the id of this input block. If blockID is a
                          duplicate or None, then new unique ID is given.
+        @param delay : the time after which the first value is recorded.
         """
+        self.__delay = kwargs.get("delay", 0.01)
         super().__init__(**kwargs)
 
     def __str__(self):
@@ -301,18 +594,29 @@ class Output(HasInputConnections):
         """
         return f"Output ID {self.getBlockID()}"
 
+    def getSignals(self):
+        """
+        @return dict : the name of every signal recorded by this block, by kind.
+        """
+        return {"output": f"Final Output from {self.getBlockID()}"}
+
+    def getSignalWidths(self):
+        """
+        @return dict : the number of bits of every signal, by kind.
+        """
+        return {"output": self.getInputWidth()}
+
     def __give(self):
         """
         Adds the output value to this class every time there is a change in it.
         """
-        yield self._env.timeout(0.01)
-        self._scopeDump.add(f"Final Output from {self.getBlockID()}", self._env.now, self.getInputVal())
+        self._scopeDump.record(f"Final Output from {self.getBlockID()}", self._env.now, self.getInputVal())
 
     def run(self):
         """
         Runs the output block
         """
-        self._env.process(self.__give())
+        self._callAfter(self.__delay, self.__give)
 
     def isConnected(self):
         """
@@ -336,6 +640,7 @@ class Combinational(HasInputConnections, HasOutputConnections):
         @param plot : is a boolean variable which represents whether or not we should plot this class.
         @param blockID : is the id of this input block. If blockID is a duplicate or None, then new unique ID is given.
         @param initialValue : the initial value of the block.
+        @param tabulate : if True, func is evaluated from a lookup table (see compileTables).
         """
         func = kwargs.get("func", None)
         delay = kwargs.get("delay", 0)
@@ -344,24 +649,23 @@ class Combinational(HasInputConnections, HasOutputConnections):
         self.__func = func
         self.__delay = delay
         self.__value = initialValue
+        self.__deltaScheduler = None
+        self.__tabulate = kwargs.get("tabulate", False)
+        self.__table = None
         super().__init__(**kwargs)
         self._output[0] = initialValue
-        self._scopeDump.add(f"{self.getBlockID()} output", 0, self._output[0])
+        self._scopeDump.record(f"{self.getBlockID()} output", 0, self._output[0])
 
     def __runFunc(self):
         """
-        Runs the block for the specified input and timeouts for the delay.
+        Updates the output of the block once the delay is over.
         """
 
-        self.__value = self.getInputVal()
-        self.__value = self.__func(self.__value)
+        changed = self._setOutput(self.__value)
 
-        yield self._env.timeout(self.__delay)
-        self._output[0] = self.__value
+        self._scopeDump.record(f"{self.getBlockID()} output", self._env.now, self._output[0])
 
-        self._scopeDump.add(f"{self.getBlockID()} output", self._env.now, self._output[0])
-
-        self.processFanOut()
+        self.processFanOut(changed)
 
     def __str__(self):
         """
@@ -369,11 +673,99 @@ class Combinational(HasInputConnections, HasOutputConnections):
         """
         return f"Combinational ID {self.getBlockID()}"
 
+    def getSignals(self):
+        """
+        @return dict : the name of every signal recorded by this block, by kind.
+        """
+        return {"output": f"{self.getBlockID()} output"}
+
+    def getSignalWidths(self):
+        """
+        @return dict : the number of bits of every signal, by kind.
+        """
+        return {"output": self.getMaxOutSize()}
+
+    def getFunc(self):
+        """
+        @return function : the function used to calculate the output (its lookup table if it is tabulated).
+        """
+        return self.__func if self.__table is None else self.__table
+
+    def compileTables(self):
+        """
+        Builds the lookup table of func if this block was created with tabulate=True.
+        It is called by pydig.run once all the connections are made.
+        """
+        self.__table = LookupTable(self.__func, [self.getInputWidth()]) if self.__tabulate else None
+
+    def getTableStats(self):
+        """
+        @return dict : the lookup statistics of the tabulated function.
+        """
+        return {} if self.__table is None else {"func": self.__table.getStats()}
+
+    def getDelay(self):
+        """
+        @return float : the delay in the output.
+        """
+        return self.__delay
+
+    def setDelay(self, delay):
+        """
+        @param delay : the new delay in the output.
+        """
+        checkType([(delay, (float, int))])
+        self.__delay = delay
+
+    def getState(self):
+        """
+        @return dict : the state of this block, with the value waiting for the delay.
+        """
+        state = super().getState()
+        state["value"] = self.__value
+        return state
+
+    def setState(self, state: dict):
+        """
+        Loads a state given by getState.
+        """
+        super().setState(state)
+        self.__value = state["value"]
+
+    def setDeltaScheduler(self, scheduler):
+        """
+        Makes this (zero delay) block evaluate through a DeltaScheduler.
+        @param scheduler : the DeltaScheduler, or None to run on its own again.
+        """
+        self.__deltaScheduler = scheduler
+
+    def evaluate(self):
+        """
+        Evaluates the block immediately, this is used by the DeltaScheduler.
+        The fan out only runs if the output changed.
+        @return bool : True if the output changed, False otherwise.
+        """
+        self.__value = self.getFunc()(self.getInputVal())
+        if self.__value == self._output[0]:
+            return False
+
+        self._output[0] = self.__value
+        self._scopeDump.record(f"{self.getBlockID()} output", self._env.now, self._output[0])
+        self.processFanOut()
+        return True
+
     def run(self):
         """
-        Runs this block.
+        Runs the block for the specified input and waits for the delay.
         """
-        self._env.process(self.__runFunc())
+        if self.__deltaScheduler is not None:
+            self.__deltaScheduler.schedule(self)
+            return
+
+        self.__value = self.getInputVal()
+        self.__value = self.getFunc()(self.__value)
+
+        self._callAfter(self.__delay, self.__runFunc)
 
     def isConnected(self):
         """
@@ -5,6 +5,9 @@ majority of all other files.
 checkType : checks the type of variables
 printErrorAndExit : prints the error message and closes the program
 dumpVars : creates a csv file to dump the variables
+dumpRows : creates the same csv file one row at a time
+parseTime : converts a time like "10ps" to seconds
+timeToTicks, ticksToTime : convert between time units and the ticks of an integer timebase
 
 @author Abhirath, Aryan, Gathik
 @date 4/12/2023
@@ -40,6 +43,55 @@ def printErrorAndExit(message: str):
 
     sys.exit(1)
 
+def parseTime(text: str):
+    """
+    Converts a time written with a unit (s, ms, us, ns, ps or fs), like "10ps" or "1.5 ns", to seconds.
+    @param text : the time to convert.
+    @return Fraction : the time in seconds, exactly.
+    """
+
+    import re
+    from fractions import Fraction
+
+    units = {"s": 1, "ms": Fraction(1, 10 ** 3), "us": Fraction(1, 10 ** 6),
+             "ns": Fraction(1, 10 ** 9), "ps": Fraction(1, 10 ** 12), "fs": Fraction(1, 10 ** 15)}
+
+    checkType([(text, str)])
+    match = re.fullmatch(r"\s*(\d+\.?\d*|\.\d+)\s*(s|ms|us|ns|ps|fs)\s*", text)
+    if match is None:
+        printErrorAndExit(f"{text} is not a valid time, use a number followed by one of {list(units)}.")
+
+    return Fraction(match.group(1)) * units[match.group(2)]
+
+
+def timeToTicks(time, ticksPerUnit: int, what: str = "time"):
+    """
+    Converts a time in time units to a whole number of ticks.
+    @param time : the time to convert (an int or a float, like 0.01).
+    @param ticksPerUnit : the number of ticks in one time unit.
+    @param what : what the time is, used in the error message.
+    @return int : the number of ticks.
+    """
+
+    from fractions import Fraction
+
+    # the decimal written by the user, not the binary float, so that 0.01 is exactly 1/100
+    ticks = Fraction(repr(time)) * ticksPerUnit
+    if ticks.denominator != 1:
+        printErrorAndExit(f"The {what} {time} is not a whole number of ticks ({ticksPerUnit} ticks per time unit).")
+    return int(ticks)
+
+
+def ticksToTime(ticks: int, ticksPerUnit: int):
+    """
+    Converts a number of ticks back to time units.
+    @return int or float : an int if the time is a whole number of time units, a float otherwise.
+    """
+
+    whole, rest = divmod(ticks, ticksPerUnit)
+    return whole if rest == 0 else ticks / ticksPerUnit
+
+
 def bitCount(num):
         """
         @param num : the number to find the bit count
@@ -60,6 +112,19 @@ def dumpVars(dic: dict, name: str = "dumpVars"):
     keysOfDict = list(dic.keys())
     length = len(dic[keysOfDict[0]])
 
+    rows = ([dic[keysOfDict[0]][i][0]] + [dic[key][i][1] for key in keysOfDict] for i in range(round(length)))
+    dumpRows(keysOfDict, rows, name)
+
+
+def dumpRows(keys: list, rows, name: str = "dumpVars"):
+    """
+    Writes the same csv file as dumpVars, but takes the rows one at a time so that
+    the whole table never has to be in memory.
+    @param keys : the names of the variables (the header without 'Time').
+    @param rows : an iterable of rows [time, value of keys[0], value of keys[1], ...].
+    @param name : the name of the csv file.
+    """
+
     import csv
     import os
 
@@ -69,11 +134,9 @@ def dumpVars(dic: dict, name: str = "dumpVars"):
     with open(f"output\\{name}.csv", "w", newline='') as file:
         csw = csv.writer(file)
 
-        header = keysOfDict[:]
+        header = list(keys)
         header.insert(0, 'Time')
         csw.writerow(header)
 
-        for i in range(round(length)):
-            row = [dic[key][i][1] for key in keysOfDict]
-            row.insert(0, dic[keysOfDict[0]][i][0])
+        for row in rows:
             csw.writerow(row)
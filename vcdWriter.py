@@ -0,0 +1,195 @@
+"""
+This file contains the VCDWriter, which writes the signals of a simulation as a
+value change dump (IEEE 1364 VCD) while the simulation runs.
+It is used by pydig.dumpVCD(path, timescale, timeUnit).
+
+The signals are declared (one scope per block, with the width of every signal)
+before the simulation starts. The writer then listens to the ScopeDump of every
+block: the values recorded at the current time are kept until the time advances,
+and only the signals whose value changed are written, so the memory used does not
+grow with the length of the simulation.
+
+@author Abhirath, Aryan, Gathik
+@date 17/10/2026
+@version 1.0
+"""
+
+import datetime
+from fractions import Fraction
+from utilities import printErrorAndExit, checkType, parseTime
+
+
+class VCDWriter:
+    """
+    Writes value changes to a VCD file as they are recorded.
+    """
+
+    def __init__(self, path: str, name="pydig", timescale="1ps", timeUnit="1ns", bufferSize=1 << 16):
+        """
+        @param path : the path of the VCD file.
+        @param name : the name of the top scope.
+        @param timescale : the resolution of the VCD file: 1, 10 or 100 followed by s, ms, us, ns, ps or fs.
+        @param timeUnit : the duration of one time unit of the simulation, like "1ns" (or a Fraction of seconds).
+        @param bufferSize : the number of bytes buffered before they are written to the file.
+        """
+
+        checkType([(path, str), (name, str), (timescale, str), (timeUnit, (str, Fraction)), (bufferSize, int)])
+
+        scale = parseTime(timescale)
+        magnitude = timescale.strip().rstrip("munpfs ")
+        if magnitude not in ("1", "10", "100"):
+            printErrorAndExit(f"{timescale} is not a valid VCD timescale, use 1, 10 or 100 followed by a unit.")
+
+        ticks = (parseTime(timeUnit) if isinstance(timeUnit, str) else timeUnit) / scale
+        self.__ticks = int(ticks) if ticks.denominator == 1 else float(ticks)
+        self.__timescale = timescale.replace(" ", "")
+        self.__path = path
+        self.__name = name
+        self.__bufferSize = bufferSize
+        self.__scopes = {}
+        self.__signals = {}  # label -> [identifier, width, last value written]
+        self.__pending = {}
+        self.__time = None  # the VCD tick being recorded
+        self.__started = False
+        self.__file = None
+
+    def addSignal(self, scope: str, name: str, label: str, width):
+        """
+        Declares a signal, all signals must be declared before open().
+        @param scope : the scope of the signal (the block ID).
+        @param name : the name of the signal in its scope.
+        @param label : the name under which the signal is recorded in the ScopeDump.
+        @param width : the number of bits of the signal.
+        """
+
+        if self.__file is not None:
+            printErrorAndExit(f"{label} was declared after the VCD file {self.__path} was opened.")
+        if label in self.__signals:
+            return
+
+        identifier = self.__identifier(len(self.__signals))
+        self.__signals[label] = [identifier, max(int(width or 1), 1), None]
+        self.__scopes.setdefault(str(scope), []).append((name, label))
+
+    @staticmethod
+    def __identifier(index):
+        """
+        @return str : a short identifier made of the printable characters "!" to "~".
+        """
+
+        identifier = ""
+        while True:
+            identifier += chr(33 + index % 94)
+            index //= 94
+            if index == 0:
+                return identifier
+
+    @staticmethod
+    def __clean(text):
+        """
+        @return str : text without white space, which is not allowed in VCD names.
+        """
+        return "_".join(str(text).split())
+
+    def open(self):
+        """
+        Opens the file and writes the header with every declared signal.
+        """
+
+        self.__file = open(self.__path, "w", buffering=self.__bufferSize)
+        write = self.__file.write
+
+        write(f"$date\n    {datetime.datetime.now().strftime('%c')}\n$end\n")
+        write("$version\n    pydig\n$end\n")
+        write(f"$timescale {self.__timescale} $end\n")
+        write(f"$scope module {self.__clean(self.__name)} $end\n")
+        for scope, signals in self.__scopes.items():
+            write(f"$scope module {self.__clean(scope)} $end\n")
+            for name, label in signals:
+                identifier, width, _ = self.__signals[label]
+                write(f"$var wire {width} {identifier} {self.__clean(name)} $end\n")
+            write("$upscope $end\n")
+        write("$upscope $end\n$enddefinitions $end\n")
+
+    def change(self, label, time, value):
+        """
+        Records the value of a signal, this is the listener given to the ScopeDumps.
+        The values of a VCD tick are written once the time advances, the last one of each signal wins.
+        """
+
+        tick = round(time * self.__ticks)
+        if tick != self.__time:
+            if self.__time is not None and tick < self.__time:
+                printErrorAndExit(f"{label} was recorded at {time}, after a later time was written to {self.__path}.")
+            self.__flush()
+            self.__time = tick
+
+        if label in self.__signals:
+            self.__pending[label] = value
+
+    def __flush(self):
+        """
+        Writes the changes of the current time. The first time written also gives
+        the initial value of every signal (0 if it was not recorded at time 0).
+        """
+
+        if self.__time is None:
+            return
+
+        if not self.__started:
+            self.__started = True
+            initial = self.__pending if self.__time == 0 else {}
+            lines = []
+            for label, signal in self.__signals.items():
+                signal[2] = initial.get(label, 0)
+                lines.append(self.__format(signal[0], signal[1], signal[2]))
+            self.__file.write("#0\n$dumpvars\n" + "".join(lines) + "$end\n")
+            if self.__time == 0:
+                self.__pending = {}
+                return
+
+        changes = []
+        for label, value in self.__pending.items():
+            signal = self.__signals[label]
+            if value != signal[2]:
+                signal[2] = value
+                changes.append(self.__format(signal[0], signal[1], value))
+        self.__pending = {}
+
+        if changes:
+            self.__file.write(f"#{self.__time}\n" + "".join(changes))
+
+    @staticmethod
+    def __format(identifier, width, value):
+        """
+        @return str : the value change line of a signal.
+        """
+
+        if width == 1 and value in (0, 1):
+            return f"{value}{identifier}\n"
+        if value < 0:
+            value &= (1 << width) - 1
+        return f"b{value:b} {identifier}\n"
+
+    def close(self, until=None):
+        """
+        Writes the last changes and closes the file.
+        @param until : the time at which the simulation stopped, it is written as the last time.
+        """
+
+        if self.__file is None:
+            return
+
+        if self.__time is None:
+            self.__time = 0
+        self.__flush()
+        if until is not None and round(until * self.__ticks) > self.__time:
+            self.__file.write(f"#{round(until * self.__ticks)}\n")
+        self.__file.close()
+        self.__file = None
+
+    def getPath(self):
+        """
+        @return str : the path of the VCD file.
+        """
+        return self.__path